@@ -1,7 +1,12 @@
+import heapq
+import itertools
+
 import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
 
+from Representation.telemetry import log
+
 
 class BetaState:
     """
@@ -35,33 +40,39 @@ class BetaFactorGraph:
     def __init__(self):
         self.nodes = {} 
         self.factors = []
+        # (src, dst) -> position in self.factors
+        self.rule_index = {}
+        # Bumped once per bulk load; rules remember the last epoch they were seen
+        self.epoch = 0
+
+        # Incremental propagation state (see run_incremental_propagation)
+        self.node_rules = {}    # name -> rules touching that node
+        self.inbox = {}         # name -> [a, b] sum of cached incoming messages
+        self.dirty_rules = {}   # (src, dst) -> rule whose messages must be resent
+        self.dirty_nodes = set()
+        self.msg_decay = None   # decay the cached messages were computed with
 
     def get_or_create_node(self, name):
         if name not in self.nodes:
             # Initialize with Neutral Prior (Laplace Smoothing)
             # a=1, b=1 -> Strength=0.5, Conf=Low
             self.nodes[name] = BetaState(1.0, 1.0)
+            self.node_rules[name] = []
+            self.inbox[name] = [0.0, 0.0]
         return self.nodes[name]
 
+    def mark_dirty(self, name):
+        """Flags a node whose state changed outside of propagation."""
+        self.get_or_create_node(name)
+        self.dirty_nodes.add(name)
+
     def add_dependency_rule(self, pair_str, rule_strength, rule_confidence):
         """
         Registers a Modus Ponens rule: A -> B
+
+        Rules are indexed by (src, dst), so re-adding an existing rule is an
+        O(1) weighted update instead of a scan over ``self.factors``.
         """
-        # parts = pair_str.split(' -- ')
-        # src = parts[0].strip()
-        # dst = parts[1].strip()
-        
-        # # Ensure nodes exist
-        # self.get_or_create_node(src)
-        # self.get_or_create_node(dst)
-
-        # # Store the rule params
-        # self.factors.append({
-        #     'src': src,
-        #     'dst': dst,
-        #     's': rule_strength,
-        #     'c': rule_confidence
-        # })
         parts = pair_str.split(' -- ')
         if len(parts) != 2: return
         src, dst = parts[0], parts[1]
@@ -71,22 +82,16 @@ class BetaFactorGraph:
         self.get_or_create_node(dst)
         
         # Check if rule already exists to avoid duplicates
-        existing_rule = None
-        for rule in self.factors:
-            if rule['src'] == src and rule['dst'] == dst:
-                existing_rule = rule
-                break
+        idx = self.rule_index.get((src, dst))
         
-        if existing_rule:
-            # High confidence overwrites low confidence (Greedy)
-            # if confidence > existing_rule['c']:
-            #     existing_rule['s'] = strength
-            #     existing_rule['c'] = confidence
-            
-            # Weighted Update (New data counts for 30%)
+        if idx is not None:
+            existing_rule = self.factors[idx]
+            # Weighted Update (New data counts for 70%)
             alpha = 0.7
             existing_rule['s'] = (1 - alpha) * existing_rule['s'] + alpha * rule_strength
             existing_rule['c'] = (1 - alpha) * existing_rule['c'] + alpha * rule_confidence
+            existing_rule['epoch'] = self.epoch
+            self.dirty_rules[(src, dst)] = existing_rule
             
         else:
             # CREATE NEW
@@ -94,9 +99,63 @@ class BetaFactorGraph:
                 'src': src,
                 'dst': dst,
                 's': rule_strength,
-                'c': rule_confidence
+                'c': rule_confidence,
+                'epoch': self.epoch,
+                # Last messages sent along this rule, as (a, b) evidence
+                'fwd': (0.0, 0.0),
+                'bwd': (0.0, 0.0)
             }
+            self.rule_index[(src, dst)] = len(self.factors)
             self.factors.append(rule)
+            self.node_rules[src].append(rule)
+            if dst != src:
+                self.node_rules[dst].append(rule)
+            self.dirty_rules[(src, dst)] = rule
+
+    def add_dependency_rules(self, rows):
+        """
+        Bulk-loads miner output (dicts with 'pair', 'strength', 'confidence').
+        Each call counts as one epoch; rules touched here are stamped with it
+        so that stale rules can later be dropped with ``evict_rules``.
+        """
+        self.epoch += 1
+        for row in rows:
+            self.add_dependency_rule(row['pair'], row['strength'], row['confidence'])
+
+    def get_rule(self, src, dst):
+        """Returns the rule dict for src -> dst, or None."""
+        idx = self.rule_index.get((src, dst))
+        return None if idx is None else self.factors[idx]
+
+    def evict_rules(self, min_confidence=0.0, max_age=None):
+        """
+        Drops rules whose confidence fell below *min_confidence* or which have
+        not been refreshed for more than *max_age* epochs.
+        Nodes are kept (they may still carry priors).
+        Returns the number of evicted rules.
+        """
+        kept = []
+        for rule in self.factors:
+            if rule['c'] < min_confidence or (
+                    max_age is not None and self.epoch - rule['epoch'] > max_age):
+                # Withdraw whatever this rule already contributed
+                self._apply_message(rule['dst'], rule['fwd'], (0.0, 0.0))
+                self._apply_message(rule['src'], rule['bwd'], (0.0, 0.0))
+                self.dirty_nodes.update((rule['src'], rule['dst']))
+                self.dirty_rules.pop((rule['src'], rule['dst']), None)
+                continue
+            kept.append(rule)
+
+        evicted = len(self.factors) - len(kept)
+        if evicted:
+            self.factors = kept
+            self.rule_index = {(r['src'], r['dst']): i for i, r in enumerate(kept)}
+            self.node_rules = {name: [] for name in self.nodes}
+            for rule in kept:
+                self.node_rules[rule['src']].append(rule)
+                if rule['dst'] != rule['src']:
+                    self.node_rules[rule['dst']].append(rule)
+        return evicted
 
     def set_prior(self, name, stv_strength, stv_confidence, base_counts=10.0):
         """
@@ -112,6 +171,7 @@ class BetaFactorGraph:
         
         node.alpha = node.prior_a = a
         node.beta = node.prior_b = b
+        self.dirty_nodes.add(name)
     
     def visualize(self, title="Beta Factor Graph"):
         """
@@ -197,8 +257,44 @@ class BetaFactorGraph:
 
 
 
+    def _forward_message(self, rule, decay):
+        """Modus Ponens message src -> dst, as (a, b) evidence."""
+        src_node = self.nodes[rule['src']]
+        S = rule['s']
+        rule_capacity = rule['c'] * 20.0
+
+        p_src = src_node.strength
+        src_evidence = src_node.alpha + src_node.beta
+
+        # Logic: If Src is True -> Dst is True (prob S). 
+        # If Src is False -> Dst is Unknown (prob 0.5)
+        fwd_strength = (p_src * S) + ((1.0 - p_src) * 0.5)
+
+        # Attenuate evidence (decay) over distance to guarantee convergence
+        fwd_evidence = min(src_evidence * decay, rule_capacity)
+        return (fwd_strength * fwd_evidence, (1.0 - fwd_strength) * fwd_evidence)
+
+    def _backward_message(self, rule, decay):
+        """Abduction / Modus Tollens message dst -> src, as (a, b) evidence."""
+        dst_node = self.nodes[rule['dst']]
+        S = rule['s']
+        rule_capacity = rule['c'] * 20.0
+
+        p_dst = dst_node.strength
+        dst_evidence = dst_node.alpha + dst_node.beta
+
+        # Logic: 
+        # Abduction: If Dst is True -> Src is likely True (prob S)
+        # Modus Tollens: If Dst is False -> Src is definitely False (prob 1-S)
+        bwd_strength = (p_dst * S) + ((1.0 - p_dst) * (1.0 - S))
+
+        # Backward flow is usually weaker (more uncertain) than forward flow
+        # We apply a harsher penalty to abducted evidence.
+        bwd_evidence = min(dst_evidence * (decay * 0.5), rule_capacity)
+        return (bwd_strength * bwd_evidence, (1.0 - bwd_strength) * bwd_evidence)
+
     def run_evidence_propagation(self, steps=10, decay=0.9):
-        print(f"--- Running Beta-Propagation (Modus Ponens + Abduction + Revision) ---")
+        log(f"--- Running Beta-Propagation (Modus Ponens + Abduction + Revision) ---", level=2)
         
         for i in range(steps):
             max_delta = 0
@@ -209,50 +305,15 @@ class BetaFactorGraph:
 
             # --- CALCULATE MESSAGES ---
             for rule in self.factors:
-                src_name = rule['src']
-                dst_name = rule['dst']
-                src_node = self.nodes[src_name]
-                dst_node = self.nodes[dst_name]
-                
-                S = rule['s']
-                C = rule['c']
-                rule_capacity = C * 20.0
-                
-                # ==========================================
-                # FORWARD PASS (Modus Ponens)
-                # ==========================================
-                p_src = src_node.strength
-                src_evidence = src_node.alpha + src_node.beta
-                
-                # Logic: If Src is True -> Dst is True (prob S). 
-                # If Src is False -> Dst is Unknown (prob 0.5)
-                fwd_strength = (p_src * S) + ((1.0 - p_src) * 0.5)
-                
-                # Attenuate evidence (decay) over distance to guarantee convergence
-                fwd_evidence = min(src_evidence * decay, rule_capacity)
-                
-                # Put message in Destination's Inbox
-                inboxes[dst_name]['a'] += fwd_strength * fwd_evidence
-                inboxes[dst_name]['b'] += (1.0 - fwd_strength) * fwd_evidence
-
-                # ==========================================
-                # BACKWARD PASS (Abduction & Modus Tollens)
-                # ==========================================
-                p_dst = dst_node.strength
-                dst_evidence = dst_node.alpha + dst_node.beta
-                
-                # Logic: 
-                # Abduction: If Dst is True -> Src is likely True (prob S)
-                # Modus Tollens: If Dst is False -> Src is definitely False (prob 1-S)
-                bwd_strength = (p_dst * S) + ((1.0 - p_dst) * (1.0 - S))
-                
-                # Backward flow is usually weaker (more uncertain) than forward flow
-                # We apply a harsher penalty to abducted evidence.
-                bwd_evidence = min(dst_evidence * (decay * 0.5), rule_capacity)
-                
-                # Put message in Source's Inbox
-                inboxes[src_name]['a'] += bwd_strength * bwd_evidence
-                inboxes[src_name]['b'] += (1.0 - bwd_strength) * bwd_evidence
+                # FORWARD PASS (Modus Ponens): put message in Destination's Inbox
+                fwd_a, fwd_b = self._forward_message(rule, decay)
+                inboxes[rule['dst']]['a'] += fwd_a
+                inboxes[rule['dst']]['b'] += fwd_b
+
+                # BACKWARD PASS (Abduction & Modus Tollens): put message in Source's Inbox
+                bwd_a, bwd_b = self._backward_message(rule, decay)
+                inboxes[rule['src']]['a'] += bwd_a
+                inboxes[rule['src']]['b'] += bwd_b
 
             # ==========================================
             # REVISION PART 2: Apply Inbox (Fusion)
@@ -271,11 +332,118 @@ class BetaFactorGraph:
                 node.alpha = new_a
                 node.beta = new_b
             
-            print(f"Step {i+1}: Max Evidence Update = {max_delta:.4f}")
+            log(f"Step {i+1}: Max Evidence Update = {max_delta:.4f}", level=2)
             if max_delta < 0.05:
-                print("Convergence reached.")
+                log("Convergence reached.", level=2)
                 break
 
+        # Node states no longer match the cached incremental messages
+        self.msg_decay = None
+
+    # ------------------------------------------------------------------
+    # Incremental (residual-scheduled) propagation
+    # ------------------------------------------------------------------
+
+    def _apply_message(self, name, old_msg, new_msg):
+        inbox = self.inbox[name]
+        inbox[0] += new_msg[0] - old_msg[0]
+        inbox[1] += new_msg[1] - old_msg[1]
+
+    def _residual(self, name):
+        node = self.nodes[name]
+        inbox = self.inbox[name]
+        return (abs(node.prior_a + inbox[0] - node.alpha)
+                + abs(node.prior_b + inbox[1] - node.beta))
+
+    def _reset_message_cache(self, decay):
+        """Drops all cached messages so the next run starts from scratch."""
+        for name in self.nodes:
+            self.inbox[name] = [0.0, 0.0]
+        for rule in self.factors:
+            rule['fwd'] = (0.0, 0.0)
+            rule['bwd'] = (0.0, 0.0)
+            self.dirty_rules[(rule['src'], rule['dst'])] = rule
+        self.dirty_nodes.update(self.nodes)
+        self.msg_decay = decay
+
+    def run_incremental_propagation(self, decay=0.9, tol=1e-3, max_updates=None):
+        """
+        Residual belief propagation, warm-started from the previous call.
+
+        Every rule caches the last forward/backward message it sent and every
+        node keeps the running sum of its incoming messages. Only dirty rules
+        (new or updated), dirty nodes (new priors) and nodes whose inbox
+        moved their state by more than *tol* are processed, largest residual
+        first, so the work is proportional to what changed since last time.
+
+        Converges to the same fixed point as ``run_evidence_propagation``.
+        Returns the number of node updates performed.
+        """
+        if self.msg_decay != decay:
+            self._reset_message_cache(decay)
+        if max_updates is None:
+            max_updates = 100 * max(1, len(self.nodes))
+
+        heap = []
+        counter = itertools.count()
+
+        # New or updated rules: (re)send both messages from the current states
+        for rule in self.dirty_rules.values():
+            fwd = self._forward_message(rule, decay)
+            self._apply_message(rule['dst'], rule['fwd'], fwd)
+            rule['fwd'] = fwd
+            bwd = self._backward_message(rule, decay)
+            self._apply_message(rule['src'], rule['bwd'], bwd)
+            rule['bwd'] = bwd
+            for name in (rule['src'], rule['dst']):
+                heapq.heappush(heap, (-self._residual(name), next(counter), name))
+        self.dirty_rules = {}
+
+        # Dirty nodes must resend their messages even with zero residual
+        forced = set(self.dirty_nodes)
+        self.dirty_nodes = set()
+        for name in forced:
+            heapq.heappush(heap, (-float('inf'), next(counter), name))
+
+        updates = 0
+        while heap and updates < max_updates:
+            _, _, name = heapq.heappop(heap)
+            if name not in self.nodes:
+                continue
+            if self._residual(name) < tol and name not in forced:
+                continue
+            forced.discard(name)
+
+            node = self.nodes[name]
+            inbox = self.inbox[name]
+            node.alpha = node.prior_a + inbox[0]
+            node.beta = node.prior_b + inbox[1]
+            updates += 1
+
+            # Resend only the messages that depend on this node's state
+            for rule in self.node_rules[name]:
+                if rule['src'] == name:
+                    fwd = self._forward_message(rule, decay)
+                    self._apply_message(rule['dst'], rule['fwd'], fwd)
+                    rule['fwd'] = fwd
+                    target = rule['dst']
+                    heapq.heappush(heap, (-self._residual(target), next(counter), target))
+                if rule['dst'] == name:
+                    bwd = self._backward_message(rule, decay)
+                    self._apply_message(rule['src'], rule['bwd'], bwd)
+                    rule['bwd'] = bwd
+                    target = rule['src']
+                    heapq.heappush(heap, (-self._residual(target), next(counter), target))
+
+        # Update budget exhausted: carry the pending work into the next call
+        for _, _, name in heap:
+            if name in self.nodes and (name in forced or self._residual(name) >= tol):
+                self.dirty_nodes.add(name)
+
+        log(f"--- Incremental Beta-Propagation: {updates} node updates, "
+            f"{len(self.dirty_nodes)} pending ---", level=2)
+        return updates
+
 # --- Main Execution ---
 
 # data = [
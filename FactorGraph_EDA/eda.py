@@ -8,13 +8,19 @@ program instances from the learned distribution.
 
 import random
 from copy import deepcopy
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Union
 
-from FactorGraph_EDA.pln import STV, c2w, w2c, revision, deduction, negation
-from FactorGraph_EDA.factor_graph import SubtreeVariable, PairwiseFactor, FactorGraph
+import numpy as np
+
+from FactorGraph_EDA.pln import (STV, c2w, w2c, revision, deduction, negation,
+                                  revision_vec, deduction_vec)
+from FactorGraph_EDA.factor_graph import (SubtreeVariable, PairwiseFactor, FactorGraph,
+                                          ArrayFactorGraph, SymbolTable)
 from Representation.representation import Instance, Knob, Deme, FitnessOracle
-from Representation.selection import select_top_k
+from Representation.selection import select_top_k, score_for_top_k
+from Representation.racing import RacingEvaluator, check_racing_config
 from Representation.helpers import get_top_level_features, isOP, tokenize
+from Representation.telemetry import get_telemetry, log
 
 from DependencyMiner.miner import DependencyMiner
 
@@ -26,6 +32,7 @@ from DependencyMiner.miner import DependencyMiner
 def build_factor_graph_from_miner(
     miner: DependencyMiner,
     dependencies: List[dict],
+    symbols: Optional[SymbolTable] = None,
 ) -> FactorGraph:
     """
     Construct a FactorGraph from a fitted DependencyMiner.
@@ -36,8 +43,12 @@ def build_factor_graph_from_miner(
 
     Factors: each high-PMI pair from *dependencies*.
         stv = (strength, confidence)  already computed by the miner.
+
+    If *symbols* is given, the graph is an :class:`ArrayFactorGraph` keyed
+    by that (run-wide) symbol table, so consecutive generations can be
+    revised with aligned array operations.
     """
-    fg = FactorGraph()
+    fg = FactorGraph() if symbols is None else ArrayFactorGraph(symbols)
     total = miner.total_weighted_contexts
     if total <= 0:
         return fg
@@ -47,7 +58,7 @@ def build_factor_graph_from_miner(
         count = miner.single_counts.get(name, 0)
         s = weight / total                # marginal probability
         c = w2c(float(count))             # more observations → higher confidence
-        fg.add_variable(SubtreeVariable(name, marginal_stv=(s, min(c, 0.9999))))
+        fg.set_variable(name, (s, min(c, 0.9999)))
 
     # --- factors (one per meaningful dependency) ---------------------------
     for dep in dependencies:
@@ -58,11 +69,11 @@ def build_factor_graph_from_miner(
         var_a, var_b = parts[0].strip(), parts[1].strip()
 
         # Only create factor if both variables exist
-        if fg.get_variable(var_a) is None or fg.get_variable(var_b) is None:
+        if var_a not in fg.variables or var_b not in fg.variables:
             continue
 
         stv: STV = (dep["strength"], dep["confidence"])
-        fg.add_factor(PairwiseFactor(var_a, var_b, stv))
+        fg.set_factor(var_a, var_b, stv)
 
     return fg
 
@@ -78,93 +89,150 @@ def revise_factor_graph(new_fg: FactorGraph, old_fg: FactorGraph) -> None:
     For each variable / factor present in both graphs, their STVs are revised
     (evidence accumulates, confidence grows).  Items only in *new_fg* are kept
     as-is; items only in *old_fg* are carried forward with decayed confidence.
+
+    Shared items are revised together with :func:`revision_vec`; two
+    ArrayFactorGraphs on the same SymbolTable are merged column-wise by
+    :meth:`ArrayFactorGraph.revise_from`.
     """
+    if (isinstance(new_fg, ArrayFactorGraph) and isinstance(old_fg, ArrayFactorGraph)
+            and new_fg.symbols is old_fg.symbols):
+        new_fg.revise_from(old_fg, decay=0.9)
+        return
+
     # --- revise shared variables -------------------------------------------
-    for name, new_var in new_fg.variables.items():
-        old_var = old_fg.get_variable(name)
-        if old_var is not None:
-            new_var.marginal_stv = revision(new_var.marginal_stv,
-                                            old_var.marginal_stv)
+    shared = [name for name in new_fg.variables if name in old_fg.variables]
+    if shared:
+        new_stv = np.array([new_fg.variables[n].marginal_stv for n in shared], dtype=float)
+        old_stv = np.array([old_fg.variables[n].marginal_stv for n in shared], dtype=float)
+        s, c = revision_vec(new_stv[:, 0], new_stv[:, 1], old_stv[:, 0], old_stv[:, 1])
+        for name, s_i, c_i in zip(shared, s.tolist(), c.tolist()):
+            new_fg.variables[name].marginal_stv = (s_i, c_i)
 
     # carry forward old-only variables with slight confidence decay
     for name, old_var in old_fg.variables.items():
         if name not in new_fg.variables:
             decayed_c = old_var.marginal_stv[1] * 0.9
-            new_fg.add_variable(
-                SubtreeVariable(name, (old_var.marginal_stv[0], decayed_c)))
+            new_fg.set_variable(name, (old_var.marginal_stv[0], decayed_c))
 
     # --- revise shared factors ---------------------------------------------
-    for key, new_fac in new_fg.factors.items():
-        old_fac = old_fg.get_factor(key)
-        if old_fac is not None:
-            new_fac.stv = revision(new_fac.stv, old_fac.stv)
+    shared_keys = [key for key in new_fg.factors if key in old_fg.factors]
+    if shared_keys:
+        new_stv = np.array([new_fg.factors[k].stv for k in shared_keys], dtype=float)
+        old_stv = np.array([old_fg.factors[k].stv for k in shared_keys], dtype=float)
+        s, c = revision_vec(new_stv[:, 0], new_stv[:, 1], old_stv[:, 0], old_stv[:, 1])
+        for key, s_i, c_i in zip(shared_keys, s.tolist(), c.tolist()):
+            new_fg.factors[key].stv = (s_i, c_i)
 
     for key, old_fac in old_fg.factors.items():
         if key not in new_fg.factors:
             decayed_c = old_fac.stv[1] * 0.9
-            new_fg.add_factor(
-                PairwiseFactor(old_fac.var_a, old_fac.var_b,
-                               (old_fac.stv[0], decayed_c)))
+            new_fg.set_factor(old_fac.var_a, old_fac.var_b,
+                              (old_fac.stv[0], decayed_c))
 
 
 # ========================================================================
 # 3.  PLN deduction — fill structural gaps
 # ========================================================================
 
-def apply_deduction(fg: FactorGraph) -> None:
+def apply_deduction(
+    fg: FactorGraph,
+    max_inferred: Optional[int] = None,
+    min_confidence: float = 0.0,
+    depth: int = 1,
+) -> int:
     """
     For every pair of factors that share a variable (A-B and B-C),
     infer A-C via PLN deduction if no direct factor exists yet.
 
+    Pairs are enumerated per pivot from ``fg.adjacency``, so the cost is
+    the sum of squared degrees rather than all factor pairs.  Within a
+    pair, the factor added to the graph first plays A-B.
+
     Inferred factors are marked ``inferred=True`` and have lower
     confidence (reflecting that they are derived, not observed).
-    """
-    factor_list = list(fg.factors.values())
-    new_factors: List[PairwiseFactor] = []
-
-    for i in range(len(factor_list)):
-        for j in range(i + 1, len(factor_list)):
-            f1 = factor_list[i]
-            f2 = factor_list[j]
-
-            # find shared pivot variable
-            vars1 = {f1.var_a, f1.var_b}
-            vars2 = {f2.var_a, f2.var_b}
-            shared = vars1 & vars2
 
-            if not shared:
-                continue
-
-            pivot = shared.pop()
-            remain_a = vars1 - {pivot}
-            remain_c = vars2 - {pivot}
+    Args:
+        max_inferred:   cap on the number of inferred factors added
+                        (the most confident are kept).
+        min_confidence: inferred factors below this confidence are dropped.
+        depth:          number of closure rounds; round r only chains
+                        factors where at least one was inferred in round
+                        r-1, and stops early once nothing new appears.
 
-            # skip self-loops or degenerate factors
-            if not remain_a or not remain_c:
-                continue
+    Returns the number of inferred factors added.
+    """
+    position = {key: i for i, key in enumerate(fg.factors)}
+    frontier = set(fg.factors)
+    added = 0
 
-            end_a = remain_a.pop()
-            end_c = remain_c.pop()
+    for _ in range(depth):
+        if not frontier or (max_inferred is not None and added >= max_inferred):
+            break
 
-            # skip if both endpoints are the same variable
-            if end_a == end_c:
-                continue
+        pivots = {name for key in frontier for name in key}
+        # (key, end_a, end_c, factor A-B, factor B-C, s_b) for every open gap
+        pending: List[tuple] = []
 
-            # skip if direct factor already exists
-            key = (min(end_a, end_c), max(end_a, end_c))
-            if fg.get_factor(key) is not None:
+        for pivot in pivots:
+            incident = [key for key in fg.adjacency.get(pivot, ())
+                        if key[0] != key[1]]
+            if len(incident) < 2:
                 continue
+            incident.sort(key=position.__getitem__)
 
             # marginal strength of the pivot
             pivot_var = fg.get_variable(pivot)
             s_b = pivot_var.marginal_stv[0] if pivot_var else 0.5
 
-            stv_ac = deduction(f1.stv, f2.stv, s_b)
-            new_factors.append(
-                PairwiseFactor(end_a, end_c, stv_ac, inferred=True))
-
-    for f in new_factors:
-        fg.add_factor(f)
+            for i in range(len(incident)):
+                key1 = incident[i]
+                end_a = key1[1] if key1[0] == pivot else key1[0]
+                for j in range(i + 1, len(incident)):
+                    key2 = incident[j]
+                    if key1 not in frontier and key2 not in frontier:
+                        continue
+                    end_c = key2[1] if key2[0] == pivot else key2[0]
+
+                    # skip if both endpoints are the same variable
+                    if end_a == end_c:
+                        continue
+
+                    # skip if direct factor already exists
+                    key = (min(end_a, end_c), max(end_a, end_c))
+                    if key in fg.factors:
+                        continue
+
+                    pending.append((key, end_a, end_c, key1, key2, s_b))
+
+        candidates: dict = {}
+        if pending:
+            stv_ab = np.array([fg.factors[p[3]].stv for p in pending], dtype=float)
+            stv_bc = np.array([fg.factors[p[4]].stv for p in pending], dtype=float)
+            s_b = np.array([p[5] for p in pending], dtype=float)
+            s_ac, c_ac = deduction_vec(stv_ab[:, 0], stv_ab[:, 1],
+                                       stv_bc[:, 0], stv_bc[:, 1], s_b)
+
+            for (key, end_a, end_c, _, _, _), s_i, c_i in zip(
+                    pending, s_ac.tolist(), c_ac.tolist()):
+                if c_i < min_confidence:
+                    continue
+                # several pivots can close the same gap: keep the most confident
+                best = candidates.get(key)
+                if best is None or c_i > best[1][1]:
+                    candidates[key] = ((end_a, end_c), (s_i, c_i))
+
+        ranked = sorted(candidates.items(), key=lambda item: item[1][1][1], reverse=True)
+        if max_inferred is not None:
+            ranked = ranked[:max_inferred - added]
+
+        frontier = set()
+        for key, ((end_a, end_c), stv_ac) in ranked:
+            fg.set_factor(end_a, end_c, stv_ac, inferred=True)
+            position[key] = len(position)
+            frontier.add(key)
+        added += len(ranked)
+
+    return added
 
 
 # ========================================================================
@@ -172,13 +240,14 @@ def apply_deduction(fg: FactorGraph) -> None:
 # ========================================================================
 
 def _conditional_strength(
-    factor: PairwiseFactor,
-    assigned_var: str,
-    assigned_present: bool,
-) -> float:
+    strength: np.ndarray,
+    confidence: np.ndarray,
+    assigned_present: np.ndarray,
+) -> np.ndarray:
     """
-    Given a pairwise factor and that *assigned_var* is present / absent,
-    return the conditional probability that the *other* variable is present.
+    Given pairwise factor STVs and whether the assigned variable is present /
+    absent (element-wise), return the conditional probability that the
+    *other* variable is present.
 
     If assigned_present:
         P(other | assigned) ≈ factor.strength  (they co-occur)
@@ -187,11 +256,19 @@ def _conditional_strength(
 
     Confidence modulates: low confidence → fall back to 0.5 (uniform).
     """
-    s, c = factor.stv
-    if not assigned_present:
-        s = 1.0 - s
+    s = np.where(assigned_present, strength, 1.0 - strength)
     # blend toward 0.5 when confidence is low
-    return c * s + (1.0 - c) * 0.5
+    return confidence * s + (1.0 - confidence) * 0.5
+
+
+def _as_generator(rng: Optional[Union[int, np.random.Generator]]) -> np.random.Generator:
+    """Seed / Generator → Generator.  ``None`` draws a seed from ``random``
+    so runs seeded with ``random.seed`` stay reproducible."""
+    if isinstance(rng, np.random.Generator):
+        return rng
+    if rng is None:
+        rng = random.getrandbits(64)
+    return np.random.default_rng(rng)
 
 
 def sample_from_factor_graph(
@@ -199,88 +276,101 @@ def sample_from_factor_graph(
     n: int,
     root_op: str,
     all_knobs: List[Knob],
+    rng: Optional[Union[int, np.random.Generator]] = None,
 ) -> List[Instance]:
     """
     Generate *n* new program instances by ancestral sampling from *fg*.
 
-    Procedure for each sample:
+    All *n* samples are drawn together:
       1. Order variables by marginal strength (strongest first).
-      2. Walk through the ordered list; for each variable decide
-         present / absent using marginal × conditional from already-
-         assigned neighbours.
-      3. Collect all "present" subtrees and form ``(root_op t1 t2 ...)``.
-      4. Build an ``Instance`` with the matching knobs.
+      2. Walk through the ordered list once; for each variable compute the
+         (n,) column of presence probabilities from its marginal ×
+         conditionals of already-assigned neighbours, and draw the column
+         of the (n × V) presence matrix.
+      3. Collect all "present" subtrees of each row and form
+         ``(root_op t1 t2 ...)``.
+      4. Build an ``Instance`` with the matching knobs (shared, not copied).
+
+    *rng* is a seed or ``np.random.Generator``; equal seeds give equal samples.
 
     Returns a list of *n* ``Instance`` objects (scores initialised to 0.0).
     """
     if not fg.variables:
         return []
 
+    gen = _as_generator(rng)
+
     var_names = sorted(
         fg.variables.keys(),
         key=lambda v: fg.variables[v].marginal_stv[0],
         reverse=True,
     )
+    num_vars = len(var_names)
+    csr = fg.to_csr(order=var_names)
 
-    knob_lookup = {k.symbol: k for k in all_knobs}
-    instances: List[Instance] = []
+    marginals = np.array([fg.variables[v].marginal_stv for v in var_names], dtype=float)
+    # Start with marginal (blended toward 0.5 by confidence)
+    base_p = marginals[:, 1] * marginals[:, 0] + (1.0 - marginals[:, 1]) * 0.5
 
-    for idx in range(n):
-        assigned: dict[str, bool] = {}
-        present_subtrees: List[str] = []
-
-        for vname in var_names:
-            var = fg.variables[vname]
-            s_marginal, c_marginal = var.marginal_stv
-
-            # Start with marginal (blended toward 0.5 by confidence)
-            p_present = c_marginal * s_marginal + (1.0 - c_marginal) * 0.5
-
-            # Adjust with conditional information from assigned neighbours
-            for fac in fg.neighbors(vname):
-                other = fac.var_b if fac.var_a == vname else fac.var_a
-                if other in assigned:
-                    cond = _conditional_strength(fac, other, assigned[other])
-                    # multiplicative blend
-                    p_present *= cond
-                    # re-normalise into [0.05, 0.95] to keep exploration
-                    p_present = max(0.05, min(0.95, p_present))
-
-            present = random.random() < p_present
-            assigned[vname] = present
-            if present:
-                present_subtrees.append(vname)
-
-        # --- reconstruct S-expression -------------------------------------
-        if not present_subtrees:
-            # fallback: pick at least one subtree at random
-            present_subtrees = [random.choice(var_names)]
-
-        if len(present_subtrees) == 1:
-            expr = present_subtrees[0]
-        else:
-            inner = " ".join(present_subtrees)
-            expr = f"({root_op} {inner})"
-
-        # --- build knob list for the new instance --------------------------
-        inst_knobs: List[Knob] = []
-        seen_knob_symbols: set = set()
-        for st in present_subtrees:
-            # strip (NOT ...) wrappers to find base symbol
-            base = st.strip()
-            if base.startswith("(NOT ") and base.endswith(")"):
-                base = base[5:-1].strip()
-            # try base symbol first, then full subtree string
-            for candidate in (base, st):
-                if candidate in knob_lookup and candidate not in seen_knob_symbols:
-                    inst_knobs.append(deepcopy(knob_lookup[candidate]))
-                    seen_knob_symbols.add(candidate)
+    present = np.zeros((n, num_vars), dtype=bool)
+    draws = gen.random((n, num_vars))
 
+    for j in range(num_vars):
+        p_present = np.full(n, base_p[j])
+
+        # Adjust with conditional information from assigned neighbours,
+        # i.e. the ones earlier in the order
+        for e in range(csr.indptr[j], csr.indptr[j + 1]):
+            k = csr.neighbors[e]
+            if k >= j:
+                continue
+            cond = _conditional_strength(csr.strength[e], csr.confidence[e], present[:, k])
+            # multiplicative blend, re-normalised into [0.05, 0.95] to keep exploration
+            p_present = np.clip(p_present * cond, 0.05, 0.95)
+
+        present[:, j] = draws[:, j] < p_present
+
+    # fallback: rows with nothing present get one subtree at random
+    empty_rows = ~present.any(axis=1)
+    if empty_rows.any():
+        present[empty_rows, gen.integers(num_vars, size=int(empty_rows.sum()))] = True
+
+    # --- knobs per variable (strip (NOT ...) to find the base symbol) -------
+    knob_lookup = {k.symbol: k for k in all_knobs}
+    var_knobs: List[List[Tuple[str, Knob]]] = []
+    for st in var_names:
+        base = st.strip()
+        if base.startswith("(NOT ") and base.endswith(")"):
+            base = base[5:-1].strip()
+        # try base symbol first, then full subtree string
+        var_knobs.append([(c, knob_lookup[c]) for c in dict.fromkeys((base, st))
+                          if c in knob_lookup])
+
+    # --- reconstruct S-expressions; identical rows share the work ----------
+    instances: List[Instance] = []
+    built: dict = {}
+    for idx, row in enumerate(present):
+        row_key = row.tobytes()
+        if row_key not in built:
+            cols = np.flatnonzero(row)
+            present_subtrees = [var_names[j] for j in cols]
+            if len(present_subtrees) == 1:
+                expr = present_subtrees[0]
+            else:
+                expr = f"({root_op} {' '.join(present_subtrees)})"
+
+            knobs_by_symbol: dict = {}
+            for j in cols:
+                for symbol, knob in var_knobs[j]:
+                    knobs_by_symbol.setdefault(symbol, knob)
+            built[row_key] = (expr, list(knobs_by_symbol.values()))
+
+        expr, inst_knobs = built[row_key]
         instances.append(Instance(
             value=expr,
             id=idx + 1,
             score=0.0,
-            knobs=inst_knobs,
+            knobs=list(inst_knobs),
         ))
 
     return instances
@@ -406,6 +496,8 @@ def eda_generation(
     sample_size: Optional[int] = None,
     prev_factor_graph: Optional[FactorGraph] = None,
     all_knobs: Optional[List[Knob]] = None,
+    symbols: Optional[SymbolTable] = None,
+    racer: Optional[RacingEvaluator] = None,
 ) -> Tuple[Deme, FactorGraph]:
     """
     One generation of the EDA:
@@ -419,14 +511,26 @@ def eda_generation(
     7. Sample a new population from the factor graph.
     8. Keep elite instances alongside new samples.
     9. Return the updated deme and factor graph.
+
+    Passing the same *symbols* every generation builds array-backed graphs
+    (see :class:`ArrayFactorGraph`).
+
+    With ``deme.q_hyper.fitness_block_size > 0`` candidates that cannot
+    reach the top-k are cut off early (see ``score_for_top_k``); they keep
+    an upper bound as score and never enter the top-k.  With a *racer*
+    the top-k is raced on row samples instead (see
+    Representation/racing.py); only its contenders are scored exactly.
+    The two are exclusive (``check_racing_config``).
     """
+    block_size = getattr(getattr(deme, 'q_hyper', None), 'fitness_block_size', 0)
+
     # -- 1. evaluate --------------------------------------------------------
-    for inst in deme.instances:
-        fitness_oracle.get_fitness(inst)
+    if racer is None:
+        score_for_top_k(deme.instances, fitness_oracle, top_k, block_size)
 
     # -- 2. select ----------------------------------------------------------
     k = min(top_k, len(deme.instances))
-    top_instances = select_top_k(deme, k)
+    top_instances = select_top_k(deme, k, racer=racer)
 
     if not top_instances:
         fg = FactorGraph()
@@ -436,20 +540,23 @@ def eda_generation(
     expressions = [inst.value for inst in top_instances]
     weights = [inst.score for inst in top_instances]
 
-    miner = DependencyMiner()
-    miner.fit(expressions, weights)
-    dependencies = miner.get_meaningful_dependencies(
-        min_pmi=min_pmi, min_freq=min_freq)
+    telemetry = get_telemetry()
+    with telemetry.timer("mining"):
+        miner = DependencyMiner()
+        miner.fit(expressions, weights)
+        dependencies = miner.get_meaningful_dependencies(
+            min_pmi=min_pmi, min_freq=min_freq)
 
-    # -- 4. build factor graph ----------------------------------------------
-    fg = build_factor_graph_from_miner(miner, dependencies)
+    with telemetry.timer("propagation"):
+        # -- 4. build factor graph ------------------------------------------
+        fg = build_factor_graph_from_miner(miner, dependencies, symbols=symbols)
 
-    # -- 5. revise with previous generation ---------------------------------
-    if prev_factor_graph is not None:
-        revise_factor_graph(fg, prev_factor_graph)
+        # -- 5. revise with previous generation -----------------------------
+        if prev_factor_graph is not None:
+            revise_factor_graph(fg, prev_factor_graph)
 
-    # -- 6. deduction -------------------------------------------------------
-    apply_deduction(fg)
+        # -- 6. deduction ---------------------------------------------------
+        apply_deduction(fg)
 
     # -- 7. sample ----------------------------------------------------------
     # detect root operator from the best instance
@@ -475,40 +582,50 @@ def eda_generation(
     pop_size = sample_size or len(deme.instances)
 
     # If the factor graph has variables, sample from it; otherwise keep top instances
-    if fg.variables:
-        new_instances = sample_from_factor_graph(fg, pop_size, root_op, all_knobs_local)
-    else:
-        # No structure learned — duplicate top instances with slight variation
-        new_instances = [deepcopy(inst) for inst in top_instances]
-
-    # -- 7b. apply variation / mutation to introduce structural diversity ----
-    mut_rate = deme.q_hyper.mutation_rate if hasattr(deme, 'q_hyper') else 0.3
-    mutated: List[Instance] = []
-    for inst in new_instances:
-        if random.random() < mut_rate:
-            mutated.append(mutate_instance(inst, all_knobs_local,
-                                           mutation_rate=mut_rate, fg=fg))
+    with telemetry.timer("variation"):
+        if fg.variables:
+            new_instances = sample_from_factor_graph(fg, pop_size, root_op, all_knobs_local)
         else:
-            mutated.append(inst)
-    new_instances = mutated
+            # No structure learned — duplicate top instances with slight variation
+            new_instances = [deepcopy(inst) for inst in top_instances]
+
+        # -- 7b. apply variation / mutation to introduce structural diversity
+        mut_rate = deme.q_hyper.mutation_rate if hasattr(deme, 'q_hyper') else 0.3
+        mutated: List[Instance] = []
+        for inst in new_instances:
+            if random.random() < mut_rate:
+                mutated.append(mutate_instance(inst, all_knobs_local,
+                                               mutation_rate=mut_rate, fg=fg))
+            else:
+                mutated.append(inst)
+        new_instances = mutated
+    telemetry.count("candidates_generated", len(new_instances))
 
     # -- 8. evaluate new instances ------------------------------------------
-    for inst in new_instances:
-        fitness_oracle.get_fitness(inst)
-
-    # -- 9. merge: keep elite + new, deduplicate, trim to pop_size ----------
     elite_count = max(1, k // 2)
     elites = top_instances[:elite_count]
+    if racer is not None:
+        racer.select_top_k(elites + new_instances, top_k)
+    else:
+        score_for_top_k(new_instances, fitness_oracle, top_k, block_size, scored=elites)
+
+    # -- 9. merge: keep elite + new, deduplicate, trim to pop_size ----------
 
     merged: dict[str, Instance] = {}
     for inst in elites:
         merged[inst.value] = inst
     for inst in new_instances:
         if inst.value not in merged or inst.score > merged[inst.value].score:
+            if inst.value in merged:
+                telemetry.count("duplicates_dropped")
             merged[inst.value] = inst
+        else:
+            telemetry.count("duplicates_dropped")
 
     combined = sorted(merged.values(), key=lambda x: x.score, reverse=True)
     deme.instances = combined[:pop_size]
+    if racer is not None:
+        racer.retain(inst.value for inst in deme.instances)
 
     deme.factor_graph = fg
     deme.generation += 1
@@ -531,8 +648,16 @@ def run_deme_eda(
     Run *num_generations* of EDA on a single deme.
 
     Returns the fittest Instance found across all generations and the
-    final FactorGraph.
+    final FactorGraph.  All generations share one SymbolTable, so the
+    graphs are array-backed and revised without per-item objects.  With
+    ``deme.q_hyper.racing_delta > 0`` they also share one RacingEvaluator.
     """
+    symbols = SymbolTable()
+    q_hyper = getattr(deme, 'q_hyper', None)
+    if q_hyper is not None:
+        check_racing_config(q_hyper, fitness_oracle)
+    racing_delta = getattr(q_hyper, 'racing_delta', 0.0)
+    racer = RacingEvaluator(fitness_oracle, delta=racing_delta) if racing_delta > 0 else None
     prev_fg: Optional[FactorGraph] = None
     best_ever: Optional[Instance] = None
 
@@ -546,6 +671,8 @@ def run_deme_eda(
             sample_size=sample_size,
             prev_factor_graph=prev_fg,
             all_knobs=all_knobs,
+            symbols=symbols,
+            racer=racer,
         )
         prev_fg = fg
 
@@ -555,15 +682,15 @@ def run_deme_eda(
             best_ever = deepcopy(gen_best)
 
         if verbose:
-            print(f"  Gen {gen+1:>3}/{num_generations}  "
-                  f"pop={len(deme.instances):>3}  "
-                  f"best={gen_best.score:.4f}  "
-                  f"expr={gen_best.value}")
+            log(f"  Gen {gen+1:>3}/{num_generations}  "
+                f"pop={len(deme.instances):>3}  "
+                f"best={gen_best.score:.4f}  "
+                f"expr={gen_best.value}")
 
         # early stop if perfect score
         if gen_best.score >= 1.0:
             if verbose:
-                print(f"  ** Perfect score reached at generation {gen+1} **")
+                log(f"  ** Perfect score reached at generation {gen+1} **")
             break
 
     return best_ever, fg
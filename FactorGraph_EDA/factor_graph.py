@@ -5,8 +5,12 @@ Variables are subtrees (binary: present/absent in a program).
 Factors are pairwise edges carrying PLN truth values (strength, confidence).
 """
 
-from typing import Dict, List, Optional, Tuple
-from FactorGraph_EDA.pln import STV
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from FactorGraph_EDA.pln import STV, revision_vec
 
 
 class SubtreeVariable:
@@ -80,16 +84,40 @@ class PairwiseFactor:
         return hash(self.key)
 
 
+class CSRAdjacency(NamedTuple):
+    """
+    Compressed-sparse-row view of a FactorGraph for vectorized consumers.
+
+    Row ``i`` describes variable ``names[i]``; its incident factors occupy
+    ``indptr[i]:indptr[i+1]`` in the flat arrays:
+        neighbors:  index of the variable at the other end
+        strength / confidence:  the factor's STV
+        factor_keys:  the factor key, for looking the factor back up
+    A self-loop factor appears once, with itself as neighbour.
+    """
+    names: List[str]
+    index: Dict[str, int]
+    indptr: np.ndarray
+    neighbors: np.ndarray
+    strength: np.ndarray
+    confidence: np.ndarray
+    factor_keys: List[Tuple[str, str]]
+
+
 class FactorGraph:
     """
     A factor graph whose variable nodes are subtrees and whose factor
     (edge) nodes are pairwise couplings with PLN truth values.
 
+    ``adjacency`` maps every variable name to the keys of the factors that
+    touch it; it is maintained by ``add_factor`` so neighbourhood queries
+    do not have to scan all factors.
     """
 
     def __init__(self):
         self.variables: Dict[str, SubtreeVariable] = {}
         self.factors: Dict[Tuple[str, str], PairwiseFactor] = {}
+        self.adjacency: Dict[str, List[Tuple[str, str]]] = {}
 
     # -- construction helpers ------------------------------------------------
 
@@ -97,7 +125,18 @@ class FactorGraph:
         self.variables[var.name] = var
 
     def add_factor(self, factor: PairwiseFactor) -> None:
-        self.factors[factor.key] = factor
+        key = factor.key
+        if key not in self.factors:
+            self.adjacency.setdefault(factor.var_a, []).append(key)
+            if factor.var_b != factor.var_a:
+                self.adjacency.setdefault(factor.var_b, []).append(key)
+        self.factors[key] = factor
+
+    def set_variable(self, name: str, stv: STV) -> None:
+        self.add_variable(SubtreeVariable(name, stv))
+
+    def set_factor(self, var_a: str, var_b: str, stv: STV, inferred: bool = False) -> None:
+        self.add_factor(PairwiseFactor(var_a, var_b, stv, inferred))
 
     def get_variable(self, name: str) -> Optional[SubtreeVariable]:
         return self.variables.get(name)
@@ -113,8 +152,7 @@ class FactorGraph:
 
     def neighbors(self, var_name: str) -> List[PairwiseFactor]:
         """Return all factors that involve the given variable."""
-        return [f for f in self.factors.values()
-                if f.var_a == var_name or f.var_b == var_name]
+        return [self.factors[key] for key in self.adjacency.get(var_name, ())]
 
     def neighbor_names(self, var_name: str) -> List[str]:
         """Return names of all variables connected to *var_name*."""
@@ -124,9 +162,366 @@ class FactorGraph:
             names.append(other)
         return names
 
+    def to_csr(self, order: Optional[Sequence[str]] = None) -> CSRAdjacency:
+        """
+        Export the adjacency as CSR arrays.
+
+        Rows follow *order* if given (default: insertion order of
+        ``variables``); factor endpoints missing from it are appended.
+        """
+        names = list(order) if order is not None else list(self.variables)
+        index = {name: i for i, name in enumerate(names)}
+        for key in self.factors:
+            for name in key:
+                if name not in index:
+                    index[name] = len(names)
+                    names.append(name)
+
+        indptr = np.zeros(len(names) + 1, dtype=np.int64)
+        neighbors: List[int] = []
+        strength: List[float] = []
+        confidence: List[float] = []
+        factor_keys: List[Tuple[str, str]] = []
+        for i, name in enumerate(names):
+            for key in self.adjacency.get(name, ()):
+                f = self.factors[key]
+                other = f.var_b if f.var_a == name else f.var_a
+                neighbors.append(index[other])
+                strength.append(f.stv[0])
+                confidence.append(f.stv[1])
+                factor_keys.append(key)
+            indptr[i + 1] = len(neighbors)
+
+        return CSRAdjacency(
+            names=names,
+            index=index,
+            indptr=indptr,
+            neighbors=np.asarray(neighbors, dtype=np.int64),
+            strength=np.asarray(strength, dtype=float),
+            confidence=np.asarray(confidence, dtype=float),
+            factor_keys=factor_keys,
+        )
+
     # -- summary -------------------------------------------------------------
 
     def __repr__(self):
         return (f"FactorGraph(vars={len(self.variables)}, "
                 f"factors={len(self.factors)})")
 
+
+# ---------------------------------------------------------------------------
+# Structure-of-arrays variant
+# ---------------------------------------------------------------------------
+
+class SymbolTable:
+    """
+    Interns variable names and factor keys to dense integer ids.
+
+    One table is shared by all graphs of an EDA run, so the same subtree or
+    factor has the same id in every generation and graphs can be merged by
+    aligned array operations.
+    """
+
+    def __init__(self):
+        self.var_ids: Dict[str, int] = {}
+        self.var_names: List[str] = []
+        self.factor_ids: Dict[Tuple[str, str], int] = {}
+        self.factor_keys: List[Tuple[str, str]] = []
+        self.factor_ends: List[Tuple[int, int]] = []
+
+    def var_id(self, name: str) -> int:
+        vid = self.var_ids.get(name)
+        if vid is None:
+            vid = self.var_ids[name] = len(self.var_names)
+            self.var_names.append(name)
+        return vid
+
+    def factor_id(self, var_a: str, var_b: str) -> int:
+        if var_a > var_b:
+            var_a, var_b = var_b, var_a
+        key = (var_a, var_b)
+        fid = self.factor_ids.get(key)
+        if fid is None:
+            fid = self.factor_ids[key] = len(self.factor_keys)
+            self.factor_keys.append(key)
+            self.factor_ends.append((self.var_id(var_a), self.var_id(var_b)))
+        return fid
+
+
+class _VariableView(SubtreeVariable):
+    """A SubtreeVariable whose STV lives in an ArrayFactorGraph."""
+
+    def __init__(self, graph: "ArrayFactorGraph", vid: int):
+        self._graph = graph
+        self._vid = vid
+
+    @property
+    def name(self) -> str:
+        return self._graph.symbols.var_names[self._vid]
+
+    @property
+    def marginal_stv(self) -> STV:
+        return (float(self._graph.var_s[self._vid]), float(self._graph.var_c[self._vid]))
+
+    @marginal_stv.setter
+    def marginal_stv(self, stv: STV) -> None:
+        self._graph.var_s[self._vid], self._graph.var_c[self._vid] = stv
+
+
+class _FactorView(PairwiseFactor):
+    """A PairwiseFactor whose STV lives in an ArrayFactorGraph."""
+
+    def __init__(self, graph: "ArrayFactorGraph", fid: int):
+        self._graph = graph
+        self._fid = fid
+
+    @property
+    def var_a(self) -> str:
+        return self._graph.symbols.factor_keys[self._fid][0]
+
+    @property
+    def var_b(self) -> str:
+        return self._graph.symbols.factor_keys[self._fid][1]
+
+    @property
+    def stv(self) -> STV:
+        return (float(self._graph.fac_s[self._fid]), float(self._graph.fac_c[self._fid]))
+
+    @stv.setter
+    def stv(self, stv: STV) -> None:
+        self._graph.fac_s[self._fid], self._graph.fac_c[self._fid] = stv
+
+    @property
+    def inferred(self) -> bool:
+        return bool(self._graph.fac_inferred[self._fid])
+
+    @inferred.setter
+    def inferred(self, value: bool) -> None:
+        self._graph.fac_inferred[self._fid] = value
+
+
+class _VariableMap(Mapping):
+    def __init__(self, graph: "ArrayFactorGraph"):
+        self._graph = graph
+
+    def __getitem__(self, name: str) -> SubtreeVariable:
+        vid = self._graph.symbols.var_ids.get(name)
+        if vid is None or vid >= len(self._graph.var_mask) or not self._graph.var_mask[vid]:
+            raise KeyError(name)
+        return _VariableView(self._graph, vid)
+
+    def __contains__(self, name) -> bool:
+        vid = self._graph.symbols.var_ids.get(name)
+        return vid is not None and vid < len(self._graph.var_mask) and bool(self._graph.var_mask[vid])
+
+    def __iter__(self) -> Iterator[str]:
+        names = self._graph.symbols.var_names
+        return (names[i] for i in np.flatnonzero(self._graph.var_mask))
+
+    def __len__(self) -> int:
+        return int(self._graph.var_mask.sum())
+
+
+class _FactorMap(Mapping):
+    def __init__(self, graph: "ArrayFactorGraph"):
+        self._graph = graph
+
+    def __getitem__(self, key: Tuple[str, str]) -> PairwiseFactor:
+        fid = self._graph.symbols.factor_ids.get(key)
+        if fid is None or fid >= len(self._graph.fac_mask) or not self._graph.fac_mask[fid]:
+            raise KeyError(key)
+        return _FactorView(self._graph, fid)
+
+    def __contains__(self, key) -> bool:
+        fid = self._graph.symbols.factor_ids.get(key)
+        return fid is not None and fid < len(self._graph.fac_mask) and bool(self._graph.fac_mask[fid])
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        keys = self._graph.symbols.factor_keys
+        return (keys[i] for i in np.flatnonzero(self._graph.fac_mask))
+
+    def __len__(self) -> int:
+        return int(self._graph.fac_mask.sum())
+
+
+class ArrayFactorGraph(FactorGraph):
+    """
+    FactorGraph whose variables and factors are stored column-wise in NumPy
+    arrays indexed by ids from a shared :class:`SymbolTable`:
+
+        var_s, var_c, var_mask                 — per variable id
+        fac_s, fac_c, fac_inferred, fac_mask   — per factor id
+
+    ``variables`` / ``factors`` are read-only mappings that hand out views,
+    so ``get_variable``, ``get_factor``, ``neighbors`` and everything in
+    ``eda.py`` work unchanged, while :meth:`revise_from` merges two
+    generations with a handful of array operations and no per-item objects.
+    """
+
+    def __init__(self, symbols: Optional[SymbolTable] = None):
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self.var_s = np.zeros(0)
+        self.var_c = np.zeros(0)
+        self.var_mask = np.zeros(0, dtype=bool)
+        self.fac_s = np.zeros(0)
+        self.fac_c = np.zeros(0)
+        self.fac_inferred = np.zeros(0, dtype=bool)
+        self.fac_mask = np.zeros(0, dtype=bool)
+        self._adjacency: Optional[Dict[str, List[Tuple[str, str]]]] = None
+
+    # -- storage ---------------------------------------------------------------
+
+    @staticmethod
+    def _grown(arr: np.ndarray, size: int) -> np.ndarray:
+        if len(arr) >= size:
+            return arr
+        out = np.zeros(max(size, 2 * len(arr)), dtype=arr.dtype)
+        out[:len(arr)] = arr
+        return out
+
+    def _reserve(self) -> None:
+        """Make the arrays cover every id in the symbol table."""
+        n_vars = len(self.symbols.var_names)
+        if len(self.var_mask) < n_vars:
+            self.var_s = self._grown(self.var_s, n_vars)
+            self.var_c = self._grown(self.var_c, n_vars)
+            self.var_mask = self._grown(self.var_mask, n_vars)
+        n_facs = len(self.symbols.factor_keys)
+        if len(self.fac_mask) < n_facs:
+            self.fac_s = self._grown(self.fac_s, n_facs)
+            self.fac_c = self._grown(self.fac_c, n_facs)
+            self.fac_inferred = self._grown(self.fac_inferred, n_facs)
+            self.fac_mask = self._grown(self.fac_mask, n_facs)
+
+    @property
+    def variables(self) -> Mapping:
+        return _VariableMap(self)
+
+    @property
+    def factors(self) -> Mapping:
+        return _FactorMap(self)
+
+    @property
+    def adjacency(self) -> Dict[str, List[Tuple[str, str]]]:
+        if self._adjacency is None:
+            adjacency: Dict[str, List[Tuple[str, str]]] = {}
+            for fid in np.flatnonzero(self.fac_mask):
+                key = self.symbols.factor_keys[fid]
+                adjacency.setdefault(key[0], []).append(key)
+                if key[1] != key[0]:
+                    adjacency.setdefault(key[1], []).append(key)
+            self._adjacency = adjacency
+        return self._adjacency
+
+    # -- construction helpers --------------------------------------------------
+
+    def set_variable(self, name: str, stv: STV) -> None:
+        vid = self.symbols.var_id(name)
+        self._reserve()
+        self.var_s[vid], self.var_c[vid] = stv
+        self.var_mask[vid] = True
+
+    def set_factor(self, var_a: str, var_b: str, stv: STV, inferred: bool = False) -> None:
+        fid = self.symbols.factor_id(var_a, var_b)
+        self._reserve()
+        if not self.fac_mask[fid] and self._adjacency is not None:
+            key = self.symbols.factor_keys[fid]
+            self._adjacency.setdefault(key[0], []).append(key)
+            if key[1] != key[0]:
+                self._adjacency.setdefault(key[1], []).append(key)
+        self.fac_s[fid], self.fac_c[fid] = stv
+        self.fac_inferred[fid] = inferred
+        self.fac_mask[fid] = True
+
+    def add_variable(self, var: SubtreeVariable) -> None:
+        self.set_variable(var.name, var.marginal_stv)
+
+    def add_factor(self, factor: PairwiseFactor) -> None:
+        self.set_factor(factor.var_a, factor.var_b, factor.stv, factor.inferred)
+
+    def get_variable(self, name: str) -> Optional[SubtreeVariable]:
+        return self.variables.get(name)
+
+    def get_factor(self, key: Tuple[str, str]) -> Optional[PairwiseFactor]:
+        a, b = key
+        if a > b:
+            a, b = b, a
+        return self.factors.get((a, b))
+
+    # -- revision --------------------------------------------------------------
+
+    @staticmethod
+    def _merge(s, c, mask, old_s, old_c, old_mask, decay):
+        """Revise shared slots, carry old-only slots; returns the carried mask."""
+        n = min(len(mask), len(old_mask))
+        shared = mask[:n] & old_mask[:n]
+        if shared.any():
+            s[:n][shared], c[:n][shared] = revision_vec(
+                s[:n][shared], c[:n][shared], old_s[:n][shared], old_c[:n][shared])
+
+        carried = old_mask[:n] & ~mask[:n]
+        s[:n][carried] = old_s[:n][carried]
+        c[:n][carried] = old_c[:n][carried] * decay
+        mask[:n] |= carried
+        return carried
+
+    def revise_from(self, old: "ArrayFactorGraph", decay: float = 0.9) -> None:
+        """
+        Merge *old* into this graph in place (same rules as
+        ``eda.revise_factor_graph``): shared items are PLN-revised, items
+        only in *old* are carried forward with confidence × *decay*.
+        Both graphs must share a SymbolTable.
+        """
+        if old.symbols is not self.symbols:
+            raise ValueError("revise_from needs graphs that share a SymbolTable")
+        self._reserve()
+        old._reserve()
+
+        self._merge(self.var_s, self.var_c, self.var_mask,
+                    old.var_s, old.var_c, old.var_mask, decay)
+        carried = self._merge(self.fac_s, self.fac_c, self.fac_mask,
+                              old.fac_s, old.fac_c, old.fac_mask, decay)
+        self.fac_inferred[:len(carried)][carried] = False
+        self._adjacency = None
+
+    # -- vectorized export -------------------------------------------------------
+
+    def to_csr(self, order: Optional[Sequence[str]] = None) -> CSRAdjacency:
+        names = list(order) if order is not None else list(self.variables)
+        index = {name: i for i, name in enumerate(names)}
+
+        fids = np.flatnonzero(self.fac_mask)
+        keys = [self.symbols.factor_keys[f] for f in fids]
+        for key in keys:
+            for name in key:
+                if name not in index:
+                    index[name] = len(names)
+                    names.append(name)
+
+        rows_a = np.array([index[k[0]] for k in keys], dtype=np.int64)
+        rows_b = np.array([index[k[1]] for k in keys], dtype=np.int64)
+        loop = rows_a == rows_b
+
+        # each factor appears in both endpoint rows (self-loops once), in id order
+        edge_fac = np.concatenate([np.arange(len(fids)), np.flatnonzero(~loop)])
+        edge_row = np.concatenate([rows_a, rows_b[~loop]])
+        edge_nbr = np.concatenate([rows_b, rows_a[~loop]])
+        order_idx = np.lexsort((edge_fac, edge_row))
+
+        indptr = np.zeros(len(names) + 1, dtype=np.int64)
+        np.add.at(indptr, edge_row + 1, 1)
+        fac_of_edge = fids[edge_fac[order_idx]]
+
+        return CSRAdjacency(
+            names=names,
+            index=index,
+            indptr=np.cumsum(indptr),
+            neighbors=edge_nbr[order_idx],
+            strength=self.fac_s[fac_of_edge].astype(float),
+            confidence=self.fac_c[fac_of_edge].astype(float),
+            factor_keys=[self.symbols.factor_keys[f] for f in fac_of_edge],
+        )
+
+    def __repr__(self):
+        return (f"ArrayFactorGraph(vars={len(self.variables)}, "
+                f"factors={len(self.factors)})")
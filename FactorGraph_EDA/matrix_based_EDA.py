@@ -1,81 +1,68 @@
+import heapq
+import itertools
+
 import numpy as np
 
 class Variable:
-    def __init__(self, name):
+    def __init__(self, name, index=0):
         self.name = name
+        self.index = index  # Row of this variable in the graph's arrays
         # Belief is [Prob(False), Prob(True)]
-        # Initialized to uniform (0.5, 0.5) until we get Unary Factors
+        # Initialized to uniform (0.5, 0.5) until BP runs
         self.belief = np.array([0.5, 0.5])
-        self.incoming_messages = {} # Key: Factor, Value: Message Array
         self.neighbors = [] # List of Factor objects
 
     def __repr__(self):
         return f"Var({self.name})"
 
 class Factor:
-    def __init__(self, variables, potential_matrix):
+    def __init__(self, variables, potential_matrix, index=0):
         """
         variables: [Var_Antecedent, Var_Consequent]
-        potential_matrix: 2x2 numpy array
+        potential_matrix: 2x2 numpy array, rows = Antecedent, cols = Consequent
+        index: position of this factor in the graph; its two edges are
+               2*index (-> Antecedent) and 2*index + 1 (-> Consequent)
         """
         self.variables = variables # [A, B]
         self.potential = potential_matrix
-        
+        self.index = index
+
         # Register this factor with the variables
         for var in variables:
             var.neighbors.append(self)
 
-    def get_message_to(self, target_var):
-        """
-        Calculates Sum-Product message from this Factor -> target_var.
-        Msg(f->x) = Sum_{y} ( Potential(x,y) * Msg(y->f) )
-        """
-        # Identify the "other" variable
-        if target_var == self.variables[0]:
-            other_var = self.variables[1]
-            # We are sending to A, summing over B
-            # Matrix is [A, B], so we sum over axis 1
-            axis_to_sum = 1 
-        else:
-            other_var = self.variables[0]
-            # We are sending to B, summing over A
-            axis_to_sum = 0
-
-        # Get the message the 'other' variable sent TO ME (the factor)
-        # If no message yet, assume uniform [1, 1]
-        incoming = other_var.incoming_messages.get(self, np.array([1.0, 1.0]))
-
-        # CALCULATION:
-        # We multiply the potential matrix by the incoming distribution of the other var
-        # Then sum out the other var dimension.
-        
-        # E.g. If summing out col (B), we multiply rows by B's msg? 
-        # Actually easier: Element-wise multiply then sum.
-        
-        # Reshape incoming for broadcasting
-        if axis_to_sum == 1: # Summing over B (cols)
-            # Incoming is for B (size 2). 
-            weighted_potential = self.potential * incoming # Broadcasts over rows
-            message = np.sum(weighted_potential, axis=1)   # Sum columns -> Result size 2 (for A)
-        else: # Summing over A (rows)
-            # Incoming is for A (size 2). 
-            # Need to reshape incoming to (2,1) to multiply rows
-            weighted_potential = self.potential * incoming[:, np.newaxis]
-            message = np.sum(weighted_potential, axis=0)   # Sum rows -> Result size 2 (for B)
-
-        # Normalize to prevent underflow
-        return message / np.sum(message)
+    def __repr__(self):
+        return f"Factor({self.variables[0].name} -> {self.variables[1].name})"
 
 class FactorGraph:
+    """
+    Pairwise binary factor graph with loopy sum-product BP.
+
+    All messages live in contiguous arrays indexed by edge. Factor f owns
+    edge 2f (towards its antecedent) and edge 2f+1 (towards its consequent):
+        f2v[e]   factor -> variable message, shape (E, 2)
+        log_prod[v]  log(prior_v * prod of all f2v messages into v), shape (V, 2)
+    The variable -> factor message on edge e is then
+        log_prod[var(e)] - log f2v[e]
+    so it never has to be stored or recomputed from scratch.
+    """
+
     def __init__(self):
         self.node_registry = {} # {'A': Variable('A'), 'B': ...}
         self.factors = []
+        self.priors = {} # name -> [P(False), P(True)] unary potential
+        self.diagnostics = {}
 
     def get_or_create_node(self, name):
         if name not in self.node_registry:
-            self.node_registry[name] = Variable(name)
+            self.node_registry[name] = Variable(name, index=len(self.node_registry))
         return self.node_registry[name]
 
+    def set_prior(self, name, p_true):
+        """Adds a unary factor (observation) on a variable: P(True) = p_true."""
+        self.get_or_create_node(name)
+        self.priors[name] = np.array([1.0 - p_true, p_true])
+
     def add_dependency_factor(self, pair_str, strength, confidence):
         """
         Parses 'A -- B' and adds a Modus Ponens factor.
@@ -83,150 +70,212 @@ class FactorGraph:
         # 1. Parse Nodes
         parts = pair_str.split(' -- ')
         left_name, right_name = parts[0], parts[1]
-        
+
         var_a = self.get_or_create_node(left_name)
         var_b = self.get_or_create_node(right_name)
 
         # 2. Construct Modus Ponens Matrix (Soft Implication)
         # Logic: A -> B (If A is True, B should be True)
         # Violation: A=True, B=False
-        
-        # P(Violation) should be low if Strength is high.
-        # Let's map Strength directly to the probability of valid states.
-        
+
         # Standard Modus Ponens Table:
         # A  B  | Valid?
         # F  F  | Yes (1.0)
         # F  T  | Yes (1.0) - Vacuously
         # T  T  | Yes (1.0)
         # T  F  | NO  (1.0 - Strength) <--- The Penalty
-        
-        # Applying Confidence: 
+
+        # Applying Confidence:
         # If Conf is low, the matrix should flatten towards Uniform (all 1s).
-        # We blend the "Strict" matrix with a "Flat" matrix based on Confidence.
-        
-        violation_cost = 1.0 - (strength * confidence) 
+        violation_cost = 1.0 - (strength * confidence)
         # (We multiply by confidence so that low conf = cost is close to 1.0 = no penalty)
 
         # Matrix format: Rows=A (F, T), Cols=B (F, T)
-        # [[A=F, B=F], [A=F, B=T]]
-        # [[A=T, B=F], [A=T, B=T]]
-        
         matrix = np.array([
             [1.0, 1.0],            # A=False (Vacuously True)
             [violation_cost, 1.0]  # A=True  (Violation vs Success)
         ])
 
         # 3. Create Factor connecting UNIQUE existing nodes
-        # Deduplication happens here automatically because we pass the object references
-        new_factor = Factor([var_a, var_b], matrix)
+        new_factor = Factor([var_a, var_b], matrix, index=len(self.factors))
         self.factors.append(new_factor)
 
-    def run_belief_propagation(self, steps=10):
+    # -- array layout ----------------------------------------------------------
+
+    def _compile(self):
+        """Builds the edge-indexed arrays used by BP."""
+        n_vars = len(self.node_registry)
+        n_edges = 2 * len(self.factors)
+
+        potentials = np.empty((len(self.factors), 2, 2))
+        edge_var = np.empty(n_edges, dtype=np.int64)
+        for f in self.factors:
+            potentials[f.index] = f.potential
+            edge_var[2 * f.index] = f.variables[0].index
+            edge_var[2 * f.index + 1] = f.variables[1].index
+
+        # CSR adjacency: edges arriving at each variable
+        order = np.argsort(edge_var, kind='stable')
+        var_ptr = np.zeros(n_vars + 1, dtype=np.int64)
+        np.add.at(var_ptr, edge_var + 1, 1)
+        var_ptr = np.cumsum(var_ptr)
+
+        log_prior = np.zeros((n_vars, 2))
+        for name, prior in self.priors.items():
+            log_prior[self.node_registry[name].index] = np.log(np.maximum(prior, 1e-300))
+
+        return potentials, edge_var, var_ptr, order, log_prior
+
+    def _candidate(self, e, potentials, edge_var, f2v, log_prod):
+        """Sum-product message on edge e computed from the current state."""
+        other = e ^ 1
+        log_in = log_prod[edge_var[other]] - np.log(f2v[other])
+        incoming = np.exp(log_in - log_in.max())
+        pot = potentials[e >> 1]
+        if e & 1:
+            # To the consequent: sum over the antecedent (rows)
+            message = incoming @ pot
+        else:
+            # To the antecedent: sum over the consequent (cols)
+            message = pot @ incoming
+        # Normalize to prevent underflow; keep strictly positive for the log domain
+        return np.maximum(message / message.sum(), 1e-300)
+
+    def run_belief_propagation(self, steps=10, damping=0.0, tol=1e-4):
+        """
+        Residual belief propagation (Elidan et al., 2006).
+
+        Every factor -> variable message has a pending candidate value; the
+        one that differs most from its current value is committed first,
+        and only messages that depend on the updated variable are refreshed.
+        *damping* blends each committed message with its previous value.
+        Stops when the largest residual drops below *tol* or after
+        ``steps`` x (number of edges) message updates.
+
+        Returns (and stores in ``self.diagnostics``) a dict with the number
+        of updates, the final max residual, whether BP converged and the
+        max residual recorded after every sweep-equivalent of updates.
+        """
         print(f"--- Running BP on {len(self.node_registry)} Nodes & {len(self.factors)} Factors ---")
-        
-        # Simple Flooding Schedule (Update all nodes, then all factors)
-        for i in range(steps):
-            # 1. Variables send messages to Factors
-            # Msg(x->f) = Product of all incoming messages EXCEPT from f
-            for var_name, var in self.node_registry.items():
-                # For every neighbor factor
-                for target_factor in var.neighbors:
-                    msg_out = np.array([1.0, 1.0])
-                    # Multiply inputs from OTHER factors
-                    for inc_factor, inc_msg in var.incoming_messages.items():
-                        if inc_factor != target_factor:
-                            msg_out *= inc_msg
-                    
-                    # Store this message in the target factor's inbox? 
-                    # For simplicity in this demo, we update the VARIABLE state 
-                    # and let the factor read it from the variable in the next step.
-                    # In a real implementation, factors need inboxes too.
-                    pass 
-
-            # 2. Factors calculate messages and send to Variables
-            # (This is the main update step for this simplified loop)
-            max_diff = 0
-            for f in self.factors:
-                for target_var in f.variables:
-                    new_msg = f.get_message_to(target_var)
-                    
-                    # Store in variable's inbox
-                    old_msg = target_var.incoming_messages.get(f, np.array([0.,0.]))
-                    target_var.incoming_messages[f] = new_msg
-                    
-                    diff = np.sum(np.abs(new_msg - old_msg))
-                    max_diff = max(max_diff, diff)
-
-            # 3. Update Variable Beliefs (Marginals)
-            # Belief(x) = Product of ALL incoming messages
-            for var in self.node_registry.values():
-                total_belief = np.array([1.0, 1.0]) # Start uniform
-                for msg in var.incoming_messages.values():
-                    total_belief *= msg
-                
-                # Normalize
-                if np.sum(total_belief) > 0:
-                    var.belief = total_belief / np.sum(total_belief)
-
-            print(f"Step {i+1}: Max Message Delta = {max_diff:.4f}")
-            if max_diff < 1e-4:
+
+        potentials, edge_var, var_ptr, order, log_prior = self._compile()
+        n_edges = len(edge_var)
+
+        f2v = np.full((n_edges, 2), 0.5)
+        log_prod = log_prior.copy()
+        np.add.at(log_prod, edge_var, np.log(f2v))
+
+        # Initial candidates for all edges at once
+        if n_edges:
+            log_in = log_prod[edge_var] - np.log(f2v)
+            incoming = np.exp(log_in - log_in.max(axis=1, keepdims=True))
+            cand = np.empty((n_edges, 2))
+            # edge 2f <- pot @ in(2f+1); edge 2f+1 <- in(2f) @ pot
+            cand[0::2] = np.einsum('fab,fb->fa', potentials, incoming[1::2])
+            cand[1::2] = np.einsum('fa,fab->fb', incoming[0::2], potentials)
+            cand = np.maximum(cand / cand.sum(axis=1, keepdims=True), 1e-300)
+        else:
+            cand = np.empty((0, 2))
+        residual = np.abs(cand - f2v).sum(axis=1)
+
+        counter = itertools.count()
+        heap = [(-residual[e], next(counter), e) for e in range(n_edges)]
+        heapq.heapify(heap)
+
+        max_updates = steps * n_edges
+        updates = 0
+        trace = []
+        max_residual = float(residual.max()) if n_edges else 0.0
+
+        while heap and updates < max_updates:
+            neg_r, _, e = heapq.heappop(heap)
+            if -neg_r != residual[e]:
+                continue # stale entry
+            if residual[e] < tol:
                 break
-    
+
+            new_msg = (1.0 - damping) * cand[e] + damping * f2v[e]
+            v = edge_var[e]
+            log_prod[v] += np.log(new_msg) - np.log(f2v[e])
+            f2v[e] = new_msg
+            residual[e] = np.abs(cand[e] - new_msg).sum()
+            heapq.heappush(heap, (-residual[e], next(counter), e))
+            updates += 1
+
+            # v's outgoing messages changed -> refresh what its factors send on
+            for k in order[var_ptr[v]:var_ptr[v + 1]]:
+                if k == e:
+                    continue
+                target = k ^ 1
+                cand[target] = self._candidate(target, potentials, edge_var, f2v, log_prod)
+                residual[target] = np.abs(cand[target] - f2v[target]).sum()
+                heapq.heappush(heap, (-residual[target], next(counter), target))
+
+            if updates % n_edges == 0:
+                trace.append(float(residual.max()))
+                print(f"Step {updates // n_edges}: Max Message Residual = {trace[-1]:.4f}")
+
+        max_residual = float(residual.max()) if n_edges else 0.0
+
+        # Update Variable Beliefs (Marginals)
+        beliefs = np.exp(log_prod - log_prod.max(axis=1, keepdims=True)) if len(log_prod) else log_prod
+        for var in self.node_registry.values():
+            var.belief = beliefs[var.index] / beliefs[var.index].sum()
+
+        self.diagnostics = {
+            'updates': updates,
+            'max_residual': max_residual,
+            'converged': max_residual < tol,
+            'residual_trace': trace,
+        }
+        return self.diagnostics
+
     def get_final_stv(self):
         """
         Returns a dictionary {var_name: (Strength, Confidence)}
-        Strength (s): The final probability P(True).
+        Strength (s): The final probability P(True) from the last BP run.
         Confidence (c): Heuristic based on how definitive the result is.
                         c = 2 * |0.5 - s|  (0 if 0.5, 1 if 0.0 or 1.0)
         """
         stv_results = {}
         for name, var in self.node_registry.items():
-            s = var.belief[1] # Probability of True
-            
+            s = float(var.belief[1]) # Probability of True
+
             # Heuristic Confidence: How far is it from uniform uncertainty?
-            c = abs(s - 0.5) * 2 
-            
-            # Alternative: If you want strictly count-based confidence, 
-            # you'd need to modify BP to track evidence counts. 
-            # For now, "Certainty" is a standard proxy.
-            
+            c = abs(s - 0.5) * 2
+
             stv_results[name] = (round(s, 4), round(c, 4))
-        
+
         return stv_results
-    
+
 
 # --- Main Execution with your Data ---
 
-data = [
-    {'pair': '(OR (AND (NOT A)) (AND (NOT B))) -- (OR (AND A) (AND B))', 'strength': 0.946, 'confidence': 0.1373}, 
-    {'pair': 'A -- B', 'strength': 0.803, 'confidence': 0.3775}, 
-    {'pair': 'A -- C', 'strength': 0.749, 'confidence': 0.3039},
-    {'pair': 'B -- C', 'strength': 0.749, 'confidence': 0.3039}, 
-    # ... (Add more rows from your data) ...
-]
-
-# 1. Initialize Graph
-fg = FactorGraph()
-
-# 2. Load Data (Structure Learning)
-for row in data:
-    fg.add_dependency_factor(row['pair'], row['strength'], row['confidence'])
-
-# 3. Set a Prior / Observation (The "Unary" Factor)
-# Let's say we observe A is definitely True.
-# node_A = fg.get_or_create_node('A')
-# # Simulate a Unary Factor by creating a dummy message from a "source"
-# dummy_factor = Factor([node_A], np.eye(2)) 
-# node_A.incoming_messages[dummy_factor] = np.array([0.01, 0.99]) # Strong True
-
-# 4. Run Inference
-fg.run_belief_propagation(steps=10)
-results = fg.get_final_stv()
-
-# 5. Check Results
-print("\n--- Final Posterior Beliefs ---")
-print(f"{'Variable':<10} | {'P(True)':<8} | {'Strength':<8} | {'Confidence':<10}")
-for name, var in fg.node_registry.items():
-    p_true = var.belief[1]
-    print(f"{name:<10} : P(True) = {p_true:.4f} | Strength = {results[name][0]:<8} | Confidence = {results[name][1]:<10}")
\ No newline at end of file
+if __name__ == "__main__":
+    data = [
+        {'pair': '(OR (AND (NOT A)) (AND (NOT B))) -- (OR (AND A) (AND B))', 'strength': 0.946, 'confidence': 0.1373},
+        {'pair': 'A -- B', 'strength': 0.803, 'confidence': 0.3775},
+        {'pair': 'A -- C', 'strength': 0.749, 'confidence': 0.3039},
+        {'pair': 'B -- C', 'strength': 0.749, 'confidence': 0.3039},
+    ]
+
+    # 1. Initialize Graph
+    fg = FactorGraph()
+
+    # 2. Load Data (Structure Learning)
+    for row in data:
+        fg.add_dependency_factor(row['pair'], row['strength'], row['confidence'])
+
+    # 3. Set a Prior / Observation (The "Unary" Factor)
+    fg.set_prior('A', 0.99)
+
+    # 4. Run Inference
+    diagnostics = fg.run_belief_propagation(steps=10, damping=0.1)
+    results = fg.get_final_stv()
+
+    # 5. Check Results
+    print(f"\nConverged: {diagnostics['converged']} after {diagnostics['updates']} updates")
+    print("\n--- Final Posterior Beliefs ---")
+    for name, var in fg.node_registry.items():
+        p_true = var.belief[1]
+        print(f"{name:<10} : P(True) = {p_true:.4f} | Strength = {results[name][0]:<8} | Confidence = {results[name][1]:<10}")
@@ -10,6 +10,8 @@ Translated from pln.metta into Python for use in the EDA factor graph.
 
 from typing import Tuple
 
+import numpy as np
+
 STV = Tuple[float, float]
 
 # ---------------------------------------------------------------------------
@@ -136,3 +138,83 @@ def modus_ponens(stv_a: STV, stv_ab: STV) -> STV:
     c_b = c_a * c_ab
     return (max(0.0, min(1.0, s_b)), min(0.9999, c_b))
 
+
+# ---------------------------------------------------------------------------
+# Array versions
+#
+# Same formulas as above, applied element-wise to NumPy arrays (or anything
+# broadcastable) of strengths and confidences.  Edge cases follow the scalar
+# functions exactly, including infinite weights from c >= 1.  Each returns
+# a (strength_array, confidence_array) pair.
+# ---------------------------------------------------------------------------
+
+def c2w_vec(c):
+    """Element-wise :func:`c2w`."""
+    c = np.asarray(c, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(c >= 1.0, np.inf, c / (1.0 - c))
+
+
+def w2c_vec(w):
+    """Element-wise :func:`w2c`."""
+    w = np.asarray(w, dtype=float)
+    with np.errstate(invalid='ignore'):
+        return np.where(w == np.inf, 1.0, w / (w + 1.0))
+
+
+def revision_vec(s1, c1, s2, c2):
+    """Element-wise :func:`revision`."""
+    s1, c1, s2, c2 = np.broadcast_arrays(*(np.asarray(x, dtype=float)
+                                           for x in (s1, c1, s2, c2)))
+    w1 = c2w_vec(c1)
+    w2 = c2w_vec(c2)
+    w = w1 + w2
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = (w1 * s1 + w2 * s2) / w
+    c = w2c_vec(w)
+
+    # min(1.0, s) keeps 1.0 when s is NaN (inf / inf), so mirror that
+    s = np.where(s < 1.0, s, 1.0)
+    c = np.minimum(0.9999, np.maximum(np.maximum(c, c1), c2))
+
+    zero = w == 0
+    return np.where(zero, 0.0, s), np.where(zero, 0.0, c)
+
+
+def deduction_vec(s_ab, c_ab, s_bc, c_bc, s_b):
+    """Element-wise :func:`deduction`."""
+    s_ab, c_ab, s_bc, c_bc, s_b = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (s_ab, c_ab, s_bc, c_bc, s_b)))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        chained = s_ab * s_bc + ((1.0 - s_ab) * (s_bc - s_b * s_bc)) / (1.0 - s_b)
+    s_ac = np.where(s_b > 0.9999, s_bc, chained)
+
+    s_ac = np.clip(s_ac, 0.0, 1.0)
+    c_ac = np.minimum(c_ab, c_bc)
+
+    return s_ac, w2c_vec(c_ac)
+
+
+def inversion_vec(s_ab, c_ab, s_b, c_b):
+    """Element-wise :func:`inversion` (``s_b`` is unused, as in the scalar form)."""
+    s_ab, c_ab, c_b = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (s_ab, c_ab, c_b)))
+    c_ba = c_b * c_ab * 0.6
+    return s_ab.copy(), np.minimum(0.9999, c_ba)
+
+
+def negation_vec(s, c):
+    """Element-wise :func:`negation`."""
+    s, c = np.broadcast_arrays(np.asarray(s, dtype=float), np.asarray(c, dtype=float))
+    return 1.0 - s, c.copy()
+
+
+def modus_ponens_vec(s_a, c_a, s_ab, c_ab):
+    """Element-wise :func:`modus_ponens`."""
+    s_a, c_a, s_ab, c_ab = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (s_a, c_a, s_ab, c_ab)))
+    s_b = s_a * s_ab + 0.02 * (1.0 - s_a)
+    c_b = c_a * c_ab
+    return np.clip(s_b, 0.0, 1.0), np.minimum(0.9999, c_b)
@@ -69,6 +69,55 @@ class TestBetaFactorGraphBasics(unittest.TestCase):
         self.assertAlmostEqual(rule["s"], expected_s, places=5)
         self.assertAlmostEqual(rule["c"], expected_c, places=5)
 
+    def test_rule_index_tracks_factor_positions(self):
+        self.graph.add_dependency_rule("A -- B", 0.8, 0.4)
+        self.graph.add_dependency_rule("B -- C", 0.6, 0.3)
+        self.graph.add_dependency_rule("A -- B", 0.9, 0.5)
+
+        self.assertEqual(len(self.graph.factors), 2)
+        self.assertIs(self.graph.get_rule("A", "B"), self.graph.factors[0])
+        self.assertIs(self.graph.get_rule("B", "C"), self.graph.factors[1])
+        self.assertIsNone(self.graph.get_rule("B", "A"))
+
+    def test_add_dependency_rules_bulk_matches_single_adds(self):
+        rows = [
+            {'pair': 'A -- B', 'strength': 0.8, 'confidence': 0.4},
+            {'pair': 'B -- C', 'strength': 0.6, 'confidence': 0.3},
+            {'pair': 'A -- B', 'strength': 0.2, 'confidence': 0.9},
+        ]
+        single = BetaFactorGraph()
+        for row in rows:
+            single.add_dependency_rule(row['pair'], row['strength'], row['confidence'])
+
+        self.graph.add_dependency_rules(rows)
+        self.assertEqual(self.graph.epoch, 1)
+        self.assertEqual(len(self.graph.factors), len(single.factors))
+        for bulk_rule, single_rule in zip(self.graph.factors, single.factors):
+            self.assertAlmostEqual(bulk_rule['s'], single_rule['s'])
+            self.assertAlmostEqual(bulk_rule['c'], single_rule['c'])
+
+    def test_evict_rules_by_confidence_and_age(self):
+        self.graph.add_dependency_rules([
+            {'pair': 'A -- B', 'strength': 0.8, 'confidence': 0.4},
+            {'pair': 'B -- C', 'strength': 0.6, 'confidence': 0.01},
+        ])
+        self.graph.add_dependency_rules([
+            {'pair': 'C -- D', 'strength': 0.7, 'confidence': 0.5},
+        ])
+        self.graph.add_dependency_rules([])
+
+        evicted = self.graph.evict_rules(min_confidence=0.05)
+        self.assertEqual(evicted, 1)
+        self.assertIsNone(self.graph.get_rule("B", "C"))
+
+        # A -- B was last seen two epochs ago, C -- D one epoch ago
+        evicted = self.graph.evict_rules(max_age=1)
+        self.assertEqual(evicted, 1)
+        self.assertEqual([(r['src'], r['dst']) for r in self.graph.factors], [("C", "D")])
+        self.assertIs(self.graph.get_rule("C", "D"), self.graph.factors[0])
+        # Nodes survive eviction
+        self.assertIn("A", self.graph.nodes)
+
     def test_set_prior_changes_alpha_beta_and_priors(self):
         self.graph.set_prior("A", stv_strength=0.9, stv_confidence=0.8, base_counts=10.0)
         node = self.graph.nodes["A"]
@@ -176,5 +225,73 @@ class TestBetaFactorGraphPropagation(unittest.TestCase):
         self.assertGreater(node_A_after.strength, 0.5)
 
 
+
+class TestBetaFactorGraphIncrementalPropagation(unittest.TestCase):
+    def _chain_graph(self):
+        graph = BetaFactorGraph()
+        graph.add_dependency_rule("A -- B", 0.8, 0.5)
+        graph.add_dependency_rule("B -- C", 0.7, 0.4)
+        graph.add_dependency_rule("C -- A", 0.7, 0.4)
+        graph.set_prior("A", stv_strength=0.9, stv_confidence=0.8)
+        return graph
+
+    def test_incremental_reaches_flooding_fixed_point(self):
+        graph = self._chain_graph()
+        graph.run_incremental_propagation(decay=0.9, tol=1e-9)
+
+        # At the fixed point one more synchronous step barely moves anything
+        before = {n: (node.alpha, node.beta) for n, node in graph.nodes.items()}
+        graph.run_evidence_propagation(steps=1, decay=0.9)
+        for name, node in graph.nodes.items():
+            a, b = before[name]
+            self.assertAlmostEqual(node.alpha, a, places=5)
+            self.assertAlmostEqual(node.beta, b, places=5)
+
+    def test_incremental_matches_flooding_direction(self):
+        graph = self._chain_graph()
+        graph.run_incremental_propagation(decay=0.9)
+        self.assertGreater(graph.nodes["B"].strength, 0.5)
+        self.assertGreater(graph.nodes["C"].strength, 0.5)
+
+    def test_no_changes_means_no_work(self):
+        graph = self._chain_graph()
+        graph.run_incremental_propagation(decay=0.9)
+        self.assertEqual(graph.run_incremental_propagation(decay=0.9), 0)
+
+    def test_new_rule_only_touches_its_component(self):
+        graph = self._chain_graph()
+        graph.run_incremental_propagation(decay=0.9)
+        before = {n: (node.alpha, node.beta) for n, node in graph.nodes.items()}
+
+        graph.add_dependency_rule("X -- Y", 0.8, 0.5)
+        self.assertIn(("X", "Y"), graph.dirty_rules)
+        graph.run_incremental_propagation(decay=0.9)
+
+        for name, (a, b) in before.items():
+            self.assertEqual((graph.nodes[name].alpha, graph.nodes[name].beta), (a, b))
+        self.assertGreater(graph.nodes["Y"].alpha + graph.nodes["Y"].beta, 2.0)
+
+    def test_new_prior_is_propagated(self):
+        graph = self._chain_graph()
+        graph.run_incremental_propagation(decay=0.9)
+        strength_B = graph.nodes["B"].strength
+
+        graph.set_prior("A", stv_strength=0.1, stv_confidence=0.9)
+        self.assertIn("A", graph.dirty_nodes)
+        graph.run_incremental_propagation(decay=0.9)
+        self.assertLess(graph.nodes["B"].strength, strength_B)
+
+    def test_evicted_rule_messages_are_withdrawn(self):
+        graph = BetaFactorGraph()
+        graph.add_dependency_rule("A -- B", 0.9, 0.6)
+        graph.set_prior("A", stv_strength=0.9, stv_confidence=0.8)
+        graph.run_incremental_propagation(decay=0.9)
+        self.assertGreater(graph.nodes["B"].alpha, 1.0)
+
+        graph.evict_rules(min_confidence=0.7)
+        graph.run_incremental_propagation(decay=0.9)
+        self.assertAlmostEqual(graph.nodes["B"].alpha, 1.0)
+        self.assertAlmostEqual(graph.nodes["B"].beta, 1.0)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
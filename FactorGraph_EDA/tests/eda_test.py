@@ -1,7 +1,13 @@
+import random
 import unittest
+from collections import Counter
 
-from FactorGraph_EDA.eda import apply_deduction
-from FactorGraph_EDA.factor_graph import FactorGraph, SubtreeVariable, PairwiseFactor
+from FactorGraph_EDA.eda import (apply_deduction, revise_factor_graph, run_deme_eda,
+                                 sample_from_factor_graph)
+from FactorGraph_EDA.factor_graph import (FactorGraph, SubtreeVariable, PairwiseFactor,
+                                          ArrayFactorGraph, SymbolTable)
+from FactorGraph_EDA.pln import deduction, revision, w2c
+from Representation.representation import Deme, FitnessOracle, Hyperparams, Instance, Knob
 
 
 class TestEdaDeduction(unittest.TestCase):
@@ -35,5 +41,200 @@ class TestEdaDeduction(unittest.TestCase):
         self.assertTrue(inferred.inferred)
 
 
+    def _chain(self):
+        fg = FactorGraph()
+        for name, stv in (("A", (0.6, 0.7)), ("B", (0.7, 0.8)),
+                          ("C", (0.4, 0.6)), ("D", (0.5, 0.5))):
+            fg.add_variable(SubtreeVariable(name, stv))
+        fg.add_factor(PairwiseFactor("A", "B", (0.8, 0.9)))
+        fg.add_factor(PairwiseFactor("B", "C", (0.6, 0.85)))
+        fg.add_factor(PairwiseFactor("C", "D", (0.7, 0.3)))
+        return fg
+
+    def test_apply_deduction_uses_pln_deduction(self):
+        fg = self._chain()
+        apply_deduction(fg)
+        expected = deduction((0.8, 0.9), (0.6, 0.85), 0.7)
+        self.assertEqual(fg.get_factor(("A", "C")).stv, expected)
+
+    def test_apply_deduction_single_round_does_not_chain(self):
+        fg = self._chain()
+        added = apply_deduction(fg)
+        self.assertEqual(added, 2)
+        self.assertIsNotNone(fg.get_factor(("B", "D")))
+        self.assertIsNone(fg.get_factor(("A", "D")))
+
+    def test_apply_deduction_closure_depth(self):
+        fg = self._chain()
+        added = apply_deduction(fg, depth=3)
+        self.assertEqual(added, 3)
+        self.assertTrue(fg.get_factor(("A", "D")).inferred)
+
+    def test_apply_deduction_cap_keeps_most_confident(self):
+        fg = self._chain()
+        added = apply_deduction(fg, max_inferred=1)
+        self.assertEqual(added, 1)
+        # A-C chains two confident factors, B-D goes through the weak C-D
+        self.assertIsNotNone(fg.get_factor(("A", "C")))
+        self.assertIsNone(fg.get_factor(("B", "D")))
+
+    def test_apply_deduction_confidence_threshold(self):
+        fg = self._chain()
+        threshold = w2c(0.5)
+        apply_deduction(fg, min_confidence=threshold)
+        self.assertIsNotNone(fg.get_factor(("A", "C")))
+        self.assertIsNone(fg.get_factor(("B", "D")))
+
+
+class TestEdaRevision(unittest.TestCase):
+    def test_revise_factor_graph_matches_scalar_revision(self):
+        old_fg = FactorGraph()
+        old_fg.add_variable(SubtreeVariable("A", (0.6, 0.5)))
+        old_fg.add_variable(SubtreeVariable("B", (0.2, 0.4)))
+        old_fg.add_factor(PairwiseFactor("A", "B", (0.7, 0.6)))
+
+        new_fg = FactorGraph()
+        new_fg.add_variable(SubtreeVariable("A", (0.8, 0.3)))
+        new_fg.add_variable(SubtreeVariable("C", (0.5, 0.5)))
+        new_fg.add_factor(PairwiseFactor("B", "A", (0.9, 0.2)))
+
+        revise_factor_graph(new_fg, old_fg)
+
+        self.assertEqual(new_fg.get_variable("A").marginal_stv,
+                         revision((0.8, 0.3), (0.6, 0.5)))
+        self.assertEqual(new_fg.get_factor(("A", "B")).stv,
+                         revision((0.9, 0.2), (0.7, 0.6)))
+        # old-only variables are carried forward with decayed confidence
+        self.assertEqual(new_fg.get_variable("B").marginal_stv, (0.2, 0.4 * 0.9))
+        self.assertEqual(new_fg.get_variable("C").marginal_stv, (0.5, 0.5))
+
+    def _fill(self, fg, variables, factors):
+        for name, stv in variables.items():
+            fg.set_variable(name, stv)
+        for (a, b), stv in factors.items():
+            fg.set_factor(a, b, stv)
+        return fg
+
+    def test_array_revision_matches_dict_revision(self):
+        old_items = ({"A": (0.6, 0.5), "B": (0.2, 0.4), "D": (0.3, 0.7)},
+                     {("A", "B"): (0.7, 0.6), ("B", "D"): (0.4, 0.5)})
+        new_items = ({"A": (0.8, 0.3), "C": (0.5, 0.5)},
+                     {("B", "A"): (0.9, 0.2), ("A", "C"): (0.6, 0.1)})
+
+        old_fg = self._fill(FactorGraph(), *old_items)
+        new_fg = self._fill(FactorGraph(), *new_items)
+        revise_factor_graph(new_fg, old_fg)
+
+        symbols = SymbolTable()
+        old_arr = self._fill(ArrayFactorGraph(symbols), *old_items)
+        new_arr = self._fill(ArrayFactorGraph(symbols), *new_items)
+        revise_factor_graph(new_arr, old_arr)
+
+        self.assertEqual(set(new_arr.variables), set(new_fg.variables))
+        self.assertEqual(set(new_arr.factors), set(new_fg.factors))
+        for name in new_fg.variables:
+            self.assertEqual(new_arr.get_variable(name).marginal_stv,
+                             new_fg.get_variable(name).marginal_stv)
+        for key in new_fg.factors:
+            self.assertEqual(new_arr.get_factor(key).stv, new_fg.get_factor(key).stv)
+            self.assertFalse(new_arr.get_factor(key).inferred)
+        # the old generation is left untouched
+        self.assertEqual(old_arr.get_variable("A").marginal_stv, (0.6, 0.5))
+
+class TestEdaSampling(unittest.TestCase):
+    def setUp(self):
+        self.fg = FactorGraph()
+        self.fg.add_variable(SubtreeVariable("A", (0.9, 0.9)))
+        self.fg.add_variable(SubtreeVariable("B", (0.5, 0.2)))
+        self.fg.add_variable(SubtreeVariable("(NOT C)", (0.3, 0.5)))
+        self.fg.add_factor(PairwiseFactor("A", "B", (0.95, 0.9)))
+        self.fg.add_factor(PairwiseFactor("B", "(NOT C)", (0.1, 0.8)))
+        self.knobs = [Knob("A", 1, [True]), Knob("B", 2, [False]), Knob("C", 3, [True])]
+
+    def test_same_seed_same_samples(self):
+        first = sample_from_factor_graph(self.fg, 50, "AND", self.knobs, rng=7)
+        second = sample_from_factor_graph(self.fg, 50, "AND", self.knobs, rng=7)
+        self.assertEqual([i.value for i in first], [i.value for i in second])
+
+    def test_samples_are_well_formed(self):
+        samples = sample_from_factor_graph(self.fg, 200, "OR", self.knobs, rng=1)
+        self.assertEqual(len(samples), 200)
+        self.assertEqual([i.id for i in samples], list(range(1, 201)))
+        for inst in samples:
+            self.assertTrue(inst.value)
+            if inst.value.startswith("(OR"):
+                self.assertTrue(inst.value.endswith(")"))
+            # knobs match the symbols used (NOT wrappers stripped)
+            symbols = {k.symbol for k in inst.knobs}
+            for symbol in symbols:
+                self.assertIn(symbol, inst.value)
+            self.assertEqual(len(symbols), len(inst.knobs))
+
+    def _reference_sample(self, root_op):
+        """One draw of the original per-sample, per-variable sampler."""
+        var_names = sorted(self.fg.variables,
+                           key=lambda v: self.fg.variables[v].marginal_stv[0],
+                           reverse=True)
+        assigned, present_subtrees = {}, []
+        for vname in var_names:
+            s_m, c_m = self.fg.variables[vname].marginal_stv
+            p_present = c_m * s_m + (1.0 - c_m) * 0.5
+            for fac in self.fg.neighbors(vname):
+                other = fac.var_b if fac.var_a == vname else fac.var_a
+                if other in assigned:
+                    s, c = fac.stv
+                    if not assigned[other]:
+                        s = 1.0 - s
+                    p_present = max(0.05, min(0.95, p_present * (c * s + (1.0 - c) * 0.5)))
+            assigned[vname] = random.random() < p_present
+            if assigned[vname]:
+                present_subtrees.append(vname)
+        if not present_subtrees:
+            present_subtrees = [random.choice(var_names)]
+        if len(present_subtrees) == 1:
+            return present_subtrees[0]
+        return f"({root_op} {' '.join(present_subtrees)})"
+
+    def test_distribution_matches_scalar_reference(self):
+        n = 20000
+        random.seed(11)
+        expected = Counter(self._reference_sample("AND") for _ in range(n))
+        actual = Counter(i.value for i in
+                         sample_from_factor_graph(self.fg, n, "AND", self.knobs, rng=11))
+        for expr in set(expected) | set(actual):
+            self.assertAlmostEqual(actual[expr] / n, expected[expr] / n, delta=0.02)
+
+    def test_empty_graph_returns_no_samples(self):
+        self.assertEqual(sample_from_factor_graph(FactorGraph(), 10, "AND", []), [])
+
+class TestEdaEarlyAbort(unittest.TestCase):
+    def _run(self, block_size, racing_delta=0.0, n=400):
+        rng = random.Random(4)
+        knobs = [Knob(s, i, [rng.random() < 0.5 for _ in range(n)]) for i, s in enumerate("ABCDE")]
+        a, b, c = (k.Value for k in knobs[:3])
+        target = [(x and y) or (not z) for x, y, z in zip(a, b, c)]
+        symbols = ["A", "B", "C", "D", "E", "(NOT C)", "(NOT D)"]
+        values = sorted({f"(AND {' '.join(rng.sample(symbols, 2))})" for _ in range(20)})
+        hp = Hyperparams(0.3, 0.5, 5, 10, fitness_block_size=block_size, racing_delta=racing_delta)
+        deme = Deme([Instance(v, i, 0.0, knobs) for i, v in enumerate(values)], 0, hp)
+
+        random.seed(9)
+        oracle = FitnessOracle(target)
+        best, _ = run_deme_eda(deme, oracle, num_generations=5, top_k=5,
+                               sample_size=20, all_knobs=knobs)
+        return best, oracle
+
+    def test_early_abort_finds_the_same_best(self):
+        exact_best, _ = self._run(0)
+        bounded_best, oracle = self._run(32)
+        self.assertEqual((bounded_best.value, bounded_best.score),
+                         (exact_best.value, exact_best.score))
+        self.assertTrue(oracle.bounds)
+
+    def test_racing_reports_exact_best(self):
+        best, _ = self._run(0, racing_delta=0.05, n=3000)
+        exact_best, _ = self._run(0, n=3000)
+        self.assertEqual((best.value, best.score), (exact_best.value, exact_best.score))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
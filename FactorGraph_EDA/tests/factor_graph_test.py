@@ -0,0 +1,112 @@
+import unittest
+
+from FactorGraph_EDA.factor_graph import (FactorGraph, SubtreeVariable, PairwiseFactor,
+                                          ArrayFactorGraph, SymbolTable)
+
+
+class TestFactorGraphAdjacency(unittest.TestCase):
+    def setUp(self):
+        self.fg = FactorGraph()
+        for name in ("A", "B", "C", "D"):
+            self.fg.add_variable(SubtreeVariable(name))
+        self.fg.add_factor(PairwiseFactor("A", "B", (0.8, 0.6)))
+        self.fg.add_factor(PairwiseFactor("C", "B", (0.7, 0.5)))
+        self.fg.add_factor(PairwiseFactor("A", "A", (0.9, 0.9)))
+
+    def test_neighbors_match_full_scan(self):
+        for name in ("A", "B", "C", "D"):
+            expected = {f.key for f in self.fg.factors.values()
+                        if name in (f.var_a, f.var_b)}
+            self.assertEqual({f.key for f in self.fg.neighbors(name)}, expected)
+
+    def test_neighbor_names(self):
+        self.assertEqual(sorted(self.fg.neighbor_names("B")), ["A", "C"])
+        self.assertEqual(sorted(self.fg.neighbor_names("A")), ["A", "B"])
+        self.assertEqual(self.fg.neighbor_names("D"), [])
+
+    def test_replacing_factor_does_not_duplicate_adjacency(self):
+        self.fg.add_factor(PairwiseFactor("B", "A", (0.1, 0.2)))
+        self.assertEqual(len(self.fg.neighbors("B")), 2)
+        self.assertEqual(self.fg.get_factor(("A", "B")).stv, (0.1, 0.2))
+
+    def test_to_csr(self):
+        csr = self.fg.to_csr(order=["B", "A", "C", "D"])
+        self.assertEqual(csr.names, ["B", "A", "C", "D"])
+        self.assertEqual(list(csr.indptr), [0, 2, 4, 5, 5])
+
+        row_b = csr.neighbors[csr.indptr[0]:csr.indptr[1]]
+        self.assertEqual(sorted(csr.names[i] for i in row_b), ["A", "C"])
+
+        for i, name in enumerate(csr.names):
+            for j in range(csr.indptr[i], csr.indptr[i + 1]):
+                f = self.fg.factors[csr.factor_keys[j]]
+                self.assertIn(name, f.key)
+                self.assertEqual((csr.strength[j], csr.confidence[j]), f.stv)
+
+    def test_to_csr_appends_unknown_endpoints(self):
+        self.fg.add_factor(PairwiseFactor("D", "E", (0.5, 0.5)))
+        csr = self.fg.to_csr()
+        self.assertIn("E", csr.index)
+        self.assertEqual(csr.names[csr.index["E"]], "E")
+        self.assertEqual(len(csr.indptr), len(csr.names) + 1)
+
+
+class TestArrayFactorGraph(unittest.TestCase):
+    def setUp(self):
+        self.symbols = SymbolTable()
+        self.fg = ArrayFactorGraph(self.symbols)
+        self.ref = FactorGraph()
+        for graph in (self.fg, self.ref):
+            for name in ("A", "B", "C", "D"):
+                graph.add_variable(SubtreeVariable(name, (0.5, 0.1)))
+            graph.add_factor(PairwiseFactor("A", "B", (0.8, 0.6)))
+            graph.add_factor(PairwiseFactor("C", "B", (0.7, 0.5)))
+            graph.add_factor(PairwiseFactor("A", "A", (0.9, 0.9)))
+
+    def test_symbols_are_shared_between_graphs(self):
+        other = ArrayFactorGraph(self.symbols)
+        other.set_factor("B", "A", (0.1, 0.1))
+        self.assertEqual(self.symbols.factor_id("A", "B"), 0)
+        self.assertEqual(len(self.symbols.factor_keys), 3)
+        self.assertNotIn(("B", "C"), other.factors)
+        self.assertEqual(len(other.factors), 1)
+
+    def test_views_read_and_write_arrays(self):
+        var = self.fg.get_variable("B")
+        self.assertEqual((var.name, var.marginal_stv), ("B", (0.5, 0.1)))
+        var.marginal_stv = (0.3, 0.4)
+        self.assertEqual(self.fg.variables["B"].marginal_stv, (0.3, 0.4))
+
+        factor = self.fg.get_factor(("B", "A"))
+        self.assertEqual((factor.key, factor.stv), (("A", "B"), (0.8, 0.6)))
+        factor.stv = (0.2, 0.3)
+        self.assertEqual(self.fg.get_factor(("A", "B")).stv, (0.2, 0.3))
+        self.assertIsNone(self.fg.get_variable("E"))
+        self.assertIsNone(self.fg.get_factor(("A", "C")))
+
+    def test_neighbors_match_dict_graph(self):
+        for name in ("A", "B", "C", "D"):
+            self.assertEqual({f.key for f in self.fg.neighbors(name)},
+                             {f.key for f in self.ref.neighbors(name)})
+        self.fg.set_factor("D", "C", (0.5, 0.5))
+        self.assertEqual(sorted(self.fg.neighbor_names("C")), ["B", "D"])
+
+    def test_to_csr_matches_dict_graph(self):
+        self.fg.set_factor("D", "E", (0.5, 0.5))
+        self.ref.add_factor(PairwiseFactor("D", "E", (0.5, 0.5)))
+        order = ["B", "A", "C", "D"]
+        got, want = self.fg.to_csr(order=order), self.ref.to_csr(order=order)
+        self.assertEqual(got.names, want.names)
+        self.assertEqual(list(got.indptr), list(want.indptr))
+        self.assertEqual(list(got.neighbors), list(want.neighbors))
+        self.assertEqual(got.factor_keys, want.factor_keys)
+        self.assertEqual(list(got.strength), list(want.strength))
+        self.assertEqual(list(got.confidence), list(want.confidence))
+
+    def test_revise_from_needs_shared_symbols(self):
+        with self.assertRaises(ValueError):
+            self.fg.revise_from(ArrayFactorGraph())
+
+
+if __name__ == "__main__":
+    unittest.main()
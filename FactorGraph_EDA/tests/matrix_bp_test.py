@@ -0,0 +1,99 @@
+import io
+import itertools
+import unittest
+from contextlib import redirect_stdout
+
+import numpy as np
+
+from FactorGraph_EDA.matrix_based_EDA import FactorGraph
+
+
+def brute_force_marginals(fg):
+    """Exact P(True) for every variable by enumerating all assignments."""
+    names = list(fg.node_registry.keys())
+    index = {name: i for i, name in enumerate(names)}
+    p_true = np.zeros(len(names))
+    total = 0.0
+    for assignment in itertools.product([0, 1], repeat=len(names)):
+        weight = 1.0
+        for name, prior in fg.priors.items():
+            weight *= prior[assignment[index[name]]]
+        for f in fg.factors:
+            a = assignment[index[f.variables[0].name]]
+            b = assignment[index[f.variables[1].name]]
+            weight *= f.potential[a, b]
+        total += weight
+        p_true += weight * np.array(assignment)
+    return {name: p_true[i] / total for i, name in enumerate(names)}
+
+
+class TestMatrixBeliefPropagation(unittest.TestCase):
+    def _tree_graph(self):
+        fg = FactorGraph()
+        fg.add_dependency_factor("A -- B", 0.9, 0.8)
+        fg.add_dependency_factor("A -- C", 0.7, 0.5)
+        fg.add_dependency_factor("C -- D", 0.8, 0.9)
+        fg.set_prior("A", 0.95)
+        fg.set_prior("D", 0.2)
+        return fg
+
+    def test_import_has_no_side_effects(self):
+        import importlib
+        import FactorGraph_EDA.matrix_based_EDA as module
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            importlib.reload(module)
+        self.assertEqual(buf.getvalue(), "")
+
+    def test_exact_on_tree(self):
+        fg = self._tree_graph()
+        with redirect_stdout(io.StringIO()):
+            diagnostics = fg.run_belief_propagation(steps=50, tol=1e-10)
+
+        self.assertTrue(diagnostics['converged'])
+        exact = brute_force_marginals(fg)
+        for name, var in fg.node_registry.items():
+            self.assertAlmostEqual(var.belief[1], exact[name], places=6)
+
+    def test_damping_converges_on_loop(self):
+        fg = FactorGraph()
+        fg.add_dependency_factor("A -- B", 0.9, 0.8)
+        fg.add_dependency_factor("B -- C", 0.9, 0.8)
+        fg.add_dependency_factor("C -- A", 0.9, 0.8)
+        fg.set_prior("A", 0.9)
+        with redirect_stdout(io.StringIO()):
+            diagnostics = fg.run_belief_propagation(steps=100, damping=0.5, tol=1e-8)
+
+        self.assertTrue(diagnostics['converged'])
+        self.assertLess(diagnostics['max_residual'], 1e-8)
+        for var in fg.node_registry.values():
+            self.assertAlmostEqual(var.belief.sum(), 1.0)
+            self.assertFalse(np.any(np.isnan(var.belief)))
+
+    def test_step_budget_limits_updates(self):
+        fg = self._tree_graph()
+        with redirect_stdout(io.StringIO()):
+            diagnostics = fg.run_belief_propagation(steps=1, tol=0.0)
+        self.assertLessEqual(diagnostics['updates'], 2 * len(fg.factors))
+
+    def test_get_final_stv_comes_from_beliefs(self):
+        fg = self._tree_graph()
+        with redirect_stdout(io.StringIO()):
+            fg.run_belief_propagation(steps=50)
+        stv = fg.get_final_stv()
+        for name, var in fg.node_registry.items():
+            s, c = stv[name]
+            self.assertAlmostEqual(s, var.belief[1], places=4)
+            self.assertAlmostEqual(c, abs(var.belief[1] - 0.5) * 2, places=4)
+
+    def test_hard_potential_does_not_produce_nan(self):
+        fg = FactorGraph()
+        fg.add_dependency_factor("A -- B", 1.0, 1.0)
+        fg.set_prior("A", 1.0)
+        with redirect_stdout(io.StringIO()):
+            fg.run_belief_propagation(steps=20)
+        self.assertAlmostEqual(fg.node_registry["B"].belief[1], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import math
+import random
+import unittest
+
+import numpy as np
+
+from FactorGraph_EDA.pln import (c2w, w2c, revision, deduction, inversion, negation,
+                                 modus_ponens, c2w_vec, w2c_vec, revision_vec,
+                                 deduction_vec, inversion_vec, negation_vec,
+                                 modus_ponens_vec)
+
+
+def _stvs(n, seed):
+    rng = random.Random(seed)
+    values = [(rng.random(), rng.random()) for _ in range(n)]
+    # edge cases: no evidence, certain evidence, strength at the bounds
+    values += [(0.0, 0.0), (1.0, 0.0), (0.3, 1.0), (0.0, 1.0), (1.0, 1.0),
+               (0.99995, 0.5), (0.5, 0.9999)]
+    return values
+
+
+class TestPlnVectorKernels(unittest.TestCase):
+    def setUp(self):
+        self.a = _stvs(200, 1)
+        self.b = _stvs(200, 2)[::-1]
+        self.sa = np.array([s for s, _ in self.a])
+        self.ca = np.array([c for _, c in self.a])
+        self.sb = np.array([s for s, _ in self.b])
+        self.cb = np.array([c for _, c in self.b])
+
+    def assertSameStvs(self, expected, actual):
+        s_arr, c_arr = actual
+        self.assertEqual(len(expected), len(s_arr))
+        for (s, c), s_v, c_v in zip(expected, s_arr.tolist(), c_arr.tolist()):
+            self.assertEqual(s, s_v)
+            self.assertEqual(c, c_v)
+
+    def test_weight_conversions(self):
+        for c, w in zip(self.ca.tolist(), c2w_vec(self.ca).tolist()):
+            self.assertEqual(c2w(c), w)
+        weights = np.array([0.0, 0.5, 3.0, math.inf])
+        self.assertEqual(w2c_vec(weights).tolist(), [w2c(w) for w in weights.tolist()])
+
+    def test_revision(self):
+        expected = [revision(x, y) for x, y in zip(self.a, self.b)]
+        self.assertSameStvs(expected, revision_vec(self.sa, self.ca, self.sb, self.cb))
+
+    def test_revision_infinite_weights(self):
+        for x, y in (((0.0, 1.0), (0.4, 0.3)), ((0.7, 1.0), (0.2, 1.0)),
+                     ((0.2, 0.0), (0.3, 0.0))):
+            s, c = revision_vec(x[0], x[1], y[0], y[1])
+            self.assertEqual(revision(x, y), (float(s), float(c)))
+
+    def test_deduction(self):
+        s_b = np.array([s for s, _ in _stvs(200, 3)])
+        s_b[:3] = [1.0, 0.99995, 0.9999]
+        expected = [deduction(x, y, b) for x, y, b in zip(self.a, self.b, s_b.tolist())]
+        self.assertSameStvs(expected,
+                            deduction_vec(self.sa, self.ca, self.sb, self.cb, s_b))
+
+    def test_inversion(self):
+        expected = [inversion(x, s_b, c_b) for x, (s_b, c_b) in zip(self.a, self.b)]
+        self.assertSameStvs(expected, inversion_vec(self.sa, self.ca, self.sb, self.cb))
+
+    def test_negation(self):
+        self.assertSameStvs([negation(x) for x in self.a], negation_vec(self.sa, self.ca))
+
+    def test_modus_ponens(self):
+        expected = [modus_ponens(x, y) for x, y in zip(self.a, self.b)]
+        self.assertSameStvs(expected, modus_ponens_vec(self.sa, self.ca, self.sb, self.cb))
+
+    def test_broadcasting_scalar_operand(self):
+        s, c = revision_vec(self.sa, self.ca, 0.5, 0.5)
+        self.assertEqual(s.shape, self.sa.shape)
+        self.assertEqual(c.shape, self.ca.shape)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,14 @@
+import heapq
 import math
-import csv
-from typing import List, Dict, Tuple
+import os
+import tempfile
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from Representation.binary_dataset import is_binary_dataset, open_binary
+from Representation.packed_table import (PackedTable, information_gain_from_counts, popcount,
+                                         popcount_rows, stream_truth_table)
 
 def calculate_entropy(values: List[bool]) -> float:
     """
@@ -56,78 +64,95 @@ def calculate_information_gain(target: List[bool], feature: List[bool]) -> float
     
     return entropy_target - conditional_entropy
 
-def select_features(csv_path: str, target_col: str, k: int = None, threshold: float = 0.0) -> List[Tuple[str, float]]:
+def information_gains(table: PackedTable) -> Dict[str, float]:
+    """
+    Information Gain of every input column of a packed table, in one pass
+    over its blocks: per block, the rows with feature set and with feature
+    AND target set are counted for all columns at once with popcounts.
+    """
+    n_columns = len(table.columns)
+    n_feature = np.zeros(n_columns, dtype=np.int64)
+    n_both = np.zeros(n_columns, dtype=np.int64)
+    n_target = 0
+    for block, mask in table.blocks():
+        features = block[:-1] & mask
+        n_feature += popcount_rows(features)
+        n_both += popcount_rows(features & block[-1])
+        n_target += popcount(block[-1] & mask)
+    return {
+        name: information_gain_from_counts(table.row_count, int(f), n_target, int(b))
+        for name, f, b in zip(table.columns, n_feature, n_both)
+    }
+
+def top_k_features(scores: Iterable[Tuple[str, float]], k: int = None,
+                   threshold: float = 0.0) -> List[Tuple[str, float]]:
+    """
+    Online top-k: keeps the *k* best (feature, score) pairs with score >=
+    *threshold* in a bounded heap, so the scores can come from a generator.
+    Ties keep the input order.  Sorted by score descending.
+    """
+    if k is None:
+        kept = [(name, score) for name, score in scores if score >= threshold]
+        kept.sort(key=lambda x: x[1], reverse=True)
+        return kept
+    if k <= 0:
+        return []
+    heap: List[Tuple[float, int, str]] = []
+    for position, (name, score) in enumerate(scores):
+        if score < threshold:
+            continue
+        item = (score, -position, name)
+        if len(heap) < k:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+    return [(name, score) for score, _, name in sorted(heap, reverse=True)]
+
+def select_features(csv_path: str, target_col: str, k: int = None, threshold: float = 0.0,
+                    chunk_rows: int = 65536) -> List[Tuple[str, float]]:
     """
     Selects top features from a CSV file based on Information Gain.
+
+    The table is streamed *chunk_rows* rows at a time into packed columns
+    (binary .mbt datasets are memory-mapped directly), so it never has to
+    fit in memory as Python lists.
     
     Args:
-        csv_path: Path to the CSV file.
+        csv_path: Path to the CSV file (or binary dataset).
         target_col: Name of the output/target column.
         k: Number of top features to return. If None, returns all satisfying threshold.
         threshold: Minimum Information Gain required.
+        chunk_rows: Rows per block when reading a text file.
         
     Returns:
         List of tuples (feature_name, information_gain_score), sorted by score descending.
     """
     # 1. Load Data
-    columns: Dict[str, List[bool]] = {}
-    target_values: List[bool] = []
-    
     try:
-        with open(csv_path, mode='r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            if not reader.fieldnames:
+        with tempfile.TemporaryDirectory(prefix="ig_") as tmp:
+            if is_binary_dataset(csv_path):
+                table = open_binary(csv_path)
+            else:
+                # Short (malformed) rows are skipped, as the list-based loader did
+                table = stream_truth_table(csv_path, target_col, os.path.join(tmp, "table.bits"),
+                                           chunk_rows=chunk_rows, skip_short=True)
+                if table is None:
+                    return []
+            if table.target_col != target_col:
+                raise ValueError(f"Target column '{target_col}' not found in {csv_path}")
+            if table.row_count == 0:
+                print("Error: No target values found.")
                 return []
-                
-            # Initialize lists for all headers
-            for field in reader.fieldnames:
-                if field != target_col:
-                    columns[field] = []
-            
-            for row in reader:
-                try:
-                    # Parse Target
-                    if target_col in row:
-                        val = row[target_col].strip().upper()
-                        target_values.append(val in ('1', 'TRUE', 'T', 'YES'))
-                    else:
-                        raise ValueError(f"Target column '{target_col}' not found in row")
-                    
-                    # Parse Features
-                    for field in columns.keys():
-                        val = row[field].strip().upper()
-                        columns[field].append(val in ('1', 'TRUE', 'T', 'YES'))
-                        
-                except Exception as row_error:
-                    continue # Skip malformed rows
-                    
-    except FileNotFoundError:
-        print(f"Error: File {csv_path} not found.")
-        return []
 
-    if not target_values:
-        print("Error: No target values found.")
+            # 2. Calculate IG for each feature
+            scores = information_gains(table)
+            del table
+    except ValueError as e:
+        print(f"Error: {e}")
         return []
 
-    # 2. Calculate IG for each feature
-    feature_scores = []
-    
-    for feature_name, feature_vals in columns.items():
-        if len(feature_vals) != len(target_values):
-            # Skipping if lengths mismatch 
-            continue
-            
-        ig = calculate_information_gain(target_values, feature_vals)
-        if ig >= threshold:
-            feature_scores.append((feature_name, ig))
-            
     # 3. Sort and Filter
-    feature_scores.sort(key=lambda x: x[1], reverse=True)
-    
-    if k is not None:
-        return feature_scores[:k]
-        
-    return feature_scores
+    return top_k_features(scores.items(), k, threshold)
 
 
 
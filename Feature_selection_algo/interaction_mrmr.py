@@ -1,26 +1,39 @@
+import csv
 import math
-from typing import List, Dict, Set, Tuple, FrozenSet, Union
+from typing import List, Dict, Optional, Set, Tuple, FrozenSet, Union
 from itertools import combinations
 import sys
 import os
+import tempfile
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from Representation.csv_parser import load_truth_table
-
-def calculate_joint_entropy(features: List[List[bool]]) -> float:
+from Representation.csv_parser import collapse_truth_table, load_truth_table
+from Feature_selection_algo.screening import screen_features
+from Representation.binary_dataset import is_binary_dataset, open_binary, read_header
+from Representation.file_parser import detect_delimiter
+from Representation.packed_table import stream_truth_table
+from Representation.telemetry import get_telemetry, log
+
+def calculate_joint_entropy(features: List[List[bool]], weights: Optional[List[int]] = None) -> float:
     """
     Calculates joint entropy H(X1, X2, ..., Xn) for multiple boolean features.
+    *weights* gives the number of rows each position stands for (default 1).
     """
     if not features or not features[0]:
         return 0.0
     
-    n_samples = len(features[0])
-    
     # Count occurrences of each joint state
     state_counts: Dict[Tuple[bool, ...], int] = {}
     
-    for i in range(n_samples):
-        state = tuple(feature[i] for feature in features)
-        state_counts[state] = state_counts.get(state, 0) + 1
+    if weights is None:
+        n_samples = len(features[0])
+        for i in range(n_samples):
+            state = tuple(feature[i] for feature in features)
+            state_counts[state] = state_counts.get(state, 0) + 1
+    else:
+        n_samples = sum(weights)
+        for i, w in enumerate(weights):
+            state = tuple(feature[i] for feature in features)
+            state_counts[state] = state_counts.get(state, 0) + w
     
     # Calculate entropy
     entropy = 0.0
@@ -31,7 +44,8 @@ def calculate_joint_entropy(features: List[List[bool]]) -> float:
     
     return entropy
 
-def calculate_joint_mutual_information(feature_subset: List[List[bool]], target: List[bool]) -> float:
+def calculate_joint_mutual_information(feature_subset: List[List[bool]], target: List[bool],
+                                       weights: Optional[List[int]] = None) -> float:
     """
     Calculates joint mutual information I(X1, X2, ..., Xn; Y).
     I(X1,...,Xn; Y) = H(Y) - H(Y | X1,...,Xn)
@@ -40,16 +54,17 @@ def calculate_joint_mutual_information(feature_subset: List[List[bool]], target:
     if not feature_subset:
         return 0.0
         
-    h_features = calculate_joint_entropy(feature_subset)
-    h_target = calculate_joint_entropy([target])
-    h_joint = calculate_joint_entropy(feature_subset + [target])
+    h_features = calculate_joint_entropy(feature_subset, weights)
+    h_target = calculate_joint_entropy([target], weights)
+    h_joint = calculate_joint_entropy(feature_subset + [target], weights)
     
     return h_features + h_target - h_joint
 
 def calculate_conditional_mutual_information(
     new_features: List[List[bool]], 
     existing_features: List[List[bool]], 
-    target: List[bool]
+    target: List[bool],
+    weights: Optional[List[int]] = None
 ) -> float:
     """
     Calculates conditional mutual information I(New; Y | Existing).
@@ -59,17 +74,18 @@ def calculate_conditional_mutual_information(
                          = I(New, Existing; Y) - I(Existing; Y)
     """
     if not existing_features:
-        return calculate_joint_mutual_information(new_features, target)
+        return calculate_joint_mutual_information(new_features, target, weights)
     
-    mi_with_existing = calculate_joint_mutual_information(existing_features, target)
-    mi_combined = calculate_joint_mutual_information(new_features + existing_features, target)
+    mi_with_existing = calculate_joint_mutual_information(existing_features, target, weights)
+    mi_combined = calculate_joint_mutual_information(new_features + existing_features, target, weights)
     
     return mi_combined - mi_with_existing
 
 def calculate_interaction_gain(
     candidate_features: List[List[bool]],
     selected_features: List[List[bool]],
-    target: List[bool]
+    target: List[bool],
+    weights: Optional[List[int]] = None
 ) -> float:
     """
     Calculates the interaction gain: how much information the candidate adds
@@ -79,7 +95,7 @@ def calculate_interaction_gain(
     """
     # Relevance: conditional MI with target given selected features
     relevance = calculate_conditional_mutual_information(
-        candidate_features, selected_features, target
+        candidate_features, selected_features, target, weights
     )
     # print(f"Calculated relevance (conditional MI): {relevance}")
     
@@ -91,7 +107,8 @@ def calculate_interaction_gain(
             # Calculate MI between candidate features and this selected feature
             mi = calculate_joint_mutual_information(
                 candidate_features, 
-                sel_feat
+                sel_feat,
+                weights
             ) 
             redundancy += abs(mi)
         redundancy /= len(selected_features)
@@ -101,6 +118,24 @@ def calculate_interaction_gain(
     
     return relevance - redundancy
 
+def count_features(csv_path: str, target_col: str) -> int:
+    """
+    Number of input columns of a table, from its header only (0 if the
+    file is missing or has no data rows).
+    """
+    if is_binary_dataset(csv_path):
+        header = read_header(csv_path)
+        return len(header["columns"]) if header["row_count"] else 0
+    try:
+        with open(csv_path, mode='r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f, delimiter=detect_delimiter(csv_path))
+            header = next(reader, [])
+            if next(reader, None) is None:
+                return 0
+    except OSError:
+        return 0
+    return len([name for name in header if name != target_col])
+
 def feature_order(csv_path: str, target_col: str) -> int:
     """
     A function that returns the practical order limit for feature selection
@@ -110,22 +145,52 @@ def feature_order(csv_path: str, target_col: str) -> int:
     Returns:
         practical_order: int
     """
-    data_rows, _target_values = load_truth_table(csv_path, target_col)
-    if not data_rows:
+    num_features = count_features(csv_path, target_col)
+    if not num_features:
         # Keep a conservative default when the file is missing/empty/unreadable.
         num_features = 3
-    else:
-        # ``load_truth_table`` returns rows without the output column, so keys are features.
-        num_features = len(data_rows[0].keys())
 
     return min(num_features, 4)
 
+def _load_screened(csv_path: str, target_col: str, m: int, method: str,
+                   max_order: int) -> Tuple[List[Dict[str, bool]], List[bool]]:
+    """
+    Screens the table down to *m* features and returns only those columns,
+    in ``load_truth_table`` format.  The table is read as packed columns
+    (streamed from text, memory-mapped from a binary dataset).
+    """
+    with tempfile.TemporaryDirectory(prefix="mrmr_") as tmp:
+        if is_binary_dataset(csv_path):
+            table = open_binary(csv_path)
+        else:
+            table = stream_truth_table(csv_path, target_col, os.path.join(tmp, "table.bits"))
+            if table is None:
+                return [], []
+        if table.target_col != target_col:
+            print(f"Error: {csv_path} has target column '{table.target_col}', not '{target_col}'.")
+            return [], []
+
+        report = screen_features(table, m, method, max_order)
+        get_telemetry().count("mrmr_candidates_pruned",
+                              report.candidates_before - report.candidates_after)
+        log(report.summary(), level=2)
+
+        columns = [table.column(name) for name in report.kept]
+        target_values = table.target()
+        del table
+    data_rows = [dict(zip(report.kept, values)) for values in zip(*columns)]
+    if not report.kept:
+        data_rows = [{} for _ in target_values]
+    return data_rows, target_values
+
 def interaction_aware_mrmr(
     csv_path: str, 
     target_col: str, 
     k: int = None,
     max_interaction_order: int = 2,
-    output_type: str = 'list'
+    output_type: str = 'list',
+    prefilter: Optional[int] = None,
+    prefilter_method: str = 'ig'
 ) -> Union[List[Tuple[FrozenSet[str], float]], Set[str], Set[Union[str, Tuple[str, ...]]]]:
     """
 
@@ -140,17 +205,36 @@ def interaction_aware_mrmr(
             'list': Returns List[Tuple[FrozenSet[str], float]] (default).
             'set': Returns Set[str] (flattened set of all unique feature names).
             'subsets': Returns Set[Union[str, Tuple[str, ...]]] (set of selected subsets as strings or tuples).
+        prefilter: Optional. Number of features kept by a screening stage before the subset
+            enumeration (see Feature_selection_algo/screening.py); only those columns are loaded.
+        prefilter_method: Screening score: 'ig' (Information Gain; blind to features that only
+            matter in interaction, e.g. parity inputs), 'pairwise' (best pairwise joint MI with
+            the target) or 'sketch' ('pairwise' on a random row sample).
         
     Returns:
         Depends on output_type.
     """
 
     # 1. Load Data
-    data_rows, target_values = load_truth_table(csv_path, target_col)
+    if prefilter is not None:
+        data_rows, target_values = _load_screened(csv_path, target_col, prefilter,
+                                                  prefilter_method, max_interaction_order)
+    else:
+        data_rows, target_values = load_truth_table(csv_path, target_col)
 
     if not target_values or not data_rows:
         return []
 
+    # Collapse repeated (row, target) pairs into weighted rows
+    patterns, pos_counts, neg_counts = collapse_truth_table(data_rows, target_values)
+    data_rows, target_values, weights = [], [], []
+    for row, pos, neg in zip(patterns, pos_counts, neg_counts):
+        for label, count in ((True, pos), (False, neg)):
+            if count:
+                data_rows.append(row)
+                target_values.append(label)
+                weights.append(count)
+
     # Convert rows to column format
     columns: Dict[str, List[bool]] = {}
     for key in data_rows[0].keys():
@@ -180,7 +264,7 @@ def interaction_aware_mrmr(
     # 3. Compute initial relevance
     candidate_relevance: Dict[FrozenSet[str], float] = {}
     for feature_set, feature_data in all_candidates:
-        mi = calculate_joint_mutual_information(feature_data, target_values)
+        mi = calculate_joint_mutual_information(feature_data, target_values, weights)
         candidate_relevance[feature_set] = mi
 
     selected: List[Tuple[FrozenSet[str], float]] = []
@@ -218,7 +302,8 @@ def interaction_aware_mrmr(
             score = calculate_interaction_gain(
                 candidate_data,
                 selected_feature_data,
-                target_values
+                target_values,
+                weights
             )
 
             if score > best_score:
@@ -5,8 +5,11 @@ import sys
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
-from Feature_selection_algo.IG_selection import select_features as ig_select
-from Feature_selection_algo.interaction_mrmr import interaction_aware_mrmr, feature_order
+from Feature_selection_algo.IG_selection import (select_features as ig_select, top_k_features,
+                                                 calculate_information_gain)
+from Feature_selection_algo.interaction_mrmr import (interaction_aware_mrmr, feature_order,
+                                                     calculate_joint_entropy,
+                                                     calculate_joint_mutual_information)
 
 class TestAllFeatureSelection(unittest.TestCase):
     def setUp(self):
@@ -104,6 +107,49 @@ class TestAllFeatureSelection(unittest.TestCase):
         print(f"Feature Order: {order}")
         self.assertEqual(order, 3)
 
+    def test_ig_selection_top_k_matches_list_computation(self):
+        columns = {"A": [0, 0, 0, 1, 1, 1], "B": [0, 0, 1, 1, 1, 0], "C": [0, 1, 0, 0, 1, 1]}
+        target = [False, False, False, True, True, True]
+        expected = sorted(((name, calculate_information_gain(target, [bool(v) for v in vals]))
+                           for name, vals in columns.items()), key=lambda x: x[1], reverse=True)
+        scores = ig_select(self.test_csv_path, target_col="O", k=2)
+        self.assertEqual([name for name, _ in scores], [name for name, _ in expected[:2]])
+        for (_, got), (_, want) in zip(scores, expected):
+            self.assertAlmostEqual(got, want)
+
+    def test_ig_selection_skips_short_rows(self):
+        # The short row "0,1" is dropped, as the list-based loader did, not padded with a false target
+        with open(self.test_csv_path, "w") as f:
+            f.write("A,B,O\n1,0,1\n0,1\n1,1,0\nx,1,1\n")
+        target = [True, False, True]
+        expected = calculate_information_gain(target, [True, True, False])
+        scores = dict(ig_select(self.test_csv_path, target_col="O"))
+        self.assertAlmostEqual(scores["A"], expected)
+        self.assertAlmostEqual(scores["B"], expected)
+
+    def test_top_k_features_is_stable(self):
+        scores = [("A", 0.5), ("B", 0.9), ("C", 0.5), ("D", 0.1), ("E", 0.5)]
+        self.assertEqual(top_k_features(iter(scores), k=3), [("B", 0.9), ("A", 0.5), ("C", 0.5)])
+        self.assertEqual(top_k_features(scores, k=None, threshold=0.5),
+                         [("B", 0.9), ("A", 0.5), ("C", 0.5), ("E", 0.5)])
+
+    def test_mrmr_prefilter(self):
+        selected = interaction_aware_mrmr(self.test_csv_path, target_col="O", max_interaction_order=2,
+                                          output_type='set', prefilter=1)
+        self.assertEqual(selected, {"A"})
+
+    def test_weighted_entropy_matches_expanded_rows(self):
+        # Rows (a, b, t) with multiplicities, against the same rows repeated
+        rows = [(True, True, True), (True, False, False), (False, False, False), (True, True, False)]
+        weights = [3, 1, 4, 2]
+        columns = [list(col) for col in zip(*rows)]
+        expanded = [list(col) for col in zip(*[r for r, w in zip(rows, weights) for _ in range(w)])]
+
+        self.assertAlmostEqual(calculate_joint_entropy(columns[:2], weights),
+                               calculate_joint_entropy(expanded[:2]))
+        self.assertAlmostEqual(calculate_joint_mutual_information(columns[:2], columns[2], weights),
+                               calculate_joint_mutual_information(expanded[:2], expanded[2]))
+
 
 if __name__ == '__main__':
     unittest.main()
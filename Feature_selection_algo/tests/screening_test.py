@@ -0,0 +1,86 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from Feature_selection_algo.interaction_mrmr import (calculate_conditional_mutual_information,
+                                                     calculate_joint_mutual_information,
+                                                     count_features, interaction_aware_mrmr)
+from Feature_selection_algo.screening import candidate_count, pairwise_scores, screen_features
+from Representation.packed_table import stream_truth_table
+
+
+class TestScreening(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp(prefix='screen_test_')
+        rng = random.Random(7)
+        self.names = ["A", "B", "C"] + [f"X{i}" for i in range(9)]
+        self.rows = [[rng.random() < 0.5 for _ in self.names] for _ in range(300)]
+        # XOR(A, B) is invisible to single-feature IG; C adds a main effect
+        self.target = [(r[0] != r[1]) or r[2] for r in self.rows]
+        self.path = os.path.join(self.test_dir, "table.csv")
+        with open(self.path, "w") as f:
+            f.write(",".join(self.names + ["O"]) + "\n")
+            for row, t in zip(self.rows, self.target):
+                f.write(",".join(str(int(v)) for v in row + [t]) + "\n")
+        self.table = stream_truth_table(self.path, out_path=self.path + ".bits", chunk_rows=64)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_pairwise_scores_match_conditional_mutual_information(self):
+        scores = pairwise_scores(self.table)
+        columns = {name: [r[i] for r in self.rows] for i, name in enumerate(self.names)}
+        for name in ("A", "C", "X3"):
+            best = max(calculate_joint_mutual_information([columns[name]], self.target),
+                       *(calculate_conditional_mutual_information([columns[name]], [columns[other]],
+                                                                  self.target)
+                         for other in self.names if other != name))
+            self.assertAlmostEqual(scores[name], best)
+
+    def test_pairwise_screening_keeps_interacting_features(self):
+        ig = screen_features(self.table, 2, "ig", max_order=3)
+        pairwise = screen_features(self.table, 3, "pairwise", max_order=3)
+        sketch = screen_features(self.table, 3, "sketch", max_order=3, sketch_rows=200)
+
+        self.assertNotEqual(set(ig.kept), {"A", "B"})
+        self.assertEqual(pairwise.kept, ["A", "B", "C"])
+        self.assertEqual(sketch.kept, ["A", "B", "C"])
+        self.assertEqual(pairwise.candidates_before, candidate_count(12, 3))
+        self.assertEqual(pairwise.candidates_after, 7)
+        self.assertGreater(pairwise.pruned_fraction, 0.9)
+        with self.assertRaises(ValueError):
+            screen_features(self.table, 3, "nope")
+
+    def test_mrmr_with_pairwise_prefilter(self):
+        selected = interaction_aware_mrmr(self.path, "O", max_interaction_order=2, output_type='set',
+                                          prefilter=3, prefilter_method='pairwise')
+        self.assertTrue({"A", "B"} <= selected <= {"A", "B", "C"})
+
+    def test_count_features_detects_delimiter(self):
+        for suffix, delimiter in ((".tsv", "\t"), (".psv", "|")):
+            path = os.path.join(self.test_dir, "table" + suffix)
+            with open(path, "w") as f:
+                f.write(delimiter.join(self.names + ["O"]) + "\n")
+                f.write(delimiter.join("0" for _ in range(len(self.names) + 1)) + "\n")
+            self.assertEqual(count_features(path, "O"), len(self.names))
+
+    def test_extract_features_screens_only_when_asked(self):
+        from Representation.sampling import MRMR_CACHE, extract_features
+        from Representation.telemetry import Telemetry, get_telemetry, set_telemetry
+        previous = get_telemetry()
+        try:
+            MRMR_CACHE.clear()
+            telemetry = set_telemetry(Telemetry(verbosity=0))
+            extract_features(self.path, "O")
+            self.assertNotIn("mrmr_candidates_pruned", telemetry.counters)
+            extract_features(self.path, "O", screen_keep=4, screen_method="pairwise")
+            self.assertGreater(telemetry.counters["mrmr_candidates_pruned"], 0)
+        finally:
+            MRMR_CACHE.clear()
+            set_telemetry(previous)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Checkpointing for the MOSES outer loops.
+
+A checkpoint is a pickled dict with a schema version:
+
+    version          CHECKPOINT_VERSION
+    strategy         "beta", "beta_sa" or "alpha" — which driver wrote it
+    state            the MosesState (exemplar, metapop, iteration,
+                     distance / last_chance, temperature, ...)
+    fitness_memo     FitnessOracle.memo (program -> score)
+    reduction_cache  Representation.sampling.REDUCTION_CACHE
+    random_state     random.getstate(), so a resumed run continues the
+                     same random stream
+
+Files are written to a temporary file next to the target and moved into
+place with ``os.replace``, so a crash mid-write never leaves a truncated
+checkpoint behind.
+"""
+
+import os
+import pickle
+import random
+import tempfile
+from typing import Optional
+
+from Moses.moses_state import MosesState
+from Representation.representation import FitnessOracle
+from Representation.sampling import REDUCTION_CACHE
+
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(path: str, state: MosesState, fitness: FitnessOracle, strategy: str) -> None:
+    """Atomically write the run state and warm caches to *path*."""
+    payload = {
+        "version": CHECKPOINT_VERSION,
+        "strategy": strategy,
+        "state": state,
+        "fitness_memo": fitness.memo,
+        "reduction_cache": REDUCTION_CACHE,
+        "random_state": random.getstate(),
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".checkpoint-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_checkpoint(path: str, fitness: Optional[FitnessOracle] = None) -> dict:
+    """
+    Read a checkpoint written by :func:`save_checkpoint`.
+
+    Restores the reduction cache and the ``random`` state, and the score
+    memo into *fitness* if given.  Returns the payload dict (the run state
+    is under ``"state"``).
+
+    Raises:
+        ValueError: if the file was written with another schema version.
+    """
+    with open(path, "rb") as f:
+        payload = pickle.load(f)
+
+    version = payload.get("version") if isinstance(payload, dict) else None
+    if version != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {version!r} in {path} "
+                         f"(expected {CHECKPOINT_VERSION})")
+
+    REDUCTION_CACHE.update(payload["reduction_cache"])
+    random.setstate(payload["random_state"])
+    if fitness is not None:
+        fitness.memo.update(payload["fitness_memo"])
+    return payload
+
+
+def maybe_checkpoint(path: Optional[str], every: int, steps: int, state: MosesState,
+                     fitness: FitnessOracle, strategy: str) -> None:
+    """Called by the drivers after every iteration: save every *every* steps and at the end."""
+    if path is None:
+        return
+    if state.done or (every > 0 and steps % every == 0):
+        save_checkpoint(path, state, fitness, strategy)
@@ -0,0 +1,38 @@
+"""
+Run state for the MOSES outer loops.
+
+``run_bp_moses``, ``run_bp_moses_sa`` and ``run_abp_moses`` are loops over
+a ``MosesState``: each call of the matching ``*_step`` function performs
+one iteration and updates the state in place.  A caller can therefore
+drive a run one iteration at a time, stop, and later continue it by
+passing the same state back in.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+from Representation.representation import Instance
+
+
+@dataclass
+class MosesState:
+    exemplar: Instance
+    metapop: List[Instance]
+    iteration: int = 1
+    max_iter: int = 30
+    # run_bp_moses: neighbourhood distance and stagnation flag
+    distance: int = 1
+    max_dist: int = 5
+    last_chance: bool = False
+    # run_bp_moses_sa: annealing schedule
+    temperature: float = 1.0
+    cooling_rate: float = 0.9
+    best_possible_score: float = 1.0
+    done: bool = False
+    result: Optional[List[Instance]] = None
+
+    def finish(self, result: List[Instance]) -> bool:
+        """Mark the run as finished with *result* as the final metapopulation."""
+        self.done = True
+        self.result = result
+        return True
@@ -0,0 +1,111 @@
+"""
+Parallel deme execution for the MOSES loops.
+
+Demes sampled around the same exemplar are independent until their best
+instances are merged into the metapopulation, so they can run in separate
+processes.  Every deme gets its own RNG seed, drawn from ``random`` in the
+parent before any work starts; the result of a run therefore depends on
+``random.seed`` only, not on the number of workers or on scheduling.
+
+Each worker receives a copy of the FitnessOracle (so it has its own memo)
+and builds its own MeTTa instance inside the deme task.  The scores it
+computed are sent back and merged into the parent's memo.  Tasks sent
+with :func:`submit` print at the parent's verbosity.
+"""
+
+import atexit
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+from Representation.representation import Deme, FitnessOracle
+from Representation.telemetry import Telemetry, get_telemetry, set_telemetry
+
+# Workers are spawned (not forked): the parent already holds a MeTTa runtime.
+_POOLS: Dict[int, ProcessPoolExecutor] = {}
+
+
+def get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """Shared pool of *workers* spawned processes (created on first use)."""
+    pool = _POOLS.get(workers)
+    if pool is None:
+        pool = ProcessPoolExecutor(max_workers=workers,
+                                   mp_context=multiprocessing.get_context("spawn"))
+        _POOLS[workers] = pool
+    return pool
+
+
+def shutdown_pools() -> None:
+    """Stop every worker pool started by :func:`get_process_pool`."""
+    for pool in _POOLS.values():
+        pool.shutdown()
+    _POOLS.clear()
+
+
+atexit.register(shutdown_pools)
+
+
+def _with_verbosity(verbosity: int, fn: Callable, *args) -> Any:
+    set_telemetry(Telemetry(verbosity=verbosity))
+    return fn(*args)
+
+
+def submit(pool: ProcessPoolExecutor, fn: Callable, *args):
+    """``pool.submit(fn, *args)``, with the worker set to this process's verbosity."""
+    return pool.submit(_with_verbosity, get_telemetry().verbosity, fn, *args)
+
+
+def _run_one(task: Callable, deme: Deme, fitness: FitnessOracle, kwargs: dict) -> Any:
+    telemetry = get_telemetry()
+    with telemetry.scope(deme=deme.id), telemetry.timer("deme"):
+        return task(deme, fitness, **kwargs)
+
+
+def _run_seeded(task: Callable, deme: Deme, fitness: FitnessOracle, seed: int,
+                kwargs: dict) -> Tuple[Any, Dict[str, float]]:
+    """Run *task* on one deme with its own RNG stream; return its result and new scores."""
+    random.seed(seed)
+    known = set(fitness.memo)
+    result = _run_one(task, deme, fitness, kwargs)
+    new_scores = {value: score for value, score in fitness.memo.items() if value not in known}
+    return result, new_scores
+
+
+def run_demes(task: Callable, demes: List[Deme], fitness: FitnessOracle,
+              workers: int = 0, **kwargs) -> List[Any]:
+    """
+    Apply ``task(deme, fitness, **kwargs)`` to every deme and return the
+    results in deme order.
+
+    Args:
+        task:    module-level callable (it is pickled by reference).
+        workers: 0 runs the demes one after the other on the shared RNG
+                 stream, exactly like the original loops.  1 runs them in
+                 this process with per-deme seeds; N > 1 spreads them over
+                 a pool of N processes.  Any value >= 1 gives the same
+                 results for the same ``random.seed``.
+
+    Scores computed by the workers are merged into ``fitness.memo``.
+    """
+    if workers <= 0:
+        return [_run_one(task, deme, fitness, kwargs) for deme in demes]
+
+    seeds = [random.getrandbits(64) for _ in demes]
+
+    if workers == 1 or len(demes) <= 1:
+        state = random.getstate()
+        outputs = [_run_seeded(task, deme, fitness, seed, kwargs)
+                   for deme, seed in zip(demes, seeds)]
+        random.setstate(state)
+    else:
+        pool = get_process_pool(workers)
+        futures = [submit(pool, _run_seeded, task, deme, fitness, seed, kwargs)
+                   for deme, seed in zip(demes, seeds)]
+        outputs = [future.result() for future in futures]
+
+    results = []
+    for result, new_scores in outputs:
+        fitness.memo.update(new_scores)
+        results.append(result)
+    return results
@@ -1,4 +1,5 @@
 import random
+from typing import Optional
 
 from Representation.representation import *
 from Representation.helpers import *
@@ -6,6 +7,28 @@ from Representation.csv_parser import load_truth_table
 from Representation.selection import select_top_k  
 from FactorGraph_EDA.eda import run_deme_eda
 from Representation.sampling import sample_from_TTable
+from Moses.parallel_demes import run_demes
+from Moses.moses_state import MosesState
+from Moses.checkpoint import maybe_checkpoint
+from Representation.telemetry import get_telemetry, log
+
+
+def _run_deme_task(deme: Deme, fitness: FitnessOracle, num_generations: int,
+                   all_knobs: List[Knob]) -> Optional[Instance]:
+    """EDA on one deme; module-level so it can run in a worker process."""
+    log(f"\n  --- Deme {deme.id} ({len(deme.instances)} instances) ---", level=2)
+    best_inst, _fg = run_deme_eda(
+        deme,
+        fitness,
+        num_generations=num_generations,
+        top_k=min(5, len(deme.instances)),
+        min_pmi=0.0,
+        min_freq=1,
+        sample_size=len(deme.instances),
+        all_knobs=all_knobs,
+        verbose=get_telemetry().verbosity >= 2,
+    )
+    return best_inst
 
 
 def run_abp_moses(
@@ -17,56 +40,83 @@ def run_abp_moses(
     csv_path: str,
     metapop: List[Instance],
     max_iter: int,
+    state: Optional[MosesState] = None,
+    checkpoint_path: Optional[str] = None,
+    checkpoint_every: int = 1,
 ) -> List[Instance]:
     """
     Outer MOSES loop.
 
-    Each iteration:
+    Each iteration (one ``abp_moses_step``):
       1. Sample demes using feature selection algorithms.
       2. For each deme, run ``num_generations`` of EDA (mine → FG → PLN → sample).
       3. Collect the fittest instance from every deme into the metapopulation.
-      4. Pick a new exemplar and recurse (or stop when *max_iter* is exhausted).
+      4. Pick a new exemplar and continue (or stop when *max_iter* is exhausted).
+
+    ``state.max_iter`` counts the iterations still to run.  Pass *state* to
+    continue a run that was stepped or paused earlier.  With
+    *checkpoint_path* the run state is saved every *checkpoint_every*
+    iterations and at the end (see ``Moses/checkpoint.py``).
     """
+    if state is None:
+        state = MosesState(exemplar=exemplar, metapop=metapop, max_iter=max_iter)
+    steps = 0
+    telemetry = get_telemetry()
+    while not state.done:
+        with telemetry.scope(iteration=state.iteration), telemetry.timer("iteration"):
+            abp_moses_step(state, fitness, hyperparams, knobs, target, csv_path)
+        steps += 1
+        telemetry.snapshot(strategy="alpha", iteration=state.iteration - 1)
+        maybe_checkpoint(checkpoint_path, checkpoint_every, steps, state, fitness, "alpha")
+    return state.result
+
+
+def abp_moses_step(
+    state: MosesState,
+    fitness: FitnessOracle,
+    hyperparams: Hyperparams,
+    knobs: List[Knob],
+    target: List[bool],
+    csv_path: str,
+) -> bool:
+    """One iteration of ``run_abp_moses``; returns True once the run is finished."""
+    exemplar, metapop, max_iter = state.exemplar, state.metapop, state.max_iter
+
     if max_iter <= 0:
-        print("\nMax iterations reached.")
-        print(f"\n{'='*60}")
-        print("--- Final Metapopulation ---")
+        log("\nMax iterations reached.")
+        log(f"\n{'='*60}")
+        log("--- Final Metapopulation ---")
         unique_meta = {inst.value: inst for inst in metapop}.values()
         sorted_metapop = sorted(unique_meta, key=lambda x: -x.score)
         for inst in sorted_metapop[:10]:
-            print(f"  {inst.value:<40} | Score: {inst.score:.5f}")
-        return list(sorted_metapop)
+            log(f"  {inst.value:<40} | Score: {inst.score:.5f}")
+        return state.finish(list(sorted_metapop))
 
     # --- 1. Sample demes centred on the current exemplar -------------------
-    print(f"\n{'='*60}")
-    print(f"[Iter {max_iter}] Exemplar: {exemplar.value}  (score={exemplar.score:.4f})")
-    demes = sample_from_TTable(csv_path, hyperparams, exemplar, knobs, target, output_col='O')
-    print(f"  Sampled {len(demes)} deme(s)")
+    log(f"\n{'='*60}")
+    log(f"[Iter {max_iter}] Exemplar: {exemplar.value}  (score={exemplar.score:.4f})")
+    demes = sample_from_TTable(csv_path, hyperparams, exemplar, knobs, target, output_col='O', fitness=fitness)
+    log(f"  Sampled {len(demes)} deme(s)")
 
     # --- 2. Run EDA generations on each deme -------------------------------
     best_instances: List[Instance] = []
     num_eda_gens = hyperparams.num_generations 
 
+    active = []
     for i, deme in enumerate(demes):
         if not deme.instances:
-            print(f"  Deme {i}: empty, skipping")
+            log(f"  Deme {i}: empty, skipping")
             continue
+        active.append((i, deme))
+
+    results = run_demes(_run_deme_task, [deme for _, deme in active], fitness,
+                        hyperparams.deme_workers,
+                        num_generations=num_eda_gens, all_knobs=knobs)
 
-        print(f"\n  --- Deme {i} ({len(deme.instances)} instances) ---")
-        best_inst, _fg = run_deme_eda(
-            deme,
-            fitness,
-            num_generations=num_eda_gens,
-            top_k=min(5, len(deme.instances)),
-            min_pmi=0.0,
-            min_freq=1,
-            sample_size=len(deme.instances),
-            all_knobs=knobs,
-            verbose=True,
-        )
+    for (i, _), best_inst in zip(active, results):
         if best_inst is not None:
             best_instances.append(best_inst)
-            print(f"  Deme {i} best: {best_inst.value:<30} | Score: {best_inst.score:.4f}")
+            log(f"  Deme {i} best: {best_inst.value:<30} | Score: {best_inst.score:.4f}")
 
     # --- 3. Merge best instances into metapopulation -----------------------
     meta_dict = {inst.value: inst for inst in metapop}
@@ -78,7 +128,7 @@ def run_abp_moses(
             meta_dict[inst.value] = inst
 
     metapop = sorted(meta_dict.values(), key=lambda x: x.score, reverse=True)
-    print(f"\n  Merged {added_count} new unique instance(s). Metapop size: {len(metapop)}")
+    log(f"\n  Merged {added_count} new unique instance(s). Metapop size: {len(metapop)}")
 
     # --- 4. Pick next exemplar ---------------------------------------------
     new_exemplar = metapop[0]
@@ -87,10 +137,11 @@ def run_abp_moses(
     if new_exemplar.value == exemplar.value and len(metapop) > 1:
         backup_idx = random.randint(1, min(4, len(metapop) - 1))
         new_exemplar = metapop[backup_idx]
-        print(f"  (!) Stagnation — switching to rank {backup_idx}: "
-              f"{new_exemplar.value[:30]}  (score={new_exemplar.score:.4f})")
+        log(f"  (!) Stagnation — switching to rank {backup_idx}: "
+            f"{new_exemplar.value[:30]}  (score={new_exemplar.score:.4f})")
 
-    return run_abp_moses(
-        new_exemplar, fitness, hyperparams, knobs, target,
-        csv_path, metapop, max_iter - 1,
-    )
+    state.exemplar = new_exemplar
+    state.metapop = metapop
+    state.max_iter = max_iter - 1
+    state.iteration += 1
+    return False
@@ -4,23 +4,29 @@ from Representation.representation import *
 from Representation.helpers import *
 from Representation.csv_parser import load_truth_table
 from Representation.selection import select_top_k, tournament_selection
-from Representation.sampling import sample_from_TTable, reduce_and_score
+from Representation.sampling import (sample_from_TTable, reduce_and_score, reduce_expressions,
+                                     apply_reductions, REDUCTION_CACHE)
 
 from Variation_quantale.crossover import VariationQuantale, crossTopOne
 from Variation_quantale.mutation import Mutation
 
 from FactorGraph_EDA.beta_bp import BetaFactorGraph
+from Moses.parallel_demes import run_demes, get_process_pool, submit
+from Moses.moses_state import MosesState
+from Moses.checkpoint import maybe_checkpoint
+from Representation.telemetry import get_telemetry, log
 from hyperon import MeTTa
 
 import random
 import math
-from typing import List
+from collections import deque
+from typing import List, Optional
 # from time import sleep
 
 
 def _finalize_metapop(metapop: List[Instance], fg_type=None) -> List[Instance]:
     """Helper to sort and print the final metapopulation."""
-    print(f"\n--- Final Metapopulation ---")
+    log(f"\n--- Final Metapopulation ---")
     unique_meta = list({inst.value: inst for inst in metapop}.values())
     # Safely get complexity if the method exists, else default to 0
     def get_cpx(inst):
@@ -29,69 +35,78 @@ def _finalize_metapop(metapop: List[Instance], fg_type=None) -> List[Instance]:
     sorted_meta = sorted(unique_meta, key=lambda x: (-x.score, get_cpx(x)))
     
     for inst in sorted_meta[:10]:
-        print(f"Instance: {inst.value} | Score: {inst.score:.5f}")
+        log(f"Instance: {inst.value} | Score: {inst.score:.5f}")
     return sorted_meta
 
 
-def run_variation(deme, fitness, hyperparams, target, min_xover_neighbors=5):
-    bg = BetaFactorGraph()
-    metta = MeTTa()
-    
-    for generation in range(hyperparams.num_generations):
-        print("-" * 60)
-        print(f"\n--- Generation {generation + 1} ---")
+def _variation_candidates(deme, bg, hyperparams, target, min_xover_neighbors, pending_values=()):
+    """
+    Mine the deme, update and propagate the beta graph, then build this
+    generation's crossover and mutation children.
 
-        selected_exemplars = select_top_k(deme, k=7)
-        values = [inst.value for inst in deme.instances]
-        weights = [inst.score for inst in deme.instances]
-        
+    Returns ``(new_candidates, existing_values)``, or None when the miner
+    found no correlations.  *pending_values* are candidates still being
+    reduced; they are treated as existing.
+    """
+    telemetry = get_telemetry()
+    selected_exemplars = select_top_k(deme, k=7)
+    values = [inst.value for inst in deme.instances]
+    weights = [inst.score for inst in deme.instances]
+    
+    with telemetry.timer("mining"):
         miner = DependencyMiner()
         miner.fit(values, weights)
         correlation = miner.get_meaningful_dependencies()
-        
-        print("-" * 50)    
-        for row in correlation:
-            bg.add_dependency_rule(row['pair'], row['strength'], row['confidence'])
-
-        if len(correlation) > 0:
-            top_rule = correlation[0]
-            parts = top_rule['pair'].split(' -- ')
-            if len(parts) > 0:
-                root_node = parts[0]
-                print(f"\nDynamically setting prior for '{root_node}' based on rule: {top_rule['pair']}")
-                bg.set_prior(
-                    root_node, 
-                    stv_strength=top_rule['strength'], 
-                    stv_confidence=top_rule['confidence']
-                )
-        else:
-            print("No correlations found...")
-            continue
-        
-        bg.run_evidence_propagation(steps=20)
-        
-        stv_dict = {name: (node.strength, node.confidence) for name, node in bg.nodes.items()}
-        
+    
+    log("-" * 50, level=2)
+    bg.add_dependency_rules(correlation)
+
+    if len(correlation) > 0:
+        top_rule = correlation[0]
+        parts = top_rule['pair'].split(' -- ')
+        if len(parts) > 0:
+            root_node = parts[0]
+            log(f"\nDynamically setting prior for '{root_node}' based on rule: {top_rule['pair']}", level=2)
+            bg.set_prior(
+                root_node, 
+                stv_strength=top_rule['strength'], 
+                stv_confidence=top_rule['confidence']
+            )
+    else:
+        log("No correlations found...", level=2)
+        return None
+    
+    # Warm-started: only rules/priors changed this generation are re-propagated
+    with telemetry.timer("propagation"):
+        bg.run_incremental_propagation()
+    
+    stv_dict = {name: (node.strength, node.confidence) for name, node in bg.nodes.items()}
+    
+    with telemetry.timer("variation"):
         # Track existing values to prevent any duplicates
         existing_values = {inst.value for inst in deme.instances}
+        existing_values.update(pending_values)
         new_candidates = []
+        generated = 0
         unique_children_values = set()
 
         if len(deme.instances) >= min_xover_neighbors:
             raw_children = crossTopOne(selected_exemplars, stv_dict, target)
+            generated += len(raw_children)
             for inst in raw_children:
                 inst.value = prune_duplicate_children(inst.value)
                 if inst.value not in existing_values and inst.value not in unique_children_values:
                     new_candidates.append(inst)
                     unique_children_values.add(inst.value)
         else:
-            print(f"Skipping crossover (neighborhood size {len(deme.instances)} < {min_xover_neighbors})")
+            log(f"Skipping crossover (neighborhood size {len(deme.instances)} < {min_xover_neighbors})", level=2)
 
         mut_parent = max(selected_exemplars, key=lambda x: x.score)
         mutation = Mutation(mut_parent, stv_dict, hyperparams)
 
         child1 = mutation.execute_additive()
         if isinstance(child1, Instance):
+            generated += 1
             child1.value = prune_duplicate_children(child1.value)
             if child1.value not in existing_values and child1.value not in unique_children_values:
                 new_candidates.append(child1)
@@ -99,85 +114,203 @@ def run_variation(deme, fitness, hyperparams, target, min_xover_neighbors=5):
 
         child2 = mutation.execute_multiplicative()
         if isinstance(child2, Instance):
+            generated += 1
             child2.value = prune_duplicate_children(child2.value)
             if child2.value not in existing_values and child2.value not in unique_children_values:
                 new_candidates.append(child2)
                 unique_children_values.add(child2.value)
 
+    telemetry.count("candidates_generated", generated)
+    telemetry.count("duplicates_dropped", generated - len(new_candidates))
+
+    return new_candidates, existing_values
+
+
+def run_variation(deme, fitness, hyperparams, target, min_xover_neighbors=5):
+    if hyperparams.pipeline_staleness > 0:
+        return _run_variation_pipelined(deme, fitness, hyperparams, target, min_xover_neighbors)
+
+    bg = BetaFactorGraph()
+    metta = MeTTa()
+    
+    for generation in range(hyperparams.num_generations):
+        log("-" * 60, level=2)
+        log(f"\n--- Generation {generation + 1} ---", level=2)
+
+        produced = _variation_candidates(deme, bg, hyperparams, target, min_xover_neighbors)
+        if produced is None:
+            continue
+        new_candidates, existing_values = produced
+
         reduced_candidates = reduce_and_score(new_candidates, fitness, metta)
-        reduced_candidates = [inst for inst in reduced_candidates if inst.value not in existing_values]
+        kept = [inst for inst in reduced_candidates if inst.value not in existing_values]
+        get_telemetry().count("duplicates_dropped", len(reduced_candidates) - len(kept))
+        reduced_candidates = kept
         for inst in reduced_candidates:
             existing_values.add(inst.value)
         deme.instances.extend(reduced_candidates)
     
     return deme
 
+
+def _run_variation_pipelined(deme, fitness, hyperparams, target, min_xover_neighbors=5):
+    """
+    Producer/consumer form of ``run_variation``.
+
+    The main thread keeps generating candidates while a pool of
+    ``hyperparams.reduce_workers`` processes reduces the previous
+    generations' candidates; scoring and merging into the deme happen here
+    as reductions complete, oldest generation first.
+
+    A generation is only generated once at most
+    ``hyperparams.pipeline_staleness`` earlier generations are still being
+    reduced, so the statistics it is built from miss the results of at
+    most that many generations (this also bounds the queue).
+    """
+    bg = BetaFactorGraph()
+    workers = max(1, hyperparams.reduce_workers)
+    pool = get_process_pool(workers)
+    in_flight = deque()  # (candidates, [(chunk, future), ...]) per generation
+
+    def absorb():
+        candidates, parts = in_flight.popleft()
+        for chunk, future in parts:
+            REDUCTION_CACHE.update(zip(chunk, future.result()))
+        reduced_values = [REDUCTION_CACHE[inst.value] for inst in candidates]
+
+        existing_values = {inst.value for inst in deme.instances}
+        for inst in apply_reductions(candidates, reduced_values, fitness):
+            if inst.value not in existing_values:
+                existing_values.add(inst.value)
+                deme.instances.append(inst)
+            else:
+                get_telemetry().count("duplicates_dropped")
+
+    for generation in range(hyperparams.num_generations):
+        while len(in_flight) > hyperparams.pipeline_staleness:
+            absorb()
+
+        log("-" * 60, level=2)
+        log(f"\n--- Generation {generation + 1} ---", level=2)
+
+        pending_values = {inst.value for candidates, _ in in_flight for inst in candidates}
+        produced = _variation_candidates(deme, bg, hyperparams, target, min_xover_neighbors,
+                                         pending_values)
+        if produced is None:
+            continue
+        new_candidates, _ = produced
+
+        # only programs nobody has reduced yet go to the pool
+        values = list(dict.fromkeys(inst.value for inst in new_candidates
+                                    if inst.value not in REDUCTION_CACHE))
+        size = max(1, math.ceil(len(values) / workers))
+        parts = []
+        for i in range(0, len(values), size):
+            chunk = values[i:i + size]
+            parts.append((chunk, submit(pool, reduce_expressions, chunk)))
+        in_flight.append((new_candidates, parts))
+
+    while in_flight:
+        absorb()
+
+    return deme
+
 def run_bp_moses(exemplar: Instance, fitness: FitnessOracle, hyperparams: Hyperparams,
               target: List[bool], csv_path: str, metapop: List[Instance], 
               iteration: int = 1, max_iter: int = 30, 
               distance: int = 1, max_dist: int = 5, 
-              last_chance: bool = False, best_possible_score: float = 1.0) -> List[Instance]:
+              last_chance: bool = False, best_possible_score: float = 1.0,
+              state: Optional[MosesState] = None,
+              checkpoint_path: Optional[str] = None, checkpoint_every: int = 1) -> List[Instance]:
+    """
+    Beta MOSES loop: repeats ``bp_moses_step`` until the run terminates.
+
+    Pass *state* to continue a run that was stepped or paused earlier; the
+    other search arguments are then ignored.  With *checkpoint_path* the
+    run state is saved every *checkpoint_every* iterations and at the end
+    (see ``Moses/checkpoint.py``).
+    """
+    if state is None:
+        state = MosesState(exemplar=exemplar, metapop=metapop, iteration=iteration,
+                           max_iter=max_iter, distance=distance, max_dist=max_dist,
+                           last_chance=last_chance, best_possible_score=best_possible_score)
+    steps = 0
+    telemetry = get_telemetry()
+    while not state.done:
+        with telemetry.scope(iteration=state.iteration), telemetry.timer("iteration"):
+            bp_moses_step(state, fitness, hyperparams, target, csv_path)
+        steps += 1
+        telemetry.snapshot(strategy="beta", iteration=state.iteration - 1)
+        maybe_checkpoint(checkpoint_path, checkpoint_every, steps, state, fitness, "beta")
+    return state.result
+
+
+def bp_moses_step(state: MosesState, fitness: FitnessOracle, hyperparams: Hyperparams,
+                  target: List[bool], csv_path: str) -> bool:
+    """One iteration of ``run_bp_moses``; returns True once the run is finished."""
+    exemplar = state.exemplar
+    metapop = state.metapop
+    iteration, distance = state.iteration, state.distance
+
+    if state.max_iter <= iteration:
+        log("\nMax iterations limit reached...")
+        return state.finish(_finalize_metapop(metapop))
     
-    if max_iter <= iteration:
-        print("\nMax iterations limit reached...")
-        return _finalize_metapop(metapop)
-    
-    if distance > max_dist:
-        print("\nTerminating because maximum search distance reached...")
-        return _finalize_metapop(metapop)
+    if distance > state.max_dist:
+        log("\nTerminating because maximum search distance reached...")
+        return state.finish(_finalize_metapop(metapop))
 
-    if exemplar.score >= best_possible_score:
-        print(f"\nTerminating because best possible score ({best_possible_score}) was found!")
-        return _finalize_metapop(metapop)
+    if exemplar.score >= state.best_possible_score:
+        log(f"\nTerminating because best possible score ({state.best_possible_score}) was found!")
+        return state.finish(_finalize_metapop(metapop))
 
-    demes = sample_from_TTable(csv_path, hyperparams, exemplar, exemplar.knobs, target, output_col='O')
-    print(f"\n[Iter {iteration} | Dist {distance}] Running Variation for {len(demes)} demes centered on: {exemplar.value}...")
+    demes = sample_from_TTable(csv_path, hyperparams, exemplar, exemplar.knobs, target, output_col='O', fitness=fitness)
+    log(f"\n[Iter {iteration} | Dist {distance}] Running Variation for {len(demes)} demes centered on: {exemplar.value}...")
     
     if len(demes) == 0:
-        print("No demes generated from sampling. Expanding search distance...")
-        return run_bp_moses(
-            exemplar, fitness, hyperparams, target, csv_path, metapop, 
-            iteration=iteration + 1, max_iter=max_iter, 
-            distance=distance + 1, max_dist=max_dist, 
-            last_chance=False, best_possible_score=best_possible_score
-        )
+        log("No demes generated from sampling. Expanding search distance...")
+        state.iteration = iteration + 1
+        state.distance = distance + 1
+        state.last_chance = False
+        return False
     
-    new_demes = [run_variation(deme, fitness, hyperparams, target) for deme in demes]
+    new_demes = run_demes(run_variation, demes, fitness, hyperparams.deme_workers,
+                          hyperparams=hyperparams, target=target)
 
-    print("Iteration: ", iteration)
-    print("\n--- Top Instances from Each Deme ---")
+    log("Iteration: ", iteration)
+    log("\n--- Top Instances from Each Deme ---")
     meta_dict = {inst.value: inst for inst in metapop}
     added_count = 0
 
     for i, deme in enumerate(new_demes):
         if not deme.instances: continue
         best_in_deme = max(deme.instances, key=lambda x: x.score)
-        print(f"Deme {i} Best: {best_in_deme.value:<30} | Score: {best_in_deme.score:.4f}")
+        log(f"Deme {i} Best: {best_in_deme.value:<30} | Score: {best_in_deme.score:.4f}")
         
         if best_in_deme.value not in meta_dict or best_in_deme.score > meta_dict[best_in_deme.value].score:
             meta_dict[best_in_deme.value] = best_in_deme
             added_count += 1
 
     metapop = sorted(meta_dict.values(), key=lambda x: x.score, reverse=True)
-    print(f"Merged {added_count} new unique instances. Metapop Size: {len(metapop)}")
+    log(f"Merged {added_count} new unique instances. Metapop Size: {len(metapop)}")
 
     new_best = metapop[0]
     has_improved = new_best.score > exemplar.score + 1e-6 # epsilon for float comparison
 
     
     if has_improved:
-        print(f"*** Improvement found! Score: {new_best.score:.4f} ***")
+        log(f"*** Improvement found! Score: {new_best.score:.4f} ***")
         next_exemplar = new_best
         next_distance = 1
         next_last_chance = False
     else:
-        if not last_chance:
-            print(f"(!) Stagnation at score {exemplar.score:.4f}. Trying one last chance at current center...")
+        if not state.last_chance:
+            log(f"(!) Stagnation at score {exemplar.score:.4f}. Trying one last chance at current center...")
             next_exemplar = exemplar
             next_distance = distance
             next_last_chance = True
         else:
-            print(f"(!) No improvement after last chance. Expanding search distance...")
+            log(f"(!) No improvement after last chance. Expanding search distance...")
             next_distance = distance + 1
             next_last_chance = False
             
@@ -185,60 +318,89 @@ def run_bp_moses(exemplar: Instance, fitness: FitnessOracle, hyperparams: Hyperp
             if len(metapop) > 1:
                 backup_index = random.randint(1, min(4, len(metapop)-1))
                 next_exemplar = metapop[backup_index]
-                print(f" -> Switching focus to rank {backup_index}: {next_exemplar.value[:20]}... (Score: {next_exemplar.score:.4f})")
+                log(f" -> Switching focus to rank {backup_index}: {next_exemplar.value[:20]}... (Score: {next_exemplar.score:.4f})")
             else:
                 next_exemplar = exemplar
 
-    # Recurse with updated state
-    return run_bp_moses(
-        next_exemplar, fitness, hyperparams, target, csv_path, metapop, 
-        iteration=iteration + 1, max_iter=max_iter, 
-        distance=next_distance, max_dist=max_dist, 
-        last_chance=next_last_chance, best_possible_score=best_possible_score
-    )
+    # Advance to the next iteration
+    state.exemplar = next_exemplar
+    state.metapop = metapop
+    state.iteration = iteration + 1
+    state.distance = next_distance
+    state.last_chance = next_last_chance
+    return False
 
 def run_bp_moses_sa(exemplar: Instance, fitness: FitnessOracle, hyperparams: Hyperparams,
                  target: List[bool], csv_path: str, metapop: List[Instance], 
                  iteration: int = 1, max_iter: int = 30, 
                  temperature: float = 1.0, cooling_rate: float = 0.9, 
-                 best_possible_score: float = 1.0) -> List[Instance]:
-    
-    if iteration > max_iter:
-        print("\nMax iterations limit reached...")
-        return _finalize_metapop(metapop)
+                 best_possible_score: float = 1.0,
+                 state: Optional[MosesState] = None,
+                 checkpoint_path: Optional[str] = None, checkpoint_every: int = 1) -> List[Instance]:
+    """
+    Simulated-annealing variant of ``run_bp_moses``: repeats
+    ``bp_moses_sa_step`` until the run terminates (or continues *state*).
+    Checkpoints like ``run_bp_moses``.
+    """
+    if state is None:
+        state = MosesState(exemplar=exemplar, metapop=metapop, iteration=iteration,
+                           max_iter=max_iter, temperature=temperature,
+                           cooling_rate=cooling_rate, best_possible_score=best_possible_score)
+    steps = 0
+    telemetry = get_telemetry()
+    while not state.done:
+        with telemetry.scope(iteration=state.iteration), telemetry.timer("iteration"):
+            bp_moses_sa_step(state, fitness, hyperparams, target, csv_path)
+        steps += 1
+        telemetry.snapshot(strategy="beta_sa", iteration=state.iteration - 1)
+        maybe_checkpoint(checkpoint_path, checkpoint_every, steps, state, fitness, "beta_sa")
+    return state.result
+
+
+def bp_moses_sa_step(state: MosesState, fitness: FitnessOracle, hyperparams: Hyperparams,
+                     target: List[bool], csv_path: str) -> bool:
+    """One iteration of ``run_bp_moses_sa``; returns True once the run is finished."""
+    exemplar = state.exemplar
+    metapop = state.metapop
+    iteration, temperature = state.iteration, state.temperature
+
+    if iteration > state.max_iter:
+        log("\nMax iterations limit reached...")
+        return state.finish(_finalize_metapop(metapop))
     
     if temperature < 1e-5:
-        print("\nSystem has cooled down completely (T ≈ 0). Terminating...")
-        return _finalize_metapop(metapop)
+        log("\nSystem has cooled down completely (T ≈ 0). Terminating...")
+        return state.finish(_finalize_metapop(metapop))
 
-    if exemplar.score >= best_possible_score:
-        print(f"\nTerminating because best possible score ({best_possible_score}) was found!")
-        return _finalize_metapop(metapop)
+    if exemplar.score >= state.best_possible_score:
+        log(f"\nTerminating because best possible score ({state.best_possible_score}) was found!")
+        return state.finish(_finalize_metapop(metapop))
 
-    demes = sample_from_TTable(csv_path, hyperparams, exemplar, exemplar.knobs, target, output_col='O')
-    print(f"\n[Iter {iteration} | Temp {temperature:.4f}] Running Variation for {len(demes)} demes centered on: {exemplar.value}...")
+    demes = sample_from_TTable(csv_path, hyperparams, exemplar, exemplar.knobs, target, output_col='O', fitness=fitness)
+    log(f"\n[Iter {iteration} | Temp {temperature:.4f}] Running Variation for {len(demes)} demes centered on: {exemplar.value}...")
     
-    new_demes = [run_variation(deme, fitness, hyperparams, target) for deme in demes]
+    new_demes = run_demes(run_variation, demes, fitness, hyperparams.deme_workers,
+                          hyperparams=hyperparams, target=target)
 
-    print("\n--- Top Instances from Each Deme ---")
+    log("\n--- Top Instances from Each Deme ---")
     meta_dict = {inst.value: inst for inst in metapop}
     added_count = 0
 
     for i, deme in enumerate(new_demes):
         if not deme.instances: continue
         best_in_deme = max(deme.instances, key=lambda x: x.score)
-        print(f"Deme {i} Best: {best_in_deme.value:<30} | Score: {best_in_deme.score:.4f}")
+        log(f"Deme {i} Best: {best_in_deme.value:<30} | Score: {best_in_deme.score:.4f}")
         
         if best_in_deme.value not in meta_dict or best_in_deme.score > meta_dict[best_in_deme.value].score:
             meta_dict[best_in_deme.value] = best_in_deme
             added_count += 1
 
     metapop = sorted(meta_dict.values(), key=lambda x: x.score, reverse=True)
-    print(f"Merged {added_count} new unique instances. Metapop Size: {len(metapop)}")
+    log(f"Merged {added_count} new unique instances. Metapop Size: {len(metapop)}")
 
     round_bests = [max(deme.instances, key=lambda x: x.score) for deme in new_demes if deme.instances]
     if not round_bests:
-        print("No valid instances generated this round. Cooling and staying in place...")
+        log("No valid instances generated this round. Cooling and staying in place...")
         next_exemplar = exemplar
     else:
         new_best = max(round_bests, key=lambda x: x.score)
@@ -246,7 +408,7 @@ def run_bp_moses_sa(exemplar: Instance, fitness: FitnessOracle, hyperparams: Hyp
         delta_score = new_best.score - exemplar.score
         
         if delta_score > 1e-6:
-            print(f"*** Strict Improvement found! Score: {new_best.score:.4f} (+{delta_score:.4f}) ***")
+            log(f"*** Strict Improvement found! Score: {new_best.score:.4f} (+{delta_score:.4f}) ***")
             next_exemplar = new_best
         
         else:
@@ -254,22 +416,19 @@ def run_bp_moses_sa(exemplar: Instance, fitness: FitnessOracle, hyperparams: Hyp
             random_draw = random.random() + 1e-3
             
             if abs(delta_score) <= 1e-6:
-                print(f"--- SA ACCEPTED sideways move: {new_best.score:.4f} (Score didn't change) ---")
+                log(f"--- SA ACCEPTED sideways move: {new_best.score:.4f} (Score didn't change) ---")
                 next_exemplar = new_best
             
             if random_draw < acceptance_prob:
-                print(f"--- SA ACCEPTED worse solution: {new_best.score:.4f} (Prob: {acceptance_prob:.4f}, Draw: {random_draw:.4f}) ---")
+                log(f"--- SA ACCEPTED worse solution: {new_best.score:.4f} (Prob: {acceptance_prob:.4f}, Draw: {random_draw:.4f}) ---")
                 next_exemplar = new_best
             else:
-                print(f"(!) SA REJECTED worse solution: {new_best.score:.4f} (Prob: {acceptance_prob:.4f}, Draw: {random_draw:.4f})")
-                print(f" -> Staying centered on {exemplar.value} (Score: {exemplar.score:.4f})")
+                log(f"(!) SA REJECTED worse solution: {new_best.score:.4f} (Prob: {acceptance_prob:.4f}, Draw: {random_draw:.4f})")
+                log(f" -> Staying centered on {exemplar.value} (Score: {exemplar.score:.4f})")
                 next_exemplar = exemplar
 
-    next_temperature = temperature * cooling_rate
-
-    return run_bp_moses_sa(
-        next_exemplar, fitness, hyperparams, target, csv_path, metapop, 
-        iteration=iteration + 1, max_iter=max_iter, 
-        temperature=next_temperature, cooling_rate=cooling_rate, 
-        best_possible_score=best_possible_score
-    )
+    state.exemplar = next_exemplar
+    state.metapop = metapop
+    state.iteration = iteration + 1
+    state.temperature = temperature * state.cooling_rate
+    return False
@@ -0,0 +1,99 @@
+import io
+import os
+import pickle
+import random
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from main import run_moses
+from Moses.checkpoint import CHECKPOINT_VERSION, load_checkpoint, save_checkpoint
+from Moses.moses_state import MosesState
+from Moses.run_bp_moses import bp_moses_step
+from Representation.csv_parser import load_truth_table
+from Representation.representation import FitnessOracle, Hyperparams, Instance, knobs_from_truth_table
+from Representation.sampling import REDUCTION_CACHE
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "example_data", "test_parity_3.csv")
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "run.ckpt")
+        self.hp = Hyperparams(mutation_rate=0.3, crossover_rate=0.5, num_generations=2,
+                              neighborhood_size=10, bernoulli_prob=0.6, uniform_prob=0.6)
+        inputs, self.target = load_truth_table(CSV_PATH, output_col='O')
+        self.knobs = [k for k in knobs_from_truth_table(inputs) if k.symbol != 'O']
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _start(self):
+        random.seed(5)
+        fitness = FitnessOracle(self.target)
+        exemplar = Instance(value="(AND)", id=0, score=0.0, knobs=self.knobs)
+        fitness.get_fitness(exemplar)
+        return exemplar, fitness
+
+    def test_round_trip_restores_caches_and_rng(self):
+        exemplar, fitness = self._start()
+        fitness.memo["(OR A B)"] = 0.25
+        REDUCTION_CACHE["(AND (AND A))"] = "(AND A)"
+        state = MosesState(exemplar=exemplar, metapop=[exemplar], iteration=3, distance=2)
+        save_checkpoint(self.path, state, fitness, "beta")
+        expected_draw = random.random()
+
+        REDUCTION_CACHE.pop("(AND (AND A))")
+        random.seed(99)
+        restored = FitnessOracle(self.target)
+        payload = load_checkpoint(self.path, restored)
+
+        self.assertEqual(payload["strategy"], "beta")
+        self.assertEqual((payload["state"].iteration, payload["state"].distance), (3, 2))
+        self.assertEqual(payload["state"].exemplar.value, "(AND)")
+        self.assertEqual(restored.memo["(OR A B)"], 0.25)
+        self.assertEqual(REDUCTION_CACHE["(AND (AND A))"], "(AND A)")
+        self.assertEqual(random.random(), expected_draw)
+        self.assertEqual(os.listdir(self.tmp.name), ["run.ckpt"])
+
+    def test_rejects_other_schema_version(self):
+        with open(self.path, "wb") as f:
+            pickle.dump({"version": CHECKPOINT_VERSION + 1}, f)
+        with self.assertRaises(ValueError):
+            load_checkpoint(self.path)
+
+    def test_resumed_run_matches_uninterrupted_run(self):
+        with redirect_stdout(io.StringIO()):
+            exemplar, fitness = self._start()
+            expected = run_moses(exemplar, fitness, self.hp, self.knobs, self.target, CSV_PATH,
+                                 [exemplar], max_iter=4, fg_type="beta")
+
+            # run two iterations, checkpoint, then resume with a cold oracle
+            exemplar, fitness = self._start()
+            state = MosesState(exemplar=exemplar, metapop=[exemplar], max_iter=4, max_dist=20)
+            for _ in range(2):
+                bp_moses_step(state, fitness, self.hp, self.target, CSV_PATH)
+            save_checkpoint(self.path, state, fitness, "beta")
+
+            cold = FitnessOracle(self.target)
+            resumed = run_moses(None, cold, self.hp, self.knobs, self.target, CSV_PATH, None,
+                                max_iter=4, fg_type="beta",
+                                checkpoint_path=self.path, resume=True)
+
+        self.assertEqual([(i.value, i.score) for i in resumed],
+                         [(i.value, i.score) for i in expected])
+        self.assertTrue(set(fitness.memo) <= set(cold.memo))
+        self.assertTrue(load_checkpoint(self.path)["state"].done)
+
+    def test_resume_rejects_other_strategy(self):
+        exemplar, fitness = self._start()
+        save_checkpoint(self.path, MosesState(exemplar=exemplar, metapop=[exemplar]),
+                        fitness, "alpha")
+        with redirect_stdout(io.StringIO()), self.assertRaises(ValueError):
+            run_moses(exemplar, fitness, self.hp, self.knobs, self.target, CSV_PATH,
+                      [exemplar], fg_type="beta", checkpoint_path=self.path, resume=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import io
+import os
+import random
+import unittest
+from contextlib import redirect_stdout
+
+from Moses.moses_state import MosesState
+from Moses.run_abp_moses import run_abp_moses, abp_moses_step
+from Moses.run_bp_moses import run_bp_moses, bp_moses_step
+from Representation.csv_parser import load_truth_table
+from Representation.representation import FitnessOracle, Hyperparams, Instance, knobs_from_truth_table
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "example_data", "test_parity_3.csv")
+
+
+class TestMosesState(unittest.TestCase):
+    def setUp(self):
+        self.hp = Hyperparams(mutation_rate=0.3, crossover_rate=0.5, num_generations=2,
+                              neighborhood_size=10, bernoulli_prob=0.6, uniform_prob=0.6)
+        inputs, self.target = load_truth_table(CSV_PATH, output_col='O')
+        self.knobs = [k for k in knobs_from_truth_table(inputs) if k.symbol != 'O']
+
+    def _start(self):
+        random.seed(3)
+        fitness = FitnessOracle(self.target)
+        exemplar = Instance(value="(AND)", id=0, score=0.0, knobs=self.knobs)
+        fitness.get_fitness(exemplar)
+        return exemplar, fitness
+
+    @staticmethod
+    def _summary(metapop):
+        return [(inst.value, inst.score) for inst in metapop]
+
+    def test_stepping_beta_matches_full_run(self):
+        with redirect_stdout(io.StringIO()):
+            exemplar, fitness = self._start()
+            expected = run_bp_moses(exemplar, fitness, self.hp, self.target, CSV_PATH,
+                                    [exemplar], max_iter=4)
+
+            exemplar, fitness = self._start()
+            state = MosesState(exemplar=exemplar, metapop=[exemplar], max_iter=4)
+            bp_moses_step(state, fitness, self.hp, self.target, CSV_PATH)
+            self.assertFalse(state.done)
+            self.assertEqual(state.iteration, 2)
+            # resume the paused run through the driver
+            result = run_bp_moses(None, fitness, self.hp, self.target, CSV_PATH, None,
+                                  state=state)
+
+        self.assertTrue(state.done)
+        self.assertEqual(self._summary(result), self._summary(expected))
+
+    def test_stepping_alpha_matches_full_run(self):
+        with redirect_stdout(io.StringIO()):
+            exemplar, fitness = self._start()
+            expected = run_abp_moses(exemplar, fitness, self.hp, self.knobs, self.target,
+                                     CSV_PATH, [exemplar], max_iter=2)
+
+            exemplar, fitness = self._start()
+            state = MosesState(exemplar=exemplar, metapop=[exemplar], max_iter=2)
+            steps = 0
+            while not abp_moses_step(state, fitness, self.hp, self.knobs, self.target, CSV_PATH):
+                steps += 1
+
+        self.assertEqual(steps, 2)
+        self.assertEqual(self._summary(state.result), self._summary(expected))
+
+
+if __name__ == "__main__":
+    unittest.main()
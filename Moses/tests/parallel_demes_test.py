@@ -0,0 +1,100 @@
+import random
+import subprocess
+import sys
+import unittest
+
+from Moses.parallel_demes import get_process_pool, run_demes, shutdown_pools, submit
+from Representation.representation import Deme, FitnessOracle, Hyperparams, Instance, Knob
+from Representation.telemetry import Telemetry, get_telemetry, log, set_telemetry
+
+
+KNOBS = [
+    Knob(symbol="A", id=1, Value=[False, False, True, True]),
+    Knob(symbol="B", id=2, Value=[False, True, False, True]),
+]
+EXPRESSIONS = ["(AND A B)", "(OR A B)", "(AND A)", "(AND B)", "(NOT A)", "(NOT B)"]
+
+
+def pick_and_score(deme, fitness, picks=3):
+    """Toy deme task: draw a few random programs and keep the best."""
+    chosen = [Instance(value=random.choice(EXPRESSIONS), id=0, score=0.0, knobs=KNOBS)
+              for _ in range(picks)]
+    for inst in chosen:
+        fitness.get_fitness(inst)
+    return (deme.id, [inst.value for inst in chosen], max(inst.score for inst in chosen))
+
+
+def chatty_task(deme, fitness):
+    log(f"deme {deme.id}", level=1)
+    return deme.id
+
+
+def worker_verbosity():
+    return get_telemetry().verbosity
+
+
+# Worker processes write to the real stdout, so the run goes in a child process
+SILENT_RUN = """
+from Moses.parallel_demes import run_demes
+from Moses.tests.parallel_demes_test import chatty_task
+from Representation.representation import Deme, FitnessOracle
+from Representation.telemetry import Telemetry, set_telemetry
+set_telemetry(Telemetry(verbosity={verbosity}))
+run_demes(chatty_task, [Deme(instances=[], id=i, q_hyper=None) for i in range(2)],
+          FitnessOracle([False, True]), 2)
+"""
+
+
+class TestRunDemes(unittest.TestCase):
+    def setUp(self):
+        hp = Hyperparams(mutation_rate=0.3, crossover_rate=0.5, num_generations=1,
+                         neighborhood_size=5)
+        self.demes = [Deme(instances=[], id=i, q_hyper=hp) for i in range(4)]
+
+    @classmethod
+    def tearDownClass(cls):
+        shutdown_pools()
+
+    def _run(self, workers):
+        random.seed(7)
+        fitness = FitnessOracle([False, False, False, True])
+        results = run_demes(pick_and_score, self.demes, fitness, workers, picks=3)
+        return results, fitness.memo, random.random()
+
+    def test_sequential_keeps_deme_order(self):
+        results, memo, _ = self._run(0)
+        self.assertEqual([r[0] for r in results], [0, 1, 2, 3])
+        self.assertTrue(memo)
+
+    def test_seeded_results_do_not_depend_on_worker_count(self):
+        inline = self._run(1)
+        pooled = self._run(2)
+        self.assertEqual(inline[0], pooled[0])
+        # parent RNG stream continues identically
+        self.assertEqual(inline[2], pooled[2])
+
+    def test_worker_scores_are_merged_into_memo(self):
+        results, memo, _ = self._run(2)
+        seen = {value for _, values, _ in results for value in values}
+        self.assertEqual(set(memo), seen)
+
+    def test_workers_use_the_parent_verbosity(self):
+        def run(verbosity):
+            return subprocess.run([sys.executable, "-c", SILENT_RUN.format(verbosity=verbosity)],
+                                  capture_output=True, text=True, check=True).stdout
+        self.assertEqual(run(0), "")
+        chatty = run(1)  # the workers' lines may interleave
+        self.assertIn("deme 0", chatty)
+        self.assertIn("deme 1", chatty)
+
+    def test_submit_passes_the_verbosity(self):
+        previous = get_telemetry()
+        set_telemetry(Telemetry(verbosity=0))
+        try:
+            self.assertEqual(submit(get_process_pool(2), worker_verbosity).result(), 0)
+        finally:
+            set_telemetry(previous)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import io
+import os
+import random
+import unittest
+from contextlib import redirect_stdout
+
+from Moses.parallel_demes import shutdown_pools
+from Moses.run_bp_moses import run_variation
+from Representation.csv_parser import load_truth_table
+from Representation.representation import (Deme, FitnessOracle, Hyperparams, Instance,
+                                           knobs_from_truth_table)
+from Representation.sampling import REDUCTION_CACHE
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "example_data", "test_parity_3.csv")
+
+
+class TestPipelinedVariation(unittest.TestCase):
+    def setUp(self):
+        inputs, self.target = load_truth_table(CSV_PATH, output_col='O')
+        self.knobs = [k for k in knobs_from_truth_table(inputs) if k.symbol != 'O']
+
+    @classmethod
+    def tearDownClass(cls):
+        shutdown_pools()
+
+    def _deme(self, hp):
+        seeds = ["(AND A B)", "(AND A B C)", "(AND A C)", "(AND (NOT C) A)",
+                 "(AND B C)", "(AND A B (NOT C))", "(OR A B)", "(AND (NOT A) B C)"]
+        instances = [Instance(value=v, id=i, score=0.0, knobs=list(self.knobs))
+                     for i, v in enumerate(seeds)]
+        return Deme(instances=instances, id=0, q_hyper=hp)
+
+    def test_pipelined_deme_is_reduced_scored_and_unique(self):
+        hp = Hyperparams(mutation_rate=0.3, crossover_rate=0.5, num_generations=4,
+                         neighborhood_size=10, pipeline_staleness=2, reduce_workers=2)
+        fitness = FitnessOracle(self.target)
+        deme = self._deme(hp)
+        for inst in deme.instances:
+            fitness.get_fitness(inst)
+
+        random.seed(11)
+        with redirect_stdout(io.StringIO()):
+            deme = run_variation(deme, fitness, hp, self.target)
+
+        values = [inst.value for inst in deme.instances]
+        self.assertEqual(len(values), len(set(values)))
+        self.assertGreater(len(values), 8)
+
+        # every submitted program came back through the reduction cache
+        self.assertTrue(REDUCTION_CACHE)
+        fresh = FitnessOracle(self.target)
+        for inst in deme.instances[8:]:
+            probe = Instance(value=inst.value, id=0, score=0.0, knobs=list(self.knobs))
+            self.assertEqual(fresh.get_fitness(probe), inst.score)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+"""
+Binary truth-table format (``.mbt``) for fast startup.
+
+Converting a CSV / TSV / pipe-separated file once with
+:func:`convert_to_binary` replaces the per-run text parsing by a
+memory map: opening a converted table only reads its header.
+
+Layout (little endian):
+
+    8 bytes    magic b"MOSESBT1"
+    8 bytes    data offset (start of the packed columns, 64-byte aligned)
+    8 bytes    row count
+    4 bytes    rows per block (``chunk_rows``)
+    32 bytes   SHA-256 content hash
+    4 bytes    length of the JSON metadata
+    ...        JSON metadata: {"columns": [...], "target_col": "O"}
+    ...        packed blocks, as written by ``stream_truth_table``
+
+The content hash covers the metadata, the packed blocks and the row count.
+It identifies the table's content, whatever the file is called, and keys the
+shared score caches (``FitnessOracle.from_packed``) and the mRMR cache
+(``extract_features``).
+"""
+
+import csv
+import hashlib
+import json
+import os
+import struct
+from typing import Dict, Optional, Tuple
+
+from Representation.file_parser import detect_delimiter
+from Representation.packed_table import PackedTable, column_order, write_blocks
+
+MAGIC = b"MOSESBT1"
+EXTENSION = ".mbt"
+_HEADER = struct.Struct("<8sQQI32sI")
+_ALIGN = 64
+
+# (path, size, mtime) -> SHA-256 of a text file, see dataset_hash
+_TEXT_HASHES: Dict[Tuple[str, int, float], str] = {}
+
+
+class _HashingWriter:
+    def __init__(self, out, hasher):
+        self.out = out
+        self.hasher = hasher
+
+    def write(self, data: bytes) -> None:
+        self.hasher.update(data)
+        self.out.write(data)
+
+
+def convert_to_binary(src: str, dst: Optional[str] = None, output_col: str = 'O',
+                      delimiter: Optional[str] = None, chunk_rows: int = 65536) -> str:
+    """
+    Converts a delimited truth table into the binary format, streaming
+    *chunk_rows* rows at a time.
+
+    Args:
+        src: CSV / TSV / pipe-separated file.
+        dst: Output path (default: *src* + ".mbt").
+        output_col: Name of the target column.
+        delimiter: Field delimiter (auto-detected as in ``parse_file`` if None).
+        chunk_rows: Rows per block; rounded up to a multiple of 8.
+    Returns:
+        The path of the binary file.
+    """
+    if dst is None:
+        dst = src + EXTENSION
+    if delimiter is None:
+        delimiter = detect_delimiter(src)
+    chunk_rows = max(8, -(-chunk_rows // 8) * 8)
+
+    tmp = dst + ".tmp"
+    with open(src, mode='r', encoding='utf-8-sig', newline='') as f, open(tmp, 'wb') as out:
+        reader = csv.reader(f, delimiter=delimiter)
+        columns, order = column_order(next(reader, []), output_col, src)
+        meta = json.dumps({"columns": columns, "target_col": output_col}).encode('utf-8')
+        data_offset = -(-(_HEADER.size + len(meta)) // _ALIGN) * _ALIGN
+
+        out.write(b"\0" * data_offset)
+        hasher = hashlib.sha256(meta)
+        row_count = write_blocks(reader, order, chunk_rows, _HashingWriter(out, hasher))
+        hasher.update(str(row_count).encode('ascii'))
+
+        out.seek(0)
+        out.write(_HEADER.pack(MAGIC, data_offset, row_count, chunk_rows, hasher.digest(), len(meta)))
+        out.write(meta)
+    os.replace(tmp, dst)
+    return dst
+
+
+def read_header(path: str) -> Optional[dict]:
+    """Header fields of a binary dataset, or None if *path* is not one."""
+    try:
+        with open(path, 'rb') as f:
+            fixed = f.read(_HEADER.size)
+            if len(fixed) < _HEADER.size or not fixed.startswith(MAGIC):
+                return None
+            _, data_offset, row_count, chunk_rows, digest, meta_len = _HEADER.unpack(fixed)
+            meta = json.loads(f.read(meta_len).decode('utf-8'))
+    except OSError:
+        return None
+    return {
+        "columns": meta["columns"],
+        "target_col": meta["target_col"],
+        "row_count": row_count,
+        "chunk_rows": chunk_rows,
+        "data_offset": data_offset,
+        "content_hash": digest.hex(),
+    }
+
+
+def is_binary_dataset(path: str) -> bool:
+    return read_header(path) is not None
+
+
+def open_binary(path: str) -> PackedTable:
+    """Memory-maps a binary dataset; only the header is read."""
+    header = read_header(path)
+    if header is None:
+        raise ValueError(f"{path} is not a binary truth table")
+    return PackedTable.open(path, header["columns"], header["target_col"], header["row_count"],
+                            header["chunk_rows"], header["data_offset"], header["content_hash"])
+
+
+def load_dataset(path: str, output_col: str = 'O', delimiter: Optional[str] = None,
+                 chunk_rows: int = 65536) -> PackedTable:
+    """
+    Opens *path* as a packed table.  A text file is converted once to
+    *path* + ".mbt"; later calls reuse that file while it is newer than
+    the source and has the same target column.
+    """
+    if is_binary_dataset(path):
+        table = open_binary(path)
+    else:
+        cached = path + EXTENSION
+        header = read_header(cached)
+        if (header is None or header["target_col"] != output_col
+                or os.path.getmtime(cached) < os.path.getmtime(path)):
+            convert_to_binary(path, cached, output_col, delimiter, chunk_rows)
+        table = open_binary(cached)
+    if table.target_col != output_col:
+        raise ValueError(f"{path} has target column '{table.target_col}', not '{output_col}'")
+    return table
+
+
+def dataset_hash(path: str) -> str:
+    """
+    Content hash of a dataset: the stored hash of a binary dataset, or the
+    SHA-256 of a text file (computed once per file version).
+    """
+    header = read_header(path)
+    if header is not None:
+        return header["content_hash"]
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime)
+    if key not in _TEXT_HASHES:
+        hasher = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                hasher.update(block)
+        _TEXT_HASHES[key] = hasher.hexdigest()
+    return _TEXT_HASHES[key]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert a truth table to the binary .mbt format.")
+    parser.add_argument("src", help="CSV / TSV / pipe-separated truth table")
+    parser.add_argument("dst", nargs="?", default=None, help="output path (default: SRC.mbt)")
+    parser.add_argument("--output-col", default="O", help="target column (default: O)")
+    parser.add_argument("--delimiter", default=None, help="field delimiter (default: from the suffix)")
+    parser.add_argument("--chunk-rows", type=int, default=65536, help="rows per block")
+    args = parser.parse_args()
+
+    out = convert_to_binary(args.src, args.dst, args.output_col, args.delimiter, args.chunk_rows)
+    header = read_header(out)
+    print(f"{out}: {header['row_count']} rows, {len(header['columns'])} inputs, "
+          f"hash {header['content_hash'][:16]}")
@@ -7,9 +7,22 @@ def load_truth_table(filepath, output_col='O'):
     Reads a CSV file where the first row is headers (A, B, C...)
     and subsequent rows are truth values (0/1, T/F, True/False).
     
+    Binary datasets (Representation/binary_dataset.py) are read as well.
+
     Returns: A list of dictionaries, e.g., [{'A': True, 'B': False}, ...]
       and a list of target values for the output column e.g. [True, False, ...].
     """
+    from Representation.binary_dataset import is_binary_dataset, open_binary
+
+    if is_binary_dataset(filepath):
+        table = open_binary(filepath)
+        if table.target_col != output_col:
+            print(f"Error: {filepath} has target column '{table.target_col}', not '{output_col}'.")
+            return [], []
+        columns = [table.column(name) for name in table.columns]
+        data_rows = [dict(zip(table.columns, values)) for values in zip(*columns)]
+        return data_rows, table.target()
+
     data_rows = []
     output_values = []    
     try:
@@ -37,3 +50,40 @@ def load_truth_table(filepath, output_col='O'):
         return [], []
 
     return data_rows, output_values
+
+
+def collapse_truth_table(data_rows, output_values):
+    """
+    Collapses identical input rows into unique patterns.
+
+    Returns: (patterns, pos_counts, neg_counts) where patterns are the
+      distinct row dicts in order of first appearance and pos_counts /
+      neg_counts count the True / False targets seen with each of them.
+    """
+    index = {}
+    patterns, pos_counts, neg_counts = [], [], []
+    for row, target in zip(data_rows, output_values):
+        key = tuple(row.values())
+        i = index.get(key)
+        if i is None:
+            i = index[key] = len(patterns)
+            patterns.append(row)
+            pos_counts.append(0)
+            neg_counts.append(0)
+        if target:
+            pos_counts[i] += 1
+        else:
+            neg_counts[i] += 1
+    return patterns, pos_counts, neg_counts
+
+
+def load_collapsed_truth_table(filepath, output_col='O'):
+    """
+    ``load_truth_table`` followed by ``collapse_truth_table``.
+
+    Returns: (patterns, pos_counts, neg_counts); build the oracle with
+      ``FitnessOracle.from_counts(pos_counts, neg_counts)`` and the knobs
+      with ``knobs_from_truth_table(patterns)``.
+    """
+    data_rows, output_values = load_truth_table(filepath, output_col)
+    return collapse_truth_table(data_rows, output_values)
@@ -23,6 +23,20 @@ def _parse_value(value):
             return value.strip()
 
 
+def detect_delimiter(filepath):
+    """
+    Delimiter used for *filepath* when none is given: ',' for .csv, '|' for
+    .psv, tab otherwise.  (``parse_file`` read .psv files with a tab before
+    this function existed.)
+    """
+    suffix = Path(filepath).suffix.lower()
+    if suffix == '.csv':
+        return ','
+    if suffix == '.psv':
+        return '|'
+    return '\t'
+
+
 def parse_file(filepath, delimiter=None, output_col='O'):
     """
     Parse CSV or table file with automatic delimiter detection.
@@ -42,7 +56,7 @@ def parse_file(filepath, delimiter=None, output_col='O'):
         return [], []
     
     if delimiter is None:
-        delimiter = ',' if path.suffix.lower() == '.csv' else '\t'
+        delimiter = detect_delimiter(path)
     
     data_rows = []
     output_values = []
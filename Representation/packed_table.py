@@ -0,0 +1,342 @@
+"""
+Packed, memory-mapped truth tables for datasets larger than memory.
+
+``stream_truth_table`` reads a delimited file ``chunk_rows`` rows at a
+time and writes every block straight to disk as packed column bitsets
+(8 rows per byte, ``numpy.packbits`` order).  The returned
+:class:`PackedTable` memory-maps that file, so fitness, entropy and
+information gain are computed block by block and only one block is
+decoded at a time.
+
+Bits file layout: one block per ``chunk_rows`` rows; inside a block one
+run of ``chunk_rows / 8`` bytes per input column (header order) followed
+by the target column.  The last block is zero padded.
+
+Cells are read as in ``load_truth_table`` ('1', 'TRUE', 'T', 'YES' are
+true, case-insensitive, everything else false) and the delimiter defaults
+to the one ``parse_file`` would use.
+"""
+
+import csv
+import math
+import os
+import random
+import tempfile
+import weakref
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from Representation.file_parser import detect_delimiter
+from Representation.representation import FitnessOracle, Knob
+
+TRUE_TOKENS = ('1', 'TRUE', 'T', 'YES')
+
+# Number of set bits of every byte value
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.int64)
+
+
+def popcount(bits: np.ndarray) -> int:
+    """Number of set bits in a packed uint8 array."""
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(bits).sum(dtype=np.int64))
+    return int(_POPCOUNT[bits].sum())
+
+
+def popcount_rows(bits: np.ndarray) -> np.ndarray:
+    """Number of set bits in every row of a 2-D packed uint8 array."""
+    if hasattr(np, "bitwise_count"):  # numpy >= 2.0
+        return np.bitwise_count(bits).sum(axis=1, dtype=np.int64)
+    return _POPCOUNT[bits].sum(axis=1)
+
+
+class PackedTable:
+    def __init__(self, columns: Sequence[str], target_col: str, row_count: int,
+                 chunk_rows: int, bits: np.ndarray, path: Optional[str] = None,
+                 offset: int = 0, content_hash: Optional[str] = None):
+        """
+        *bits* has shape ``(blocks, len(columns) + 1, chunk_rows // 8)``;
+        the target is the last column of every block.  *content_hash* is
+        set for binary datasets (see binary_dataset.py).
+        """
+        self.columns = list(columns)
+        self.target_col = target_col
+        self.row_count = row_count
+        self.chunk_rows = chunk_rows
+        self.bits = bits
+        self.path = path
+        self.offset = offset
+        self.content_hash = content_hash
+        self._index = {name: i for i, name in enumerate(self.columns)}
+        self._index[target_col] = len(self.columns)
+        # Deletes *path* on close() / garbage collection when the table owns it
+        self._cleanup = None
+
+    @classmethod
+    def open(cls, path: str, columns: Sequence[str], target_col: str, row_count: int,
+             chunk_rows: int, offset: int = 0, content_hash: Optional[str] = None) -> "PackedTable":
+        """Memory-map a bits file (read-only) starting *offset* bytes into *path*."""
+        blocks = math.ceil(row_count / chunk_rows)
+        shape = (blocks, len(columns) + 1, chunk_rows // 8)
+        if blocks == 0:
+            bits = np.zeros(shape, dtype=np.uint8)
+        else:
+            bits = np.memmap(path, dtype=np.uint8, mode='r', offset=offset, shape=shape)
+        return cls(columns, target_col, row_count, chunk_rows, bits, path, offset, content_hash)
+
+    def __getstate__(self):
+        # Memory-mapped tables travel to worker processes as their path, not their bits;
+        # copies never own (and delete) the file
+        state = self.__dict__.copy()
+        state["_cleanup"] = None
+        if isinstance(self.bits, np.memmap):
+            state["bits"] = None
+        return state
+
+    def _own_file(self) -> None:
+        """Make the table delete its bits file when closed or garbage collected."""
+        self._cleanup = weakref.finalize(self, _remove_file, self.path)
+
+    def close(self) -> None:
+        """Releases the memory map; deletes the bits file if the table owns it."""
+        self.bits = np.zeros((0, len(self.columns) + 1, self.chunk_rows // 8), dtype=np.uint8)
+        if self._cleanup is not None:
+            self._cleanup()
+
+    def __enter__(self) -> "PackedTable":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.bits is None:
+            self.bits = PackedTable.open(self.path, self.columns, self.target_col, self.row_count,
+                                         self.chunk_rows, self.offset).bits
+
+    # ------------------------------------------------------------------
+    # Blocks and columns
+    # ------------------------------------------------------------------
+
+    def blocks(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Yields ``(block, mask)``: the packed block and the packed mask of its real rows."""
+        full = np.full(self.chunk_rows // 8, 0xFF, dtype=np.uint8)
+        for b in range(self.bits.shape[0]):
+            rows = min(self.chunk_rows, self.row_count - b * self.chunk_rows)
+            mask = full if rows == self.chunk_rows else np.packbits(np.arange(self.chunk_rows) < rows)
+            yield self.bits[b], mask
+
+    def column(self, name: str) -> List[bool]:
+        """One whole column as a list of bools (the target for ``target_col``)."""
+        i = self._index[name]
+        values = np.unpackbits(np.ascontiguousarray(self.bits[:, i, :]), axis=1).reshape(-1)
+        return values[:self.row_count].astype(bool).tolist()
+
+    def target(self) -> List[bool]:
+        return self.column(self.target_col)
+
+    def sample(self, rows: int, seed: int = 0) -> "PackedTable":
+        """In-memory table of *rows* rows drawn uniformly without replacement (order kept)."""
+        rows = min(rows, self.row_count)
+        picked = sorted(random.Random(seed).sample(range(self.row_count), rows))
+        values = np.zeros((len(self.columns) + 1, max(8, -(-rows // 8) * 8)), dtype=bool)
+        done = 0
+        for b, (block, _) in enumerate(self.blocks()):
+            start = b * self.chunk_rows
+            local = [i - start for i in picked[done:] if i < start + self.chunk_rows]
+            if local:
+                values[:, done:done + len(local)] = np.unpackbits(block, axis=1)[:, local]
+                done += len(local)
+        bits = np.packbits(values, axis=1)[None, :, :]
+        return PackedTable(self.columns, self.target_col, rows, values.shape[1], bits)
+
+    def knobs(self) -> List[Knob]:
+        """Knobs (unpacked columns) for the in-memory MOSES pipeline."""
+        return [Knob(symbol=name, id=idx, Value=self.column(name))
+                for idx, name in enumerate(self.columns, start=1)]
+
+    # ------------------------------------------------------------------
+    # Chunk-wise computations
+    # ------------------------------------------------------------------
+
+    def _evaluate(self, node, block: np.ndarray) -> np.ndarray:
+        """Packed values of a parsed expression on one block (``FitnessOracle._evaluate_shared`` semantics)."""
+        if isinstance(node, tuple):
+            op, children = node
+            if op == 'NOT':
+                if not children:
+                    return np.zeros(block.shape[1], dtype=np.uint8)
+                return ~self._evaluate(children[0], block)
+            if op not in ('AND', 'OR'):
+                return np.zeros(block.shape[1], dtype=np.uint8)
+            if not children:
+                return np.full(block.shape[1], 0xFF if op == 'AND' else 0, dtype=np.uint8)
+            res = self._evaluate(children[0], block)
+            for child in children[1:]:
+                other = self._evaluate(child, block)
+                res = res & other if op == 'AND' else res | other
+            return res
+        i = self._index.get(node)
+        if i is not None and i < len(self.columns):
+            return block[i]
+        return np.full(block.shape[1], 0xFF if node == 'True' else 0, dtype=np.uint8)
+
+    def score(self, expression: str) -> float:
+        """Accuracy of *expression* on the table, evaluated block by block."""
+        if self.row_count == 0:
+            return 0.0
+        tree = FitnessOracle._parse_expression(expression)
+        matches = 0
+        for block, mask in self.blocks():
+            predicted = self._evaluate(tree, block)
+            matches += popcount(~(predicted ^ block[-1]) & mask)
+        return matches / self.row_count
+
+    def state_counts(self, names: Sequence[str]) -> Dict[Tuple[bool, ...], int]:
+        """Number of rows in every joint state of the columns *names*."""
+        indices = [self._index[name] for name in names]
+        counts: Dict[Tuple[bool, ...], int] = {}
+        for b, (block, _) in enumerate(self.blocks()):
+            rows = min(self.chunk_rows, self.row_count - b * self.chunk_rows)
+            values = np.unpackbits(block[indices], axis=1)[:, :rows]
+            states, state_rows = np.unique(values, axis=1, return_counts=True)
+            for state, n in zip(states.T, state_rows):
+                key = tuple(bool(v) for v in state)
+                counts[key] = counts.get(key, 0) + int(n)
+        return counts
+
+    def joint_entropy(self, names: Sequence[str]) -> float:
+        """H(names) in bits; include ``target_col`` in *names* for joints with the target."""
+        if self.row_count == 0 or not names:
+            return 0.0
+        entropy = 0.0
+        for count in self.state_counts(names).values():
+            p = count / self.row_count
+            entropy -= p * math.log2(p)
+        return entropy
+
+    def information_gain(self, name: str) -> float:
+        """IG(target, name) = H(T) - H(T | name), from popcounts of the packed columns."""
+        if self.row_count == 0:
+            return 0.0
+        i = self._index[name]
+        n_feature = n_target = n_both = 0
+        for block, mask in self.blocks():
+            feature, target = block[i] & mask, block[-1] & mask
+            n_feature += popcount(feature)
+            n_target += popcount(target)
+            n_both += popcount(feature & target)
+        return information_gain_from_counts(self.row_count, n_feature, n_target, n_both)
+
+
+def _entropy(counts: Sequence[int], total: int) -> float:
+    return -sum(c / total * math.log2(c / total) for c in counts if c)
+
+
+def information_gain_from_counts(rows: int, n_feature: int, n_target: int, n_both: int) -> float:
+    """IG of a feature from row counts: rows with feature set, target set, and both."""
+    if rows == 0:
+        return 0.0
+    n_true, n_false = n_feature, rows - n_feature
+    conditional = 0.0
+    if n_true:
+        conditional += n_true / rows * _entropy((n_both, n_true - n_both), n_true)
+    if n_false:
+        t_false = n_target - n_both
+        conditional += n_false / rows * _entropy((t_false, n_false - t_false), n_false)
+    return _entropy((n_target, rows - n_target), rows) - conditional
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def stream_truth_table(filepath: str, output_col: str = 'O', out_path: Optional[str] = None,
+                       delimiter: Optional[str] = None, chunk_rows: int = 65536,
+                       skip_short: bool = False) -> Optional[PackedTable]:
+    """
+    Converts a delimited truth table into a memory-mapped :class:`PackedTable`
+    without holding more than *chunk_rows* rows in memory.
+
+    Args:
+        filepath: Path to the CSV / table file.
+        output_col: Name of the target column.
+        out_path: Where to write the bits file.  By default a temporary file,
+            owned by the returned table: it is deleted by ``table.close()``
+            (or ``with`` block) or when the table is garbage collected.
+        delimiter: Field delimiter (auto-detected as in ``parse_file`` if None).
+        chunk_rows: Rows per block; rounded up to a multiple of 8.
+        skip_short: Drop rows with fewer cells than the header instead of
+            padding them with false cells.
+    Returns:
+        The packed table, or None if *filepath* does not exist.
+    """
+    if not os.path.exists(filepath):
+        print(f"Error: File {filepath} not found.")
+        return None
+    if delimiter is None:
+        delimiter = detect_delimiter(filepath)
+    chunk_rows = max(8, -(-chunk_rows // 8) * 8)
+    temporary = out_path is None
+    if temporary:
+        fd, out_path = tempfile.mkstemp(suffix='.bits')
+        os.close(fd)
+
+    try:
+        with open(filepath, mode='r', encoding='utf-8-sig', newline='') as f, open(out_path, 'wb') as out:
+            reader = csv.reader(f, delimiter=delimiter)
+            columns, order = column_order(next(reader, []), output_col, filepath)
+            row_count = write_blocks(reader, order, chunk_rows, out, skip_short)
+    except BaseException:
+        if temporary:
+            _remove_file(out_path)
+        raise
+
+    table = PackedTable.open(out_path, columns, output_col, row_count, chunk_rows)
+    if temporary:
+        table._own_file()
+    return table
+
+
+def column_order(header: List[str], output_col: str, filepath: str) -> Tuple[List[str], List[int]]:
+    """Input column names and the cell order of a packed block (inputs, then the target)."""
+    if output_col not in header:
+        raise ValueError(f"Target column '{output_col}' not found in {filepath}")
+    target_index = header.index(output_col)
+    columns = [name for name in header if name != output_col]
+    order = [i for i in range(len(header)) if i != target_index] + [target_index]
+    return columns, order
+
+
+def write_blocks(reader, order: List[int], chunk_rows: int, out, skip_short: bool = False) -> int:
+    """
+    Packs rows from *reader* (cells in file order) block by block and
+    passes every block to ``out.write``; returns the row count.  Every
+    block but the last holds exactly *chunk_rows* rows.  Rows with fewer
+    cells than the header are padded with false cells, or dropped with
+    *skip_short*.
+    """
+    row_count = 0
+    width = len(order)
+    truth: Dict[str, bool] = {}  # distinct cell text -> value, so each is parsed once
+    # Blank lines are skipped (as csv.DictReader does); extra cells are ignored
+    rows = (row if len(row) == width else row[:width] + [''] * (width - len(row))
+            for row in reader if row and (len(row) >= width or not skip_short))
+    while True:
+        chunk = list(islice(rows, chunk_rows))
+        if not chunk:
+            break
+        cells = [cell for row in chunk for cell in row]
+        for cell in set(cells).difference(truth):
+            truth[cell] = cell.strip().upper() in TRUE_TOKENS
+        values = np.fromiter(map(truth.__getitem__, cells), dtype=bool, count=len(cells))
+        block = np.zeros((width, chunk_rows), dtype=bool)
+        block[:, :len(chunk)] = values.reshape(len(chunk), width)[:, order].T
+        out.write(np.packbits(block, axis=1).tobytes())
+        row_count += len(chunk)
+    return row_count
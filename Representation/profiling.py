@@ -0,0 +1,147 @@
+"""
+Opt-in profiling of MOSES pipeline stages.
+
+A :class:`ProfileConfig` passed to ``run_moses(profile=...)`` hooks a
+:class:`StageProfiler` into the telemetry stage timers, so any stage that
+already has a timer can be profiled without editing code:
+
+    run          the whole ``run_moses`` call
+    iteration    one MOSES iteration (``bp_moses_step`` / ``abp_moses_step``)
+    deme         one deme (``run_variation`` in beta, ``run_deme_eda`` in alpha)
+    sampling, mrmr, reduction, fitness, mining, propagation, variation
+
+Two modes:
+
+    cprofile  deterministic cProfile; writes ``<stage>.pstats``
+    sampling  a background thread samples the main thread's stack every
+              ``interval`` seconds; writes ``<stage>.collapsed`` (one
+              ``frame;frame;frame count`` line per stack, the input format
+              of flamegraph.pl / speedscope).  Much lower overhead.
+
+Profiles are exclusive: while a nested selected stage runs (e.g. "mrmr"
+inside "sampling"), its time is charged to the inner stage only.  Every
+entry of a stage is accumulated into the same output file.
+
+``iterations`` / ``demes`` restrict profiling to stages entered while that
+iteration or deme is running ("run" is outside any iteration, so it is
+skipped when either filter is set).  Demes executed in worker processes
+(``deme_workers`` > 1) are not profiled.
+"""
+
+import cProfile
+import os
+import sys
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Set
+
+
+@dataclass
+class ProfileConfig:
+    stages: Sequence[str] = ("run",)
+    mode: str = "cprofile"             # "cprofile" or "sampling"
+    output_dir: str = "profiles"
+    iterations: Optional[Set[int]] = None
+    demes: Optional[Set[int]] = None
+    interval: float = 0.005            # seconds between samples (sampling mode)
+
+
+class StageProfiler:
+    def __init__(self, config: ProfileConfig):
+        if config.mode not in ("cprofile", "sampling"):
+            raise ValueError(f"Unknown profiling mode '{config.mode}'")
+        self.config = config
+        self.stages = set(config.stages)
+        self._stack: List[Optional[str]] = []
+        self._profiles: Dict[str, cProfile.Profile] = {}
+        self._samples: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Hooks called by Telemetry.timer
+    # ------------------------------------------------------------------
+
+    def _selected(self, stage: str, context: dict) -> bool:
+        if stage not in self.stages:
+            return False
+        for key, wanted in (("iteration", self.config.iterations), ("deme", self.config.demes)):
+            if wanted is not None and context.get(key) not in wanted:
+                return False
+        return True
+
+    def enter(self, stage: str, context: dict) -> None:
+        if not self._selected(stage, context):
+            # Keep the stack balanced; unselected stages stay charged to the outer one.
+            self._stack.append(self._stack[-1] if self._stack else None)
+            return
+        if self.config.mode == "cprofile":
+            if self._stack and self._stack[-1] is not None:
+                self._profiles[self._stack[-1]].disable()
+            self._profiles.setdefault(stage, cProfile.Profile()).enable()
+        elif self._sampler is None:
+            self._start_sampler()
+        self._stack.append(stage)
+
+    def exit(self, stage: str) -> None:
+        current = self._stack.pop()
+        if self.config.mode != "cprofile" or current is None:
+            return
+        outer = self._stack[-1] if self._stack else None
+        if current == outer:
+            return
+        self._profiles[current].disable()
+        if outer is not None:
+            self._profiles[outer].enable()
+
+    # ------------------------------------------------------------------
+    # Sampling mode
+    # ------------------------------------------------------------------
+
+    def _start_sampler(self) -> None:
+        thread_id = threading.get_ident()
+        self._sampler = threading.Thread(target=self._sample_loop, args=(thread_id,),
+                                         name="moses-profiler", daemon=True)
+        self._sampler.start()
+
+    def _sample_loop(self, thread_id: int) -> None:
+        while not self._stop.wait(self.config.interval):
+            stage = self._stack[-1] if self._stack else None
+            frame = sys._current_frames().get(thread_id)
+            if stage is None or frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self._samples[stage][";".join(reversed(names))] += 1
+
+    # ------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------
+
+    def close(self) -> List[str]:
+        """Stop profiling, write one file per profiled stage and return the paths."""
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = None
+        for profile in self._profiles.values():
+            profile.disable()
+        self._stack.clear()
+
+        os.makedirs(self.config.output_dir, exist_ok=True)
+        paths = []
+        for stage, profile in self._profiles.items():
+            path = os.path.join(self.config.output_dir, f"{stage}.pstats")
+            profile.dump_stats(path)
+            paths.append(path)
+        for stage, stacks in self._samples.items():
+            path = os.path.join(self.config.output_dir, f"{stage}.collapsed")
+            with open(path, "w") as f:
+                for stack, count in sorted(stacks.items()):
+                    f.write(f"{stack} {count}\n")
+            paths.append(path)
+        return sorted(paths)
@@ -0,0 +1,188 @@
+"""
+Racing fitness evaluation for large truth tables.
+
+Ranking candidates does not need exact accuracy for all of them.  A
+:class:`RacingEvaluator` scores candidates on growing prefixes of one
+stratified row order (every prefix has about the table's share of true
+targets), and after each round drops every candidate whose upper
+confidence bound is below the k-th best lower bound.  Only the survivors
+are scored on the whole table, so the top-k it returns carries exact
+scores (they also go to ``fitness.memo``).
+
+Bounds (``bound=``), with the per-comparison risk ``delta`` split over all
+candidates and rounds (union bound):
+
+    hoeffding   sqrt(ln(2/d) / 2m)
+    bernstein   sqrt(2 v ln(3/d) / m) + 3 ln(3/d) / m    (v: sample variance)
+
+Candidates dropped from the race keep an estimate as score: their sample
+accuracy, capped just below the k-th exact score, so sorting by score
+still puts the returned top-k first.  Progress is kept per program, so
+racing the same program again continues from the rows already seen
+(until ``retain`` drops programs that left the deme).
+"""
+
+import math
+import operator
+import random
+from typing import Dict, List, Optional, Tuple
+
+from Representation.representation import FitnessOracle, Hyperparams, Instance
+from Representation.telemetry import get_telemetry
+
+
+def check_racing_config(hyperparams: Hyperparams, fitness: Optional[FitnessOracle] = None) -> None:
+    """
+    Rejects settings that cannot be combined with racing
+    (``hyperparams.racing_delta > 0``), so a run fails when it is
+    configured rather than in the middle of a deme.
+    """
+    if getattr(hyperparams, 'racing_delta', 0.0) <= 0:
+        return
+    if fitness is not None and fitness.weighted:
+        raise ValueError("Racing needs one row per sample; racing_delta cannot be used "
+                         "with a weighted (collapsed) fitness oracle")
+    if fitness is not None and fitness.packed is not None:
+        raise ValueError("Racing evaluates the knob columns; racing_delta cannot be used "
+                         "with a packed fitness oracle")
+    if getattr(hyperparams, 'fitness_block_size', 0) > 0:
+        raise ValueError("racing_delta and fitness_block_size are exclusive: "
+                         "racing already stops scoring hopeless candidates early")
+
+
+def stratified_order(target: List[bool], seed: int = 0) -> List[int]:
+    """Row indices in random order such that every prefix is stratified by target value."""
+    rng = random.Random(seed)
+    keyed = []
+    for label in (True, False):
+        rows = [i for i, t in enumerate(target) if bool(t) == label]
+        rng.shuffle(rows)
+        count = len(rows)
+        keyed.extend(((rank + rng.random()) / count, i) for rank, i in enumerate(rows))
+    keyed.sort()
+    return [i for _, i in keyed]
+
+
+class RacingEvaluator:
+    def __init__(self, fitness: FitnessOracle, delta: float = 0.05, initial_rows: int = 256,
+                 growth: float = 2.0, bound: str = "hoeffding", seed: int = 0):
+        if bound not in ("hoeffding", "bernstein"):
+            raise ValueError(f"Unknown bound '{bound}'")
+        if fitness.weighted:
+            raise ValueError("Racing needs one row per sample; expand weighted tables first")
+        if fitness.packed is not None:
+            raise ValueError("Racing evaluates the knob columns; packed oracles are scored exactly")
+        self.fitness = fitness
+        self.delta = delta
+        self.initial_rows = max(1, initial_rows)
+        self.growth = max(growth, 1.01)
+        self.bound = bound
+        self.order = stratified_order(fitness.target_vals, seed)
+        self.target = [fitness.target_vals[i] for i in self.order]
+        self.row_count = len(self.target)
+        self.progress: Dict[str, Tuple[int, int]] = {}  # program -> (rows seen, matches)
+        self._columns: Dict[int, Tuple[list, list]] = {}
+
+    # ------------------------------------------------------------------
+    # Evaluation on row prefixes
+    # ------------------------------------------------------------------
+
+    def _inputs(self, inst: Instance) -> dict:
+        inputs = {}
+        for knob in inst.knobs:
+            cached = self._columns.get(id(knob.Value))
+            if cached is None or cached[0] is not knob.Value:
+                cached = (knob.Value, [knob.Value[i] for i in self.order])
+                self._columns[id(knob.Value)] = cached
+            inputs[knob.symbol] = cached[1]
+        return inputs
+
+    def retain(self, values) -> None:
+        """Forgets the partial progress of every program not in *values* (e.g. the deme)."""
+        keep = set(values)
+        self.progress = {value: seen for value, seen in self.progress.items() if value in keep}
+
+    def _advance(self, inst: Instance, rows: int) -> Tuple[int, int]:
+        """Extend the evaluation of *inst* to the first *rows* rows of the order."""
+        if inst.value in self.fitness.memo:
+            return self.row_count, round(self.fitness.memo[inst.value] * self.row_count)
+        seen, matches = self.progress.get(inst.value, (0, 0))
+        if seen >= rows:
+            return seen, matches
+        try:
+            tree = self.fitness._parse_expression(inst.value)
+        except Exception:
+            score = self.fitness.get_fitness(inst)
+            return self.row_count, round(score * self.row_count)
+        telemetry = get_telemetry()
+        with telemetry.timer("fitness"):
+            _, predicted = self.fitness._evaluate_shared(tree, self._inputs(inst), seen, rows, None)
+            matches += sum(map(operator.eq, predicted, self.target[seen:rows]))
+        telemetry.count("racing_rows", rows - seen)
+        if rows >= self.row_count:
+            self.fitness.memo[inst.value] = matches / self.row_count
+            self.progress.pop(inst.value, None)
+        else:
+            self.progress[inst.value] = (rows, matches)
+        return rows, matches
+
+    def _radius(self, rows: int, mean: float, delta: float) -> float:
+        if rows >= self.row_count:
+            return 0.0
+        if self.bound == "hoeffding":
+            return math.sqrt(math.log(2.0 / delta) / (2.0 * rows))
+        log_term = math.log(3.0 / delta)
+        return math.sqrt(2.0 * mean * (1.0 - mean) * log_term / rows) + 3.0 * log_term / rows
+
+    # ------------------------------------------------------------------
+    # Race
+    # ------------------------------------------------------------------
+
+    def select_top_k(self, instances: List[Instance], k: int) -> List[Instance]:
+        """
+        Race *instances* and return the top *k* by exact score (best first).
+        Every instance gets a score: exact for the contenders, a capped
+        sample estimate for the ones dropped from the race.
+        """
+        if k <= 0 or not instances or self.row_count == 0:
+            return []
+        unique: Dict[str, Instance] = {}
+        for inst in instances:
+            unique.setdefault(inst.value, inst)
+        candidates = list(unique.values())
+
+        rounds = 1 + max(0, math.ceil(math.log(self.row_count / self.initial_rows, self.growth)))
+        delta = self.delta / (len(candidates) * rounds)
+
+        alive = candidates
+        estimates: Dict[str, float] = {}
+        rows = min(self.initial_rows, self.row_count)
+        while len(alive) > k:
+            lower, upper = {}, {}
+            for inst in alive:
+                seen, matches = self._advance(inst, rows)
+                mean = matches / seen
+                radius = self._radius(seen, mean, delta)
+                estimates[inst.value] = mean
+                lower[inst.value], upper[inst.value] = mean - radius, mean + radius
+            if rows >= self.row_count:
+                break
+            kth_lower = sorted(lower.values(), reverse=True)[k - 1]
+            alive = [inst for inst in alive if upper[inst.value] >= kth_lower]
+            rows = min(self.row_count, math.ceil(rows * self.growth))
+
+        get_telemetry().count("racing_dropped", len(candidates) - len(alive))
+        for inst in alive:
+            self._advance(inst, self.row_count)
+            self.fitness.get_fitness(inst)
+        ranked = sorted(alive, key=lambda inst: inst.score, reverse=True)
+        top = ranked[:k]
+
+        cap = top[-1].score - 0.5 / self.row_count
+        contenders = {inst.value for inst in alive}
+        for inst in candidates:
+            if inst.value not in contenders:
+                inst.score = min(estimates[inst.value], cap)
+        for inst in instances:
+            inst.score = unique[inst.value].score
+        return top
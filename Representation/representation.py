@@ -4,11 +4,13 @@ from hyperon import *
 
 # from ..reduct.enf.main import reduce
 from Representation.helpers import *
+from Representation.telemetry import get_telemetry
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import List, Any, Callable, Dict, Tuple
+from typing import List, Any, Callable, Dict, Optional, Tuple
 from copy import deepcopy
+import operator
 import random
 import re
 
@@ -128,6 +130,13 @@ class Hyperparams:
     neighborhood_size: int
     bernoulli_prob: float = 0.5
     uniform_prob: float = 0.5
+    deme_workers: int = 0  # 0: run demes in sequence; >= 1: seeded per-deme runs on that many processes
+    pipeline_staleness: int = 0  # > 0: overlap variation with reduction, at most this many generations in flight
+    reduce_workers: int = 2  # reduction processes used by the pipelined run_variation
+    fitness_block_size: int = 0  # > 0: alpha EDA scores candidates in row blocks and cuts off hopeless ones
+    racing_delta: float = 0.0  # > 0: alpha EDA races candidates on row samples with this error probability
+    mrmr_screen_keep: int = 0  # > 0: tables with more inputs are screened down to this many features before mRMR
+    mrmr_screen_method: str = "sketch"  # screening method: 'ig', 'pairwise' or 'sketch' (Feature_selection_algo/screening.py)
 
 class Deme(Quantale):
     def __init__(self, instances: List[Instance], id: str, q_hyper: Hyperparams) -> None:
@@ -302,117 +311,286 @@ def build_factor_graph_from_deme(deme: Deme) -> FactorGraph:
 
     return FactorGraph(variables=variables, factors=factors)
 
+# Dataset content hash -> score memo, shared by the oracles of a packed table
+# (see FitnessOracle.from_packed and Representation/binary_dataset.py).
+SCORE_CACHES: Dict[str, Dict[str, float]] = {}
+
+
 class FitnessOracle:
-    def __init__(self, target_vals: List[bool]):
+    def __init__(self, target_vals: List[bool], pos_counts: Optional[List[int]] = None,
+                 neg_counts: Optional[List[int]] = None):
+        """
+        *target_vals* has one entry per row.  For a duplicate-collapsed table
+        (see ``collapse_truth_table``) pass the number of true / false
+        targets of every unique row as *pos_counts* / *neg_counts*; accuracy
+        is then weighted so it equals the accuracy on the expanded table.
+        """
         self.target_vals = target_vals
+        self.pos_counts = pos_counts
+        self.neg_counts = neg_counts
+        if pos_counts is not None:
+            if neg_counts is None or not len(pos_counts) == len(neg_counts) == len(target_vals):
+                raise ValueError("pos_counts and neg_counts must both be given, one per row")
+            self.total_weight = sum(pos_counts) + sum(neg_counts)
+        else:
+            self.total_weight = len(target_vals)
         self.memo: dict[str, float] = {}
+        # PackedTable scoring the programs directly (see from_packed)
+        self.packed = None
+        # Certified upper bounds for programs whose evaluation was cut off
+        self.bounds: dict[str, float] = {}
+
+    @classmethod
+    def from_counts(cls, pos_counts: List[int], neg_counts: List[int]) -> "FitnessOracle":
+        """Weighted oracle over unique rows; each row's target is its majority label."""
+        target = [p >= n for p, n in zip(pos_counts, neg_counts)]
+        return cls(target, pos_counts, neg_counts)
+
+    @classmethod
+    def from_packed(cls, table) -> "FitnessOracle":
+        """
+        Oracle scoring programs on a ``PackedTable`` with bitwise operations;
+        the instances' knobs are not read.  Oracles over tables with the
+        same content hash share one memo.
+        """
+        oracle = cls(table.target())
+        oracle.packed = table
+        if table.content_hash is not None:
+            oracle.memo = SCORE_CACHES.setdefault(table.content_hash, {})
+        return oracle
+
+    @property
+    def weighted(self) -> bool:
+        return self.pos_counts is not None
+
+    def _matches(self, predicted: List[bool], start: int = 0, stop: Optional[int] = None):
+        """Number (weighted: total count) of rows ``start:stop`` predicted correctly."""
+        if self.pos_counts is None:
+            return sum(map(operator.eq, predicted, self.target_vals[start:stop]))
+        return sum(pos if p else neg for p, pos, neg in
+                   zip(predicted, self.pos_counts[start:stop], self.neg_counts[start:stop]))
+
+    def _weight(self, start: int, stop: int):
+        if self.pos_counts is None:
+            return stop - start
+        return sum(self.pos_counts[start:stop]) + sum(self.neg_counts[start:stop])
 
     def get_fitness(self, instance: "Instance") -> float:
         """
         Evaluates the fitness of an individual based on the truth table data
         present in the instance's knobs. Utilizes caching to avoid re-evaluation.
         """
-        # Check cache (using the program string as key)
-        if instance.value in self.memo:
-            # print('Used From Cache CCCCCCC')
-            instance.score = self.memo[instance.value]
-            return instance.score
-        
-        
-        inputs: dict[str, List[bool]] = {}
-        
-        # Populate inputs
+        return self.get_fitness_many([instance])[0]
+
+    def get_fitness_many(self, instances: List["Instance"], workers: int = 0) -> List[float]:
+        """
+        Scores a batch of instances in place and returns their scores.
+
+        Programs are deduplicated (memo hits and repeats in the batch are
+        not re-evaluated) and subtrees shared between programs of the batch
+        are evaluated once.  With *workers* > 1 the new programs are split
+        over that many worker processes.
+        """
+        telemetry = get_telemetry()
         row_count = len(self.target_vals)
-        for knob in instance.knobs:
-            inputs[knob.symbol] = knob.Value
-        
-        # If target not found or no data, return 0.0(or handle error)
+        # If no data, return 0.0 (or handle error)
         if row_count == 0:
-            return 0.0
-        
+            return [0.0] * len(instances)
+
+        pending: Dict[str, "Instance"] = {}
+        for inst in instances:
+            if inst.value in self.memo or inst.value in pending:
+                telemetry.count("fitness_cache_hits")
+            else:
+                pending[inst.value] = inst
+
+        if pending:
+            with telemetry.timer("fitness"):
+                if workers > 1 and len(pending) > 1 and self.packed is None:
+                    scores = self._score_sharded(list(pending.values()), workers)
+                else:
+                    scores = self._score_programs(list(pending.values()))
+            self.memo.update(scores)
+
+        for inst in instances:
+            inst.score = self.memo[inst.value]
+        return [inst.score for inst in instances]
+
+    def _score_programs(self, instances: List["Instance"]) -> Dict[str, float]:
+        """Accuracy of every (distinct) program, sharing subtree results across the batch."""
+        row_count = len(self.target_vals)
+        if self.packed is not None:
+            scores = {}
+            for inst in instances:
+                try:
+                    scores[inst.value] = self.packed.score(inst.value)
+                except Exception as e:
+                    # Same fallback as below: a malformed program predicts all-False
+                    print(f"Evaluation error for {inst.value}: {e}")
+                    scores[inst.value] = self._matches([False] * row_count) / self.total_weight
+            return scores
+        cache: Optional[Dict[Any, List[bool]]] = {} if len(instances) > 1 else None
+        scores = {}
+        for inst in instances:
+            inputs = {knob.symbol: knob.Value for knob in inst.knobs}
+            try:
+                _, predicted_vals = self._evaluate_shared(self._parse_expression(inst.value),
+                                                          inputs, 0, row_count, cache)
+            except Exception as e:
+                # Fallback for malformed expressions or eval errors
+                print(f"Evaluation error for {inst.value}: {e}")
+                predicted_vals = [False] * row_count
+            # Count how many predictions match the target and Compute accuracy
+            scores[inst.value] = self._matches(predicted_vals) / self.total_weight
+        return scores
+
+    def _score_sharded(self, instances: List["Instance"], workers: int) -> Dict[str, float]:
+        from Moses.parallel_demes import get_process_pool
+
+        # Columns are shipped once each and keyed by identity, so programs
+        # whose knobs bind the same symbol to different columns stay apart
+        columns: Dict[int, List[bool]] = {}
+        programs = []
+        for inst in instances:
+            for knob in inst.knobs:
+                columns.setdefault(id(knob.Value), knob.Value)
+            programs.append((inst.value, [(knob.symbol, id(knob.Value)) for knob in inst.knobs]))
+        pool = get_process_pool(workers)
+        size = -(-len(programs) // workers)
+        futures = [pool.submit(_score_shard, self.target_vals, self.pos_counts, self.neg_counts,
+                               columns, programs[i:i + size])
+                   for i in range(0, len(programs), size)]
+        scores = {}
+        for future in futures:
+            scores.update(future.result())
+        return scores
+
+    def get_fitness_bounded(self, instance: "Instance", threshold: Optional[float] = None,
+                            block_size: int = 1024) -> Tuple[float, bool]:
+        """
+        Like ``get_fitness``, but evaluates the rows in blocks of *block_size*
+        and stops as soon as the candidate can no longer reach *threshold*
+        (e.g. the worst score of the current top-k).
+
+        Returns ``(score, exact)``.  When *exact* is False the evaluation was
+        cut off and *score* is a certified upper bound on the accuracy,
+        strictly below *threshold*; it is stored in ``instance.score`` and
+        in ``self.bounds``, never in ``self.memo``.
+
+        Packed oracles (``from_packed``) do not read the knobs and are
+        always scored exactly with ``get_fitness``.
+        """
+        if threshold is None or instance.value in self.memo or self.packed is not None:
+            return self.get_fitness(instance), True
+
+        telemetry = get_telemetry()
+        bound = self.bounds.get(instance.value)
+        if bound is not None and bound < threshold:
+            telemetry.count("fitness_bound_hits")
+            instance.score = bound
+            return bound, False
+
+        row_count = len(self.target_vals)
         try:
-            predicted_vals = self._evaluate_expression(instance.value, inputs, row_count)
-        except Exception as e:
-            # Fallback for malformed expressions or eval errors
-            print(f"Evaluation error for {instance.value}: {e}")
-            predicted_vals = [False] * row_count
-
-        # Count how many predictions match the target and Compute accuracy
-        matches = sum(1 for p, t in zip(predicted_vals, self.target_vals) if p == t)
-        accuracy = matches / row_count if row_count > 0 else 0.0
-        
+            tree = self._parse_expression(instance.value)
+        except Exception:
+            tree = None
+        if row_count == 0 or tree is None:
+            return self.get_fitness(instance), True
+
+        inputs = {knob.symbol: knob.Value for knob in instance.knobs}
+        matches = 0
+        remaining = self.total_weight
+        with telemetry.timer("fitness"):
+            for start in range(0, row_count, block_size):
+                stop = min(start + block_size, row_count)
+                _, predicted = self._evaluate_shared(tree, inputs, start, stop, None)
+                matches += self._matches(predicted, start, stop)
+                remaining -= self._weight(start, stop)
+                upper = (matches + remaining) / self.total_weight
+                if stop < row_count and upper < threshold:
+                    telemetry.count("fitness_aborted")
+                    telemetry.count("fitness_rows_skipped", row_count - stop)
+                    self.bounds[instance.value] = upper
+                    instance.score = upper
+                    return upper, False
+
+        accuracy = matches / self.total_weight
         self.memo[instance.value] = accuracy
+        self.bounds.pop(instance.value, None)
         instance.score = accuracy
-        return accuracy
+        return accuracy, True
 
-    def _evaluate_expression(self, expr_str: str, inputs: dict[str, List[bool]], row_count: int) -> List[bool]:
+    @staticmethod
+    def _parse_expression(expr_str: str):
         """
-        Parses and evaluates the S boolean expression (AND/OR/NOT).
+        Parses the first S-expression in *expr_str* into ``(op, [children])``
+        tuples and atom strings, for ``_evaluate_shared``.
         """
-        # Simple tokenizer: split by parens and spaces
         tokens = re.findall(r'\(|\)|[^\s()]+', expr_str)
-    
-        token_list = tokens
-        self._idx = 0
-        
-        def next_token():
-            if self._idx < len(token_list):
-                t = token_list[self._idx]
-                self._idx += 1
+        pos = 0
+
+        def parse():
+            nonlocal pos
+            t = tokens[pos] if pos < len(tokens) else None
+            pos += 1
+            if t != '(':
                 return t
-            return None
-            
-        def peek_token():
-            if self._idx < len(token_list):
-                return token_list[self._idx]
-            return None
-
-        def eval_node() -> List[bool]:
-            t = next_token()
-            if t == '(':
-                # Expect operator or list
-                op = next_token()
-                args_vals = []
-                while peek_token() != ')':
-                    args_vals.append(eval_node())
-                next_token() # consume ')'
-                
-                if op == 'AND':
-                    if not args_vals: return [True] * row_count
-                    # Element-wise AND
-                    res = args_vals[0][:]
-                    for other in args_vals[1:]:
-                        for i in range(row_count):
-                            res[i] = res[i] and other[i]
-                    return res
-                elif op == 'OR':
-                    if not args_vals: return [False] * row_count
-                    res = args_vals[0][:]
-                    for other in args_vals[1:]:
-                        for i in range(row_count):
-                            res[i] = res[i] or other[i]
-                    return res
-                elif op == 'NOT':
-                    if not args_vals: return [False] * row_count
-                    # Unary usually, but logic allows arity 1
-                    return [not x for x in args_vals[0]]
-                else:
-                    # Unknown operator or maybe this list is data?
-                    # Assuming operators are uppercase symbols
-                    return [False] * row_count
-            elif t == ')':
-                # Should be handled by loop
-                return [False] * row_count
+            op = tokens[pos] if pos < len(tokens) else None
+            pos += 1
+            children = []
+            while tokens[pos] != ')':
+                children.append(parse())
+            pos += 1
+            return (op, children)
+
+        return parse()
+
+    def _evaluate_shared(self, node, inputs: dict[str, List[bool]], start: int, stop: int,
+                         cache: Optional[Dict[Any, List[bool]]]) -> Tuple[Any, List[bool]]:
+        """
+        Evaluates a parsed expression on rows ``start:stop``.  ``(NOT)`` and
+        unknown operators are False, ``(AND)`` is True, ``(OR)`` is False
+        and unknown symbols are True only if spelled ``True``.
+
+        Returns ``(key, values)``; *key* identifies the subtree together
+        with the input columns it reads, and *cache* maps keys already
+        evaluated in this call range to their values (None: no sharing,
+        keys are not built).
+        """
+        row_count = stop - start
+        if isinstance(node, tuple):
+            op, children = node
+            evaluated = [self._evaluate_shared(child, inputs, start, stop, cache) for child in children]
+            if op == 'NOT':
+                evaluated = evaluated[:1]
+            key = None
+            if cache is not None:
+                key = (op, tuple(child_key for child_key, _ in evaluated))
+                if key in cache:
+                    return key, cache[key]
+            if op == 'NOT':
+                res = [not x for x in evaluated[0][1]] if evaluated else [False] * row_count
+            elif op not in ('AND', 'OR'):
+                res = [False] * row_count
+            elif not evaluated:
+                res = [op == 'AND'] * row_count
             else:
-                # Atom (Variable or Literal)
-                if t in inputs:
-                    return inputs[t]
-                elif t == 'True': return [True] * row_count
-                elif t == 'False': return [False] * row_count
-                # Handle holes $ as False or arbitrary?
-                return [False] * row_count
-
-        return eval_node()
+                res = evaluated[0][1]
+                for _, other in evaluated[1:]:
+                    if op == 'AND':
+                        res = [a and b for a, b in zip(res, other)]
+                    else:
+                        res = [a or b for a, b in zip(res, other)]
+            if cache is not None:
+                cache[key] = res
+            return key, res
+        if node in inputs:
+            column = inputs[node]
+            if start > 0 or stop < len(column):
+                return ('col', id(column)), column[start:stop]
+            return ('col', id(column)), column
+        return node == 'True', [node == 'True'] * row_count
 
 # -> program sketch of this structrure is possible: 
 # (AND $ $)
@@ -438,4 +616,15 @@ class FitnessOracle:
 # def sample_random_instances(instance: Instance) -> Instance:
 #     from the given instance/sketch randomly assign knob values
 #     return new_instance
-# -> Then we can populate the deme with a list of such instances.
\ No newline at end of file
+# -> Then we can populate the deme with a list of such instances.
+
+
+def _score_shard(target_vals: List[bool], pos_counts: Optional[List[int]],
+                 neg_counts: Optional[List[int]], columns: Dict[int, List[bool]],
+                 programs: List[Tuple[str, List[Tuple[str, int]]]]) -> Dict[str, float]:
+    """Worker side of ``get_fitness_many(workers=...)``; *columns* are keyed by ``id`` in the parent."""
+    instances = []
+    for value, bindings in programs:
+        knobs = [Knob(symbol=sym, id=i, Value=columns[key]) for i, (sym, key) in enumerate(bindings)]
+        instances.append(Instance(value=value, id=0, score=0.0, knobs=knobs))
+    return FitnessOracle(target_vals, pos_counts, neg_counts)._score_programs(instances)
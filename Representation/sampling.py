@@ -3,70 +3,282 @@ import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 
-from Representation.helpers import TreeNode, parse_sexpr, tokenize, isOP, prune_duplicate_children
+from Representation.helpers import parse_sexpr, tokenize, isOP
 from Representation.representation import (Instance, Knob,
                                            Deme, Hyperparams,
                                            FitnessOracle,
                                            knobs_from_truth_table)
 from Representation.csv_parser import load_truth_table
+from Representation.binary_dataset import dataset_hash
 
-from Feature_selection_algo.interaction_mrmr import interaction_aware_mrmr, feature_order
+from Feature_selection_algo.interaction_mrmr import interaction_aware_mrmr, feature_order, count_features
 from reduct.enf.main import reduce
 from hyperon import MeTTa
+from Representation.telemetry import get_telemetry
 import csv
-from typing import List, Dict
-from copy import deepcopy
+from typing import List, Dict, Optional
+from functools import lru_cache
+import math
 import random
-from collections import deque
+from bisect import bisect_right
+from collections.abc import Sequence
+
+class LogicalPerms(Sequence):
+    """
+    The proposal menu of ``sample_logical_perms`` without building it: the
+    n variables, then for every pair i < j (in order) the four pairs
+    ``(op a b)``, ``(op (NOT a) b)``, ``(op a (NOT b))``, ``(op (NOT a) (NOT b))``.
+    Items are formatted on access, so drawing a few of the 4·C(n,2) + n
+    entries costs O(n) for the index plus one string per draw.
+    """
+
+    def __init__(self, pair_op: str, symbols: List[str]):
+        self.pair_op = pair_op
+        self.symbols = symbols
+        n = len(symbols)
+        # Index of the first pair (i, i+1) of row i
+        self._row_starts = [i * (2 * n - i - 1) // 2 for i in range(n)]
+        self._len = n + 4 * (n * (n - 1) // 2)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._len))]
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("LogicalPerms index out of range")
+        n = len(self.symbols)
+        if index < n:
+            return self.symbols[index]
+        pair, variant = divmod(index - n, 4)
+        i = bisect_right(self._row_starts, pair) - 1
+        j = i + 1 + pair - self._row_starts[i]
+        s1, s2 = self.symbols[i], self.symbols[j]
+        if variant & 1:
+            s1 = f"(NOT {s1})"
+        if variant & 2:
+            s2 = f"(NOT {s2})"
+        return f"({self.pair_op} {s1} {s2})"
+
 
 def sample_logical_perms(current_op: str, variables: List[Knob]) -> List[str]:
     """
     Generates a 'menu' of new Boolean logic pieces (proposals).
+    The menu is a lazy ``LogicalPerms`` sequence; items are built when read.
     """
     if current_op not in ["AND", "OR"] or not variables:
         return None, None
-    
-    candidates = []
-    candidates.extend([v.symbol for v in variables])
 
     # If current is AND, make OR pairs. If OR, make AND pairs.
     pair_op = "OR" if current_op == "AND" else "AND"
 
-    var_symbols = [v.symbol for v in variables]
-
-    for i in range(len(var_symbols)):
-        for j in range(i + 1, len(var_symbols)):
-            s1 = var_symbols[i]
-            s2 = var_symbols[j]
-            # Form pairs including negations
-            candidates.append(f"({pair_op} {s1} {s2})")
-            candidates.append(f"({pair_op} (NOT {s1}) {s2})")
-            candidates.append(f"({pair_op} {s1} (NOT {s2}))")
-            candidates.append(f"({pair_op} (NOT {s1}) (NOT {s2}))")
-    
-    return candidates, variables
+    return LogicalPerms(pair_op, [v.symbol for v in variables]), variables
+
+# Menus at least this long are sampled by geometric skipping in randomUniform.
+GEOMETRIC_MIN_ITEMS = 64
 
 def randomUniform(knobs, hyperparams: Hyperparams):
     """
     Perform uniform random sampling to select knobs.
+
+    Every item is kept independently with probability ``1 - uniform_prob``.
+    For long menus, instead of one draw per item, the gaps between kept items
+    are drawn from the matching geometric distribution, so only the kept
+    items of *knobs* (any sequence, e.g. a lazy ``LogicalPerms``) are read.
+    Short menus keep one draw per item, so seeded runs on small tables
+    reproduce earlier results.
     """
     if not knobs:
         return
-    
+
+    total = len(knobs)
     selected_knobs = []
-    for knob in knobs:
-        if random.random() > hyperparams.uniform_prob:
-            selected_knobs.append(knob)
+    if total < GEOMETRIC_MIN_ITEMS:
+        for knob in knobs:
+            if random.random() > hyperparams.uniform_prob:
+                selected_knobs.append(knob)
+        return selected_knobs
+
+    keep = 1.0 - hyperparams.uniform_prob
+    if keep <= 0.0:
+        return []
+    if keep >= 1.0:
+        return list(knobs)
+
+    log_skip = math.log(1.0 - keep)
+    index = -1
+    while True:
+        # P(gap = g) = (1 - keep)^g * keep, g >= 0
+        index += 1 + int(math.log(1.0 - random.random()) / log_skip)
+        if index >= total:
+            break
+        selected_knobs.append(knobs[index])
 
     return selected_knobs   
 
 
 
+class ExemplarTree:
+    """
+    An exemplar parsed once for neighborhood sampling.
+
+    Nodes are numbered in breadth-first order (root 0) and kept as flat
+    lists: ``labels``, ``parents`` and ``entries`` (child indices).  ``text``
+    holds the printed form of every subtree; it is also the structural key
+    that duplicate pruning compares, so equal subtrees are found without
+    re-printing the tree.  ``candidates`` lists the (node, parent) append
+    sites in the order ``randomBernoulli`` visits them.
+    """
+
+    def __init__(self, value: str):
+        tokens = tokenize(value)
+        self.value = value
+        self.op = tokens[1] if len(tokens) > 1 else None
+        root = parse_sexpr(tokens)
+
+        self.labels: List[str] = []
+        self.parents: List[Optional[int]] = []
+        self.entries: List[tuple] = []
+        order = [(root, None)]
+        k = 0
+        while k < len(order):
+            node, parent = order[k]
+            first = len(order)
+            order.extend((child, k) for child in node.children)
+            self.labels.append(node.label)
+            self.parents.append(parent)
+            self.entries.append(tuple(range(first, len(order))))
+            k += 1
+
+        self.text: List[str] = [""] * len(order)
+        for i in reversed(range(len(order))):
+            self.text[i] = _render(self.labels[i], [self.text[c] for c in self.entries[i]])
+
+        # One (node, parent) entry per child, as the old breadth-first walk did
+        self.candidates = [(i, self.parents[i]) for i, e in enumerate(self.entries) for _ in e]
+        if not self.candidates and self.labels[0] in ["AND", "OR"]:
+            self.candidates.append((0, None))
+
+        # No AND/OR node with repeated children: pruning leaves the tree as is
+        self.canonical = all(len({self.text[c] for c in e}) == len(e)
+                             for label, e in zip(self.labels, self.entries)
+                             if label in ["AND", "OR"])
+
+
+def _render(label: str, child_texts: List[str]) -> str:
+    """``str(TreeNode)`` of a node from the texts of its children."""
+    if not child_texts:
+        return label
+    return f"({label} {' '.join(child_texts)})"
+
+
+@lru_cache(maxsize=256)
+def exemplar_tree(value: str) -> ExemplarTree:
+    """The parsed form of an exemplar, shared by every sample drawn around it."""
+    return ExemplarTree(value)
+
+
+@lru_cache(maxsize=65536)
+def _flip_symbol(symbol: str, parent_label: str):
+    """
+    A proposal as appended under *parent_label*: ``(AND ..)`` under AND
+    becomes ``(OR ..)`` and vice versa.  Also returns its variable tokens.
+    """
+    tokens = tokenize(symbol)
+    if len(tokens) > 1 and parent_label == "OR" and tokens[1] == "OR":
+        tokens[tokens.index("OR")] = "AND"
+        symbol = " ".join(tokens).replace("( ", "(").replace(" )", ")")
+    elif len(tokens) > 1 and parent_label == "AND" and tokens[1] == "AND":
+        tokens[tokens.index("AND")] = "OR"
+        symbol = " ".join(tokens).replace("( ", "(").replace(" )", ")")
+    atoms = tuple(t for t in tokens if not isOP(t) and t not in ['(', ')'])
+    return symbol, atoms
+
+
+class _Mutant:
+    """
+    Edits of one sample on top of a shared ``ExemplarTree``: appended
+    proposals (kept as their text) and the entry lists and subtree texts
+    they changed.  After an append only the path to the root is re-rendered
+    and pruned, which gives the same tree as ``prune_duplicate_children``
+    on a full copy.
+    """
+
+    def __init__(self, tree: ExemplarTree):
+        self.tree = tree
+        self.entries: Dict[int, list] = {}
+        self.text: Dict[int, str] = {}
+        self.pruned = tree.canonical
+
+    def children(self, i: int):
+        return self.entries.get(i, self.tree.entries[i])
+
+    def text_of(self, entry) -> str:
+        if isinstance(entry, str):
+            return entry
+        return self.text.get(entry, self.tree.text[entry])
+
+    @property
+    def root_text(self) -> str:
+        return self.text_of(0)
+
+    def child_texts(self, i: int) -> set:
+        return {self.text_of(e) for e in self.children(i)}
+
+    def append(self, i: int, symbol: str) -> None:
+        if i not in self.entries:
+            self.entries[i] = list(self.tree.entries[i])
+        self.entries[i].append(symbol)
+
+    def _render(self, i: int, prune: bool) -> None:
+        entries = self.children(i)
+        texts = [self.text_of(e) for e in entries]
+        if prune and self.tree.labels[i] in ["AND", "OR"] and len(set(texts)) < len(texts):
+            seen, kept, kept_texts = set(), [], []
+            for entry, text in zip(entries, texts):
+                if text not in seen:
+                    seen.add(text)
+                    kept.append(entry)
+                    kept_texts.append(text)
+            self.entries[i], texts = kept, kept_texts
+        self.text[i] = _render(self.tree.labels[i], texts)
+
+    def prune(self, changed: Optional[int]) -> None:
+        """Brings the texts up to date after an append to node *changed* (or none)."""
+        if not self.pruned:
+            # Exemplar with duplicate children: prune the whole tree once
+            for i in reversed(range(len(self.tree.labels))):
+                self._render(i, True)
+            self.pruned = True
+            return
+        if changed is None:
+            return
+        # Subtrees dropped by earlier pruning are no longer part of the
+        # output; their texts stay current, but they are not pruned.
+        path = [changed]
+        attached = True
+        while self.tree.parents[path[-1]] is not None:
+            parent = self.tree.parents[path[-1]]
+            if path[-1] not in self.children(parent):
+                attached = False
+                break
+            path.append(parent)
+        for i in path:
+            self._render(i, attached)
+
+
 def randomBernoulli(hyperparams: Hyperparams, instance: Instance,
                      features: List[Knob], knobs: List[Knob]) -> Instance:
     """
     Perform Bernoulli sampling to select a knob for replacement.
-    
+
+    The exemplar is parsed once (``exemplar_tree``) and shared by all
+    samples drawn around it; a sample only records the proposals it
+    appends and re-renders the subtrees they change.
+
     Args:
         p (float): Probability of selecting a knob.
         hyperparams: neihborhood_size identification.
@@ -76,144 +288,84 @@ def randomBernoulli(hyperparams: Hyperparams, instance: Instance,
     Returns:
         A set of newly generated instances.
     """
-    instanceExp = deepcopy(instance.value)
-    sexp = tokenize(instanceExp)
-    op = sexp[1] if sexp and len(sexp) > 1 else None
-    root = parse_sexpr(sexp)
+    instanceExp = instance.value
+    tree = exemplar_tree(instanceExp)
 
-    perms, new_knobs = sample_logical_perms(op, features)
+    perms, new_knobs = sample_logical_perms(tree.op, features)
     selected_knobs = randomUniform(perms, hyperparams)
 
     if not selected_knobs:
         return None
 
-    mutant_root = deepcopy(root)
-
-    
-    candidates = []
-    queue = deque([(mutant_root, None)])
-
-    while queue:
-        curr_node, parent = queue.popleft()
-
-        for i, child in enumerate(curr_node.children):
-            entry = (curr_node, parent, i)
-            candidates.append(entry)
-            if not child.is_leaf():
-                queue.append((child, curr_node))
-    
-    # Handle empty tree
-    if not candidates and mutant_root.label in ["AND", "OR"]:
-        candidates.append((mutant_root, None, 0))
+    mutant = _Mutant(tree)
+    candidates = tree.candidates
 
     new_inst = Instance(
-        value=str(mutant_root),
+        value=tree.text[0],
         id=instance.id,
         score=0.0,
-        knobs=deepcopy(instance.knobs)
+        knobs=list(instance.knobs)
     )
 
-    knob_idx = 0
-    knob_count = len(selected_knobs)
-
     knob_map = {k.symbol: k for k in knobs}
     new_knob_map = {k.symbol: k for k in new_knobs}
-
-
-    selected_knobs = deque(selected_knobs)
-
-   
     added_symbols = set(k.symbol for k in new_inst.knobs)
-    if len(candidates) == 1 and mutant_root.label in ["AND", "OR"]:
+
+    def add_knobs(atoms):
+        for t in atoms:
+            knob = knob_map.get(t)
+            if knob and knob.symbol not in added_symbols:
+                new_inst.knobs.append(knob)
+                added_symbols.add(knob.symbol)
+            new_knob = new_knob_map.get(t)
+            if new_knob and new_knob.symbol not in added_symbols:
+                new_inst.knobs.append(new_knob)
+                added_symbols.add(new_knob.symbol)
+
+    if len(candidates) == 1 and tree.labels[0] in ["AND", "OR"]:
         # Special case: Dump multiple selected knobs into the root
-        for i, symbol in enumerate(selected_knobs):
-            # ... token logic ...
-            tokens = tokenize(symbol)
-            # ... operator flipping logic ...
-            if len(tokens) > 1 and mutant_root.label == "OR" and tokens[1] == "OR":
-                tokens[tokens.index("OR")] = "AND"
-                symbol = " ".join(tokens).replace("( ", "(").replace(" )", ")")
-
-            elif len(tokens) > 1 and mutant_root.label == "AND" and tokens[1] == "AND":
-                tokens[tokens.index("AND")] = "OR"
-                symbol = " ".join(tokens).replace("( ", "(").replace(" )", ")")
-            
-            # Simple append (ignoring probability check effectively, or checking it per knob)
+        appended = None
+        for symbol in selected_knobs:
+            symbol, atoms = _flip_symbol(symbol, tree.labels[0])
             if random.random() > hyperparams.bernoulli_prob: # usage check
-                 mutant_root.children.append(TreeNode(symbol))
-        
-        prune_duplicate_children(mutant_root)
-        new_inst.value = str(mutant_root)
-        for t in tokens:
-                if isOP(t) or t in ['(', ')']:
-                    continue
-                knob = knob_map.get(t)
-                if knob and knob.symbol not in added_symbols:
-                    new_inst.knobs.append(knob)
-                    added_symbols.add(knob.symbol)
-                new_knob = new_knob_map.get(t)
-                if new_knob and new_knob.symbol not in added_symbols:
-                    new_inst.knobs.append(new_knob)
-                    added_symbols.add(new_knob.symbol)
-
-        present_tokens = set(tokenize(new_inst.value))
-        new_inst.knobs = [k for k in new_inst.knobs if k.symbol in present_tokens]
+                mutant.append(0, symbol)
+                appended = 0
+
+        mutant.prune(appended)
+        new_inst.value = mutant.root_text
+        add_knobs(atoms)
 
     else:
-        for parent, grandparent, idx in candidates:
+        knob_idx = 0
+        knob_count = len(selected_knobs)
+        for node, parent in candidates:
 
             if knob_idx >= knob_count:
                 break
 
-            symbol = selected_knobs[knob_idx]
-            tokens = tokenize(symbol)
-
-            if len(tokens) > 1 and parent.label == "OR" and tokens[1] == "OR":
-                tokens[tokens.index("OR")] = "AND"
-                symbol = " ".join(tokens).replace("( ", "(").replace(" )", ")")
-
-            elif len(tokens) > 1 and parent.label == "AND" and tokens[1] == "AND":
-                tokens[tokens.index("AND")] = "OR"
-                symbol = " ".join(tokens).replace("( ", "(").replace(" )", ")")
-
-            rand = random.random()
-            # print("Random value for Bernoulli sampling: ", rand)
-            if rand > hyperparams.bernoulli_prob:
-
-                append_target = parent
+            symbol, atoms = _flip_symbol(selected_knobs[knob_idx], tree.labels[node])
 
-                if append_target and append_target.label == "NOT":
-                    append_target = grandparent
+            appended = None
+            if random.random() > hyperparams.bernoulli_prob:
+                # Proposals go next to a NOT, not inside it
+                append_target = parent if tree.labels[node] == "NOT" else node
 
-                if append_target and append_target.label in ["AND", "OR"]:
+                if (append_target is not None and tree.labels[append_target] in ["AND", "OR"]
+                        and symbol not in mutant.child_texts(append_target)):
+                    mutant.append(append_target, symbol)
+                    appended = append_target
+                    knob_idx += 1
 
-                    child_strs = {str(c) for c in append_target.children}
-
-                    if symbol not in child_strs:
-                        append_target.children.append(TreeNode(symbol))
-                        knob_idx += 1
-
-            prune_duplicate_children(mutant_root)
-            mutant_value = str(mutant_root)
+            mutant.prune(appended)
+            mutant_value = mutant.root_text
             if mutant_value == instanceExp:
                 continue
 
             new_inst.value = mutant_value
+            add_knobs(atoms)
 
-            for t in tokens:
-                if isOP(t) or t in ['(', ')']:
-                    continue
-                knob = knob_map.get(t)
-                if knob and knob.symbol not in added_symbols:
-                    new_inst.knobs.append(knob)
-                    added_symbols.add(knob.symbol)
-                new_knob = new_knob_map.get(t)
-                if new_knob and new_knob.symbol not in added_symbols:
-                    new_inst.knobs.append(new_knob)
-                    added_symbols.add(new_knob.symbol)
-
-        present_tokens = set(tokenize(new_inst.value))
-        new_inst.knobs = [k for k in new_inst.knobs if k.symbol in present_tokens]
+    present_tokens = set(tokenize(new_inst.value))
+    new_inst.knobs = [k for k in new_inst.knobs if k.symbol in present_tokens]
 
     return new_inst
 
@@ -250,7 +402,8 @@ def sample_from_deme(deme: Deme, hyperparams: Hyperparams, exemplar: Instance, g
     Returns: A new deme with the sampled instances added.
     """
     if features:
-        features = extract_features(csv_path, output_col='O')
+        features = extract_features(csv_path, output_col='O', screen_keep=getattr(hyperparams, 'mrmr_screen_keep', 0),
+                                    screen_method=getattr(hyperparams, 'mrmr_screen_method', 'sketch'))
         selected_features = random.sample(features, 1)
         selected_knobs = [k for k in global_knobs if k.symbol in selected_features]
     else: selected_knobs = features
@@ -262,27 +415,110 @@ def sample_from_deme(deme: Deme, hyperparams: Hyperparams, exemplar: Instance, g
 
     return deme
 
-def extract_features(csv_path: str, output_col: str = 'O'):
+# (dataset content hash, target column, screening) -> extract_features result.
+# The selection depends only on the table, so it is computed once per dataset.
+MRMR_CACHE: Dict[tuple, object] = {}
+
+
+def extract_features(csv_path: str, output_col: str = 'O', screen_keep: int = 0,
+                     screen_method: str = 'sketch'):
     """
     Extracts features from a truth table CSV file.
     
     Args:
         csv_path (str): Path to the CSV file containing the truth table.
         output_col (str): Name of the output/target column in the CSV.
+        screen_keep (int): If > 0, tables with more input columns are first
+            screened down to this many features (``Hyperparams.mrmr_screen_keep``).
+        screen_method (str): Screening method, 'ig', 'pairwise' or 'sketch'.
         
     Returns:
         A list of features.
     """
-    order = feature_order(csv_path, output_col)
-    features = interaction_aware_mrmr(
-        csv_path=csv_path,
-        target_col=output_col,
-        k=None,  # we can specify K if we want 
-        max_interaction_order=order,
-        output_type='subsets'
-    )
+    telemetry = get_telemetry()
+    wide = screen_keep > 0 and count_features(csv_path, output_col) > screen_keep
+    screening = (screen_keep, screen_method) if wide else None
+    key = (dataset_hash(csv_path), output_col, screening) if os.path.exists(csv_path) else None
+    if key in MRMR_CACHE:
+        telemetry.count("mrmr_cache_hits")
+        return MRMR_CACHE[key]
+    with telemetry.timer("mrmr"):
+        order = feature_order(csv_path, output_col)
+        features = interaction_aware_mrmr(
+            csv_path=csv_path,
+            target_col=output_col,
+            k=None,  # we can specify K if we want 
+            max_interaction_order=order,
+            output_type='subsets',
+            prefilter=screen_keep if wide else None,
+            prefilter_method=screen_method
+        )
+    if key is not None:
+        MRMR_CACHE[key] = features
     return features
 
+# Program string -> its reduced form.  ``reduce`` is deterministic, so results
+# are shared by every call (and saved with checkpoints).
+REDUCTION_CACHE: Dict[str, str] = {}
+
+_worker_metta = None
+
+
+def reduce_expressions(values: List[str], metta: MeTTa = None) -> List[str]:
+    """
+    Returns the reduced form of every program string in *values*, using and
+    filling REDUCTION_CACHE.
+
+    Without *metta* a per-process interpreter is created on first use, so
+    this can be submitted to a worker pool as is.
+    """
+    global _worker_metta
+    if metta is None:
+        if _worker_metta is None:
+            _worker_metta = MeTTa()
+        metta = _worker_metta
+
+    telemetry = get_telemetry()
+    results = []
+    for value in values:
+        if value in REDUCTION_CACHE:
+            telemetry.count("reduction_cache_hits")
+        else:
+            with telemetry.timer("reduction"):
+                reduced = reduce(metta, value)
+            if isinstance(reduced, list) and len(reduced) > 0:
+                REDUCTION_CACHE[value] = str(reduced[0])
+            else:
+                REDUCTION_CACHE[value] = str(reduced)
+        results.append(REDUCTION_CACHE[value])
+    return results
+
+
+def apply_reductions(instances: List[Instance], reduced_values: List[str],
+                     fitness: FitnessOracle) -> List[Instance]:
+    """
+    Second half of ``reduce_and_score``: sets every instance to its reduced
+    value, drops knobs that no longer appear, scores it and removes
+    duplicates (first occurrence wins).
+    """
+    for inst, value in zip(instances, reduced_values):
+        inst.value = value
+
+        present_tokens = set(tokenize(inst.value))
+        inst.knobs = [k for k in inst.knobs if k.symbol in present_tokens]
+
+    fitness.get_fitness_many(instances)
+
+    unique_instances = {}
+    for inst in instances:
+        if inst.value not in unique_instances:
+            unique_instances[inst.value] = inst
+        else:
+            get_telemetry().count("duplicates_dropped")
+            
+    return list(unique_instances.values())
+
+
 def reduce_and_score(instances: List[Instance], fitness: FitnessOracle, metta: MeTTa) -> List[Instance]:
     """
     Reduces the instances using MeTTa and scores them using the fitness oracle.
@@ -295,24 +531,11 @@ def reduce_and_score(instances: List[Instance], fitness: FitnessOracle, metta: M
     Returns:
         A list of reduced and scored instances.
     """
-    unique_instances = {}
-    for inst in instances:
-        reduced = reduce(metta, inst.value)
-        if isinstance(reduced, list) and len(reduced) > 0:
-            inst.value = str(reduced[0])
-        else:
-            inst.value = str(reduced)
+    reduced_values = reduce_expressions([inst.value for inst in instances], metta)
+    return apply_reductions(instances, reduced_values, fitness)
 
-        present_tokens = set(tokenize(inst.value))
-        inst.knobs = [k for k in inst.knobs if k.symbol in present_tokens]
-
-        inst.score = fitness.get_fitness(inst)
-        if inst.value not in unique_instances:
-            unique_instances[inst.value] = inst
-            
-    return list(unique_instances.values())
-
-def sample_from_TTable(csv_path: str, hyperparams: Hyperparams, exemplar: Instance, knobs: List[Knob], target_vals: List[bool] ,output_col: str = 'O'):
+def sample_from_TTable(csv_path: str, hyperparams: Hyperparams, exemplar: Instance, knobs: List[Knob], target_vals: List[bool] ,output_col: str = 'O',
+                       fitness: Optional[FitnessOracle] = None):
     """
     Samples demes from a truth table CSV file using interaction-aware mRMR feature selection.
     Args:
@@ -320,20 +543,25 @@ def sample_from_TTable(csv_path: str, hyperparams: Hyperparams, exemplar: Instan
         hyperparams (Hyperparams): Hyperparameters for sampling.
         exemplar (Instance): The exemplar instance to base sampling on.
         output_col (str): Name of the output/target column in the CSV.
+        fitness (FitnessOracle, optional): Oracle to score the demes with (e.g. a weighted
+            one for a collapsed table). Defaults to a new ``FitnessOracle(target_vals)``.
     Returns:
         List[Deme]: A list of sampled demes.
     """
-    features = extract_features(csv_path, output_col)
-
-    demes = []
-    metta = MeTTa()
-    fitness = FitnessOracle(target_vals)
-
-    for feat in features:
-        selected_features = [k for k in knobs if k.symbol in (feat if isinstance(feat, (list, tuple)) else [feat])]
-        instances = sample_new_instances(hyperparams, exemplar, selected_features, exemplar.knobs)
-        unique_instances = reduce_and_score(instances, fitness, metta)
-            
-        demes.append(Deme(instances=list(unique_instances), id=(len(demes)), q_hyper=hyperparams))
+    with get_telemetry().timer("sampling"):
+        features = extract_features(csv_path, output_col, screen_keep=getattr(hyperparams, 'mrmr_screen_keep', 0),
+                                    screen_method=getattr(hyperparams, 'mrmr_screen_method', 'sketch'))
+
+        demes = []
+        metta = MeTTa()
+        if fitness is None:
+            fitness = FitnessOracle(target_vals)
+
+        for feat in features:
+            selected_features = [k for k in knobs if k.symbol in (feat if isinstance(feat, (list, tuple)) else [feat])]
+            instances = sample_new_instances(hyperparams, exemplar, selected_features, exemplar.knobs)
+            unique_instances = reduce_and_score(instances, fitness, metta)
+                
+            demes.append(Deme(instances=list(unique_instances), id=(len(demes)), q_hyper=hyperparams))
         
     return demes
\ No newline at end of file
@@ -1,18 +1,71 @@
+import heapq
 import random
-from .representation import Deme, Instance
+from .representation import Deme, FitnessOracle, Instance
 from typing import List
 
-def select_top_k(deme: Deme, k: int) -> List[Instance]:
+def select_top_k(deme: Deme, k: int, racer=None) -> List[Instance]:
     """
     select_top_k: Selects the top k instances from the deme based on their scores.
     Args:
         deme (Deme): The deme containing instances.
         k (int): The number of top instances to select.
+        racer (RacingEvaluator): If given, the instances are raced on row
+            samples first (see Representation/racing.py); the returned
+            instances have exact scores.
     Returns: A list of the top k instances.
     """
+    if racer is not None:
+        return racer.select_top_k(deme.instances, k)
     sorted_instances = sorted(deme.instances, key=lambda inst: inst.score, reverse=True)
     return sorted_instances[:k]
 
+def score_for_top_k(instances: List[Instance], fitness: FitnessOracle, k: int,
+                    block_size: int = 0, scored: List[Instance] = ()) -> int:
+    """
+    score_for_top_k: Scores instances that only need to be exact if they can
+        make a later select_top_k(k).
+    Once k distinct programs have exact scores, every further candidate is
+    evaluated with the k-th best of them as threshold and cut off as soon as
+    it cannot reach it; its score is then a certified upper bound below
+    that top-k, so the top-k (and its order) is the same as with exact scores.
+    Args:
+        instances (List[Instance]): Instances to score, in place.
+        fitness (FitnessOracle): The fitness oracle.
+        k (int): Size of the top-k that will be selected.
+        block_size (int): Rows per evaluation block; 0 scores every instance exactly.
+        scored (List[Instance]): Already exactly scored instances that
+            compete for the same top-k (e.g. elites).
+    Returns: The number of instances whose evaluation was cut off.
+    """
+    if block_size <= 0 or k <= 0:
+        fitness.get_fitness_many(instances)
+        return 0
+
+    best: List[float] = []  # min-heap of the k best exact scores
+    counted = set()
+
+    def record(inst: Instance) -> None:
+        if inst.value in counted:
+            return
+        counted.add(inst.value)
+        if len(best) < k:
+            heapq.heappush(best, inst.score)
+        elif inst.score > best[0]:
+            heapq.heapreplace(best, inst.score)
+
+    for inst in scored:
+        record(inst)
+
+    aborted = 0
+    for inst in instances:
+        threshold = best[0] if len(best) >= k else None
+        _, exact = fitness.get_fitness_bounded(inst, threshold, block_size)
+        if exact:
+            record(inst)
+        else:
+            aborted += 1
+    return aborted
+
 def tournament_selection(deme: Deme, k:int, tournament_size: int) -> List[Instance]:
     """
     tournament_selection: Selects instances from the deme using tournament selection.
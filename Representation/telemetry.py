@@ -0,0 +1,159 @@
+"""
+Lightweight instrumentation for MOSES runs.
+
+A :class:`Telemetry` object accumulates
+
+    timers    total seconds and call count per stage (sampling, mrmr,
+              reduction, fitness, mining, propagation, variation)
+    counters  named event counts (candidates generated, duplicates
+              dropped, fitness / reduction cache hits, ...)
+
+and decides which progress messages are printed (``verbosity``):
+
+    0  silent
+    1  per-iteration summaries and final results
+    2  per-generation detail (default, the historical output)
+
+Records go to a pluggable sink: :class:`NullSink` (default),
+:class:`MemorySink` or :class:`JsonlSink`.  ``snapshot()`` emits the
+current totals; the MOSES drivers call it once per iteration.
+
+Stage timers are inclusive: "sampling" contains the "mrmr" and "reduction"
+time spent while sampling demes; "run", "iteration" and "deme" wrap whole
+units of work.  Work done in worker processes (``deme_workers`` /
+``reduce_workers``) is not collected; the workers only inherit the
+verbosity.
+
+``scope(iteration=..., deme=...)`` tags the work in progress; an attached
+``profiler`` (see Representation/profiling.py) uses it to profile only
+selected iterations or demes.
+"""
+
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+class NullSink:
+    """Discards every record."""
+
+    def emit(self, record: dict) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class MemorySink:
+    """Keeps records in ``self.records`` (handy in tests and notebooks)."""
+
+    def __init__(self):
+        self.records: List[dict] = []
+
+    def emit(self, record: dict) -> None:
+        self.records.append(record)
+
+    def close(self) -> None:
+        pass
+
+
+class JsonlSink:
+    """Appends one JSON object per line to *path*."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+
+    def emit(self, record: dict) -> None:
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+
+class Telemetry:
+    def __init__(self, sink=None, verbosity: int = 2):
+        self.sink = sink if sink is not None else NullSink()
+        self.verbosity = verbosity
+        self.timers: Dict[str, float] = defaultdict(float)
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.context: Dict[str, int] = {}
+        self.profiler = None
+
+    @contextmanager
+    def timer(self, stage: str):
+        """Add the wall time of the ``with`` block to *stage*."""
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.enter(stage, self.context)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timers[stage] += time.perf_counter() - start
+            self.calls[stage] += 1
+            if profiler is not None:
+                profiler.exit(stage)
+
+    @contextmanager
+    def scope(self, **fields):
+        """Tag the ``with`` block with *fields* (e.g. ``iteration=3``)."""
+        saved = dict(self.context)
+        self.context.update(fields)
+        try:
+            yield
+        finally:
+            self.context = saved
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] += n
+
+    def event(self, name: str, **fields) -> None:
+        """Send a free-form record to the sink."""
+        self.sink.emit({"type": "event", "name": name, "time": time.time(), **fields})
+
+    def snapshot(self, **fields) -> dict:
+        """Send (and return) the current totals, tagged with *fields*."""
+        record = {
+            "type": "snapshot",
+            "time": time.time(),
+            **fields,
+            "timers": {stage: round(seconds, 6) for stage, seconds in self.timers.items()},
+            "calls": dict(self.calls),
+            "counters": dict(self.counters),
+        }
+        self.sink.emit(record)
+        return record
+
+    def reset(self) -> None:
+        self.timers.clear()
+        self.calls.clear()
+        self.counters.clear()
+
+    def close(self) -> None:
+        self.sink.close()
+
+
+_current = Telemetry()
+
+
+def get_telemetry() -> Telemetry:
+    return _current
+
+
+def set_telemetry(telemetry: Optional[Telemetry]) -> Telemetry:
+    """Install *telemetry* process-wide (None restores the default) and return it."""
+    global _current
+    _current = telemetry if telemetry is not None else Telemetry()
+    return _current
+
+
+def log(*args, level: int = 1, **kwargs) -> None:
+    """``print`` when the current verbosity is at least *level*."""
+    if _current.verbosity >= level:
+        print(*args, **kwargs)
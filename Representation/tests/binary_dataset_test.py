@@ -0,0 +1,138 @@
+import os
+import pickle
+import random
+import shutil
+import tempfile
+import unittest
+
+from Representation.binary_dataset import (convert_to_binary, dataset_hash, is_binary_dataset,
+                                           load_dataset, open_binary, read_header)
+from Representation.csv_parser import load_truth_table
+from Representation.representation import SCORE_CACHES, FitnessOracle, Instance
+
+
+class TestBinaryDataset(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp(prefix='mbt_test_')
+        rng = random.Random(5)
+        self.rows = [[rng.random() < 0.5 for _ in range(3)] for _ in range(70)]
+        self.target = [a != b for a, b, _ in self.rows]
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write(self, filename, delimiter):
+        path = os.path.join(self.test_dir, filename)
+        with open(path, 'w') as f:
+            f.write(delimiter.join(["A", "B", "C", "O"]) + "\n")
+            for row, t in zip(self.rows, self.target):
+                f.write(delimiter.join(str(int(v)) for v in row + [t]) + "\n")
+        return path
+
+    def test_round_trip_and_hash(self):
+        csv_path = self._write("table.csv", ",")
+        psv_path = self._write("table.psv", "|")
+        out = convert_to_binary(csv_path, output_col='O', chunk_rows=16)
+
+        self.assertEqual(out, csv_path + ".mbt")
+        self.assertTrue(is_binary_dataset(out))
+        self.assertFalse(is_binary_dataset(csv_path))
+        header = read_header(out)
+        self.assertEqual(header["columns"], ["A", "B", "C"])
+        self.assertEqual(header["row_count"], 70)
+        self.assertEqual(header["data_offset"] % 64, 0)
+
+        # Same content from another text format gives the same hash
+        other = convert_to_binary(psv_path, os.path.join(self.test_dir, "other.mbt"), chunk_rows=16)
+        self.assertEqual(dataset_hash(other), header["content_hash"])
+        self.assertEqual(load_truth_table(out), load_truth_table(csv_path))
+
+        table = open_binary(out)
+        self.assertEqual(table.target(), self.target)
+        copy = pickle.loads(pickle.dumps(table))
+        self.assertEqual(copy.column("B"), [r[1] for r in self.rows])
+
+    def test_round_trip_with_blank_lines(self):
+        csv_path = self._write("table.csv", ",")
+        with open(csv_path) as f:
+            lines = f.readlines()
+        lines[10:10] = ["\n"]
+        with open(csv_path, "w") as f:
+            f.writelines(lines)
+        rows, target = load_truth_table(csv_path)
+        table = open_binary(convert_to_binary(csv_path, chunk_rows=16))
+        self.assertEqual(table.row_count, len(target))
+        self.assertEqual(table.target(), target)
+        for name in table.columns:
+            self.assertEqual(table.column(name), [row[name] for row in rows])
+        # Same content as the file without the blank line, so the same hash
+        del lines[10]
+        clean = os.path.join(self.test_dir, "clean.csv")
+        with open(clean, "w") as f:
+            f.writelines(lines)
+        self.assertEqual(dataset_hash(convert_to_binary(clean, chunk_rows=16)), table.content_hash)
+
+    def test_load_dataset_reuses_conversion(self):
+        csv_path = self._write("table.csv", ",")
+        first = load_dataset(csv_path)
+        mtime = os.path.getmtime(csv_path + ".mbt")
+        second = load_dataset(csv_path)
+        self.assertEqual(os.path.getmtime(csv_path + ".mbt"), mtime)
+        self.assertEqual(first.content_hash, second.content_hash)
+        with self.assertRaises(ValueError):
+            load_dataset(csv_path + ".mbt", output_col='A')
+
+    def test_packed_oracle_shares_scores_by_hash(self):
+        table = load_dataset(self._write("table.csv", ","))
+        SCORE_CACHES.pop(table.content_hash, None)
+        knobs = table.knobs()
+        oracle = FitnessOracle.from_packed(table)
+        inst = Instance(value="(OR (AND A (NOT B)) (AND (NOT A) B))", id=0, score=0.0, knobs=knobs)
+        self.assertEqual(oracle.get_fitness(inst), 1.0)
+        self.assertEqual(FitnessOracle(self.target).get_fitness_many(
+            [Instance(value=v, id=0, score=0.0, knobs=knobs) for v in ("A", "(AND B C)")]),
+            oracle.get_fitness_many([Instance(value=v, id=0, score=0.0, knobs=knobs) for v in ("A", "(AND B C)")]))
+        self.assertIs(FitnessOracle.from_packed(open_binary(table.path)).memo, oracle.memo)
+
+    def test_packed_oracle_ignores_knobs_in_bounded_scoring_and_racing(self):
+        from Representation.racing import RacingEvaluator, check_racing_config
+        from Representation.representation import Hyperparams
+        table = load_dataset(self._write("table.csv", ","))
+        SCORE_CACHES.pop(table.content_hash, None)
+        oracle = FitnessOracle.from_packed(table)
+        xor = "(OR (AND A (NOT B)) (AND (NOT A) B))"
+        # No knobs: only the packed table can score it
+        score, exact = oracle.get_fitness_bounded(Instance(value=xor, id=0, score=0.0, knobs=[]),
+                                                  threshold=0.5, block_size=16)
+        self.assertEqual((score, exact), (1.0, True))
+        self.assertEqual(FitnessOracle.from_packed(open_binary(table.path)).memo[xor], 1.0)
+        with self.assertRaises(ValueError):
+            RacingEvaluator(oracle)
+        with self.assertRaises(ValueError):
+            check_racing_config(Hyperparams(0.1, 0.1, 1, 5, racing_delta=0.05), oracle)
+
+    def test_packed_batch_survives_malformed_program(self):
+        table = load_dataset(self._write("table.csv", ","))
+        SCORE_CACHES.pop(table.content_hash, None)
+        oracle = FitnessOracle.from_packed(table)
+        scores = oracle.get_fitness_many([Instance(value=v, id=0, score=0.0, knobs=[])
+                                          for v in ("(AND A", "(AND A B)")])
+        self.assertAlmostEqual(scores[0], 1 - sum(self.target) / len(self.target))
+        self.assertEqual(scores[1], FitnessOracle.from_packed(table).get_fitness(
+            Instance(value="(AND A B)", id=0, score=0.0, knobs=[])))
+
+    def test_load_problem_binary(self):
+        from main import load_problem
+        csv_path = self._write("table.csv", ",")
+        knobs, target, fitness = load_problem(csv_path, binary=True)
+        self.assertTrue(os.path.exists(csv_path + ".mbt"))
+        self.assertIsNotNone(fitness.packed)
+        text_knobs, text_target, _ = load_problem(csv_path)
+        self.assertEqual(target, text_target)
+        self.assertEqual([(k.symbol, k.Value) for k in knobs], [(k.symbol, k.Value) for k in text_knobs])
+        with self.assertRaises(ValueError):
+            load_problem(csv_path, collapse=True, binary=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,7 +7,7 @@ import sys
 # Add project root to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
-from Representation.csv_parser import load_truth_table
+from Representation.csv_parser import load_collapsed_truth_table, load_truth_table
 
 
 class TestCSVTruthTableParserEssential(unittest.TestCase):
@@ -71,6 +71,21 @@ false,TRUE,FALSE
         self.assertEqual(rows, [])
         self.assertEqual(targets, [])   # matches current implementation
 
+    def test_collapse_duplicate_rows(self):
+        """Repeated input rows become one pattern with per-target counts."""
+        content = """A,B,O
+1,0,1
+0,1,0
+1,0,0
+1,0,1
+0,1,0"""
+        path = self._create_csv(content)
+        patterns, pos, neg = load_collapsed_truth_table(path, output_col='O')
+
+        self.assertEqual(patterns, [{'A': True, 'B': False}, {'A': False, 'B': True}])
+        self.assertEqual(pos, [2, 0])
+        self.assertEqual(neg, [1, 2])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
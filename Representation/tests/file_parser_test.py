@@ -50,6 +50,16 @@ class TestFileParser(unittest.TestCase):
         self.assertEqual(rows[0], {'A': True, 'B': False})
         self.assertEqual(targets, [True, False])
 
+    def test_psv_format_pipe(self):
+        """.psv files are read with '|' (they were read with a tab before detect_delimiter)."""
+        content = "A|B|O\n1|0|1\n0|1|0"
+        path = self._create_file(content, "test.psv")
+        rows, targets = parse_file(path, output_col='O')
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0], {'A': True, 'B': False})
+        self.assertEqual(targets, [True, False])
+
     def test_custom_delimiter(self):
         """Test parsing with a custom delimiter."""
         content = "A|B|O\n1|0|1\n0|1|0"
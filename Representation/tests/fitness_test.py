@@ -1,3 +1,4 @@
+import random
 import unittest
 import sys
 import os
@@ -5,6 +6,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))))
 
 from Representation.representation import FitnessOracle, Instance, Knob
+from Representation.csv_parser import collapse_truth_table
 
 class TestFitnessOracle(unittest.TestCase):
     def setUp(self):
@@ -67,5 +69,167 @@ class TestFitnessOracle(unittest.TestCase):
         fitness = self.oracle.get_fitness(inst)
         self.assertEqual(fitness, 0.75)
 
+
+class TestBatchFitness(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(2)
+        n = 64
+        self.knobs = [Knob(symbol=s, id=i, Value=[rng.random() < 0.5 for _ in range(n)])
+                      for i, s in enumerate("ABCD")]
+        self.target = [rng.random() < 0.5 for _ in range(n)]
+        shared = "(OR (AND A B) (NOT C))"
+        self.values = [shared, f"(AND {shared} D)", f"(OR D {shared})", f"(NOT {shared})",
+                       "(AND A B)", "(AND A B)", "(OR)", "(AND A Z)", "True", "(XOR A B)"]
+
+    def _instances(self, knobs=None):
+        return [Instance(value=v, id=i, score=0.0, knobs=knobs or self.knobs)
+                for i, v in enumerate(self.values)]
+
+    def test_batch_matches_single_evaluation(self):
+        expected = [FitnessOracle(self.target).get_fitness(inst) for inst in self._instances()]
+        oracle = FitnessOracle(self.target)
+        batch = self._instances()
+        self.assertEqual(oracle.get_fitness_many(batch), expected)
+        self.assertEqual([inst.score for inst in batch], expected)
+        self.assertEqual(len(oracle.memo), len(set(self.values)))
+
+    def test_shared_subtrees_respect_instance_columns(self):
+        flipped = [Knob(k.symbol, k.id, [not v for v in k.Value]) for k in self.knobs]
+        first = Instance(value="(AND A B)", id=0, score=0.0, knobs=self.knobs)
+        second = Instance(value="(OR (AND A B) C)", id=1, score=0.0, knobs=flipped)
+        FitnessOracle(self.target).get_fitness_many([first, second])
+        self.assertEqual(second.score, FitnessOracle(self.target).get_fitness(
+            Instance(value=second.value, id=1, score=0.0, knobs=flipped)))
+
+    def test_sharded_batch(self):
+        from Moses.parallel_demes import shutdown_pools
+        # Same symbols bound to different columns must not share a column in the workers
+        flipped = [Knob(k.symbol, k.id, [not v for v in k.Value]) for k in self.knobs]
+        mixed = [Instance(value="(AND A B)", id=0, score=0.0, knobs=self.knobs),
+                 Instance(value="(OR A B)", id=1, score=0.0, knobs=flipped)]
+        try:
+            scores = FitnessOracle(self.target).get_fitness_many(self._instances(), workers=2)
+            mixed_scores = FitnessOracle(self.target).get_fitness_many(mixed, workers=2)
+        finally:
+            shutdown_pools()
+        expected = FitnessOracle(self.target).get_fitness_many(self._instances())
+        self.assertEqual(scores, expected)
+        serial = [FitnessOracle(self.target).get_fitness(
+            Instance(value=inst.value, id=0, score=0.0, knobs=inst.knobs)) for inst in mixed]
+        self.assertEqual(mixed_scores, serial)
+
+
+class TestBoundedFitness(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        n = 200
+        self.knobs = [Knob(symbol=s, id=i, Value=[rng.random() < 0.5 for _ in range(n)])
+                      for i, s in enumerate("ABC")]
+        a, b = self.knobs[0].Value, self.knobs[1].Value
+        self.target = [x and y for x, y in zip(a, b)]
+
+    def _inst(self, value):
+        return Instance(value=value, id=0, score=0.0, knobs=self.knobs)
+
+    def test_block_evaluation_matches_exact_score(self):
+        for expr in ["(AND A B)", "(OR A (NOT C))", "(AND (OR A B) (NOT (AND B C)) True)",
+                     "(AND)", "(OR)", "(NOT)", "(XOR A B)", "A", "(AND A D)", "(AND A False)"]:
+            exact = FitnessOracle(self.target).get_fitness(self._inst(expr))
+            score, is_exact = FitnessOracle(self.target).get_fitness_bounded(self._inst(expr), 0.0, 16)
+            self.assertTrue(is_exact, expr)
+            self.assertEqual(score, exact, expr)
+
+    def test_abort_returns_upper_bound(self):
+        oracle = FitnessOracle(self.target)
+        inst = self._inst("(NOT (AND A B))")
+        score, exact = oracle.get_fitness_bounded(inst, 0.9, block_size=16)
+        self.assertFalse(exact)
+        self.assertLess(score, 0.9)
+        self.assertGreaterEqual(score, FitnessOracle(self.target).get_fitness(self._inst(inst.value)))
+        self.assertEqual(inst.score, score)
+        self.assertNotIn(inst.value, oracle.memo)
+        self.assertEqual(oracle.bounds[inst.value], score)
+
+        # a looser threshold evaluates it exactly and drops the bound
+        score, exact = oracle.get_fitness_bounded(inst, 0.0, block_size=16)
+        self.assertTrue(exact)
+        self.assertEqual(score, 0.0)
+        self.assertNotIn(inst.value, oracle.bounds)
+
+    def test_good_candidates_are_not_cut_off(self):
+        oracle = FitnessOracle(self.target)
+        score, exact = oracle.get_fitness_bounded(self._inst("(AND A B)"), 0.9, block_size=16)
+        self.assertTrue(exact)
+        self.assertEqual(score, 1.0)
+
+
+class TestWeightedFitness(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(4)
+        # 300 rows drawn from 8 input patterns, with label noise
+        self.rows = [[rng.random() < 0.5 for _ in range(3)] for _ in range(300)]
+        self.target = [(a and b) != (rng.random() < 0.2) for a, b, _ in self.rows]
+        self.expanded = self._knobs(self.rows)
+
+        patterns, self.pos, self.neg = collapse_truth_table(
+            [dict(zip("ABC", row)) for row in self.rows], self.target)
+        self.collapsed = self._knobs([list(p.values()) for p in patterns])
+
+    @staticmethod
+    def _knobs(rows):
+        return [Knob(symbol=s, id=i, Value=[row[i] for row in rows]) for i, s in enumerate("ABC")]
+
+    def test_weighted_accuracy_matches_expanded_table(self):
+        values = ["(AND A B)", "(OR A (NOT C))", "(NOT B)", "A", "(AND)", "(OR)"]
+        weighted = FitnessOracle.from_counts(self.pos, self.neg)
+        self.assertLessEqual(len(weighted.target_vals), 8)
+        expected = FitnessOracle(self.target).get_fitness_many(
+            [Instance(value=v, id=i, score=0.0, knobs=self.expanded) for i, v in enumerate(values)])
+        scores = weighted.get_fitness_many(
+            [Instance(value=v, id=i, score=0.0, knobs=self.collapsed) for i, v in enumerate(values)])
+        for got, want in zip(scores, expected):
+            self.assertAlmostEqual(got, want)
+
+        for value in values:
+            inst = Instance(value=value, id=0, score=0.0, knobs=self.collapsed)
+            score, exact = FitnessOracle.from_counts(self.pos, self.neg).get_fitness_bounded(inst, 0.0, 2)
+            self.assertTrue(exact)
+            self.assertAlmostEqual(score, weighted.memo[value])
+
+    def test_load_problem_collapses_rows(self):
+        import tempfile
+        from main import load_problem
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "noisy.csv")
+            with open(path, "w") as f:
+                f.write("A,B,C,O\n")
+                for row, t in zip(self.rows, self.target):
+                    f.write(",".join(str(int(v)) for v in row + [t]) + "\n")
+            knobs, target, fitness = load_problem(path, collapse=True)
+            full_knobs, _, full = load_problem(path)
+        self.assertTrue(fitness.weighted)
+        self.assertLessEqual(len(target), 8)
+        for value in ["(AND A B)", "(OR A (NOT C))", "B"]:
+            self.assertAlmostEqual(
+                fitness.get_fitness(Instance(value=value, id=0, score=0.0, knobs=knobs)),
+                full.get_fitness(Instance(value=value, id=0, score=0.0, knobs=full_knobs)))
+
+    def test_racing_rejected_up_front(self):
+        from main import run_moses
+        from Representation.racing import check_racing_config
+        from Representation.representation import Hyperparams
+        hp = Hyperparams(0.1, 0.1, 2, 5, racing_delta=0.05)
+        weighted = FitnessOracle.from_counts(self.pos, self.neg)
+        with self.assertRaises(ValueError):
+            check_racing_config(hp, weighted)
+        exemplar = Instance(value="(AND)", id=0, score=0.0, knobs=self.collapsed)
+        with self.assertRaises(ValueError):
+            run_moses(exemplar, weighted, hp, self.collapsed, weighted.target_vals,
+                      "example_data/test_parity_3.csv", [exemplar], max_iter=1, fg_type="alpha")
+
+    def test_mismatched_counts_raise(self):
+        with self.assertRaises(ValueError):
+            FitnessOracle([True, False], pos_counts=[1, 0], neg_counts=[0])
+
 if __name__ == '__main__':
     unittest.main()
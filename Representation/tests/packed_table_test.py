@@ -0,0 +1,104 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from Feature_selection_algo.IG_selection import calculate_information_gain
+from Feature_selection_algo.interaction_mrmr import calculate_joint_entropy
+from Representation.csv_parser import load_truth_table
+from Representation.file_parser import detect_delimiter
+from Representation.packed_table import stream_truth_table
+from Representation.representation import FitnessOracle, Instance, knobs_from_truth_table
+
+
+class TestPackedTable(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp(prefix='packed_test_')
+        rng = random.Random(3)
+        self.rows = [[rng.random() < 0.5 for _ in range(4)] for _ in range(101)]
+        self.target = [(a and b) or (c and rng.random() < 0.9) for a, b, c, _ in self.rows]
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write(self, filename, delimiter):
+        path = os.path.join(self.test_dir, filename)
+        with open(path, 'w') as f:
+            f.write(delimiter.join(["A", "B", "O", "C", "D"]) + "\n")
+            for (a, b, c, d), t in zip(self.rows, self.target):
+                cells = [str(int(a)), "True" if b else "f", str(int(t)), " T " if c else "0", str(int(d))]
+                f.write(delimiter.join(cells) + "\n")
+        return path
+
+    def test_streamed_table_matches_loaded_table(self):
+        path = self._write("table.csv", ",")
+        table = stream_truth_table(path, output_col='O', out_path=path + ".bits", chunk_rows=16)
+        rows, target = load_truth_table(path, output_col='O')
+
+        self.assertEqual(table.columns, ["A", "B", "C", "D"])
+        self.assertEqual(table.row_count, 101)
+        self.assertEqual(table.target(), target)
+        knobs = knobs_from_truth_table(rows)
+        for knob in knobs:
+            self.assertEqual(table.column(knob.symbol), knob.Value)
+
+        oracle = FitnessOracle(target)
+        for expr in ["(AND A B)", "(OR (AND A B) C)", "(NOT (OR A D))", "(AND)", "(OR)",
+                     "(NOT)", "(XOR A B)", "A", "(AND A Z)", "True"]:
+            expected = oracle.get_fitness(Instance(value=expr, id=0, score=0.0, knobs=knobs))
+            self.assertAlmostEqual(table.score(expr), expected, msg=expr)
+
+        columns = {k.symbol: k.Value for k in knobs}
+        self.assertAlmostEqual(table.joint_entropy(["A", "C", "O"]),
+                               calculate_joint_entropy([columns["A"], columns["C"], target]))
+        for name in "ABCD":
+            self.assertAlmostEqual(table.information_gain(name),
+                                   calculate_information_gain(target, columns[name]))
+
+    def test_tab_delimiter_is_detected(self):
+        path = self._write("table.tsv", "\t")
+        self.assertEqual(detect_delimiter(path), "\t")
+        table = stream_truth_table(path, output_col='O', out_path=path + ".bits", chunk_rows=64)
+        self.assertEqual(table.row_count, 101)
+        self.assertEqual(table.column("C"), [r[2] for r in self.rows])
+
+    def test_temporary_bits_file_is_owned_by_the_table(self):
+        path = self._write("table.csv", ",")
+        with stream_truth_table(path, output_col='O') as table:
+            bits_path = table.path
+            self.assertTrue(os.path.exists(bits_path))
+            self.assertEqual(table.row_count, 101)
+        self.assertFalse(os.path.exists(bits_path))
+
+        table = stream_truth_table(path, output_col='O')
+        bits_path = table.path
+        del table
+        self.assertFalse(os.path.exists(bits_path))
+
+        # An explicit out_path belongs to the caller
+        out = os.path.join(self.test_dir, "kept.bits")
+        stream_truth_table(path, output_col='O', out_path=out).close()
+        self.assertTrue(os.path.exists(out))
+
+    def test_blank_lines_inside_a_block(self):
+        path = self._write("table.csv", ",")
+        with open(path) as f:
+            lines = f.readlines()
+        lines[5:5] = ["\n"]
+        lines[30:30] = ["\n", "\n"]
+        with open(path, "w") as f:
+            f.writelines(lines)
+        rows, target = load_truth_table(path, output_col='O')
+        table = stream_truth_table(path, output_col='O', out_path=path + ".bits", chunk_rows=8)
+        self.assertEqual(table.row_count, 101)
+        self.assertEqual(table.target(), target)
+        for knob in knobs_from_truth_table(rows):
+            self.assertEqual(table.column(knob.symbol), knob.Value)
+
+    def test_missing_file(self):
+        self.assertIsNone(stream_truth_table(os.path.join(self.test_dir, "nope.csv")))
+
+
+if __name__ == '__main__':
+    unittest.main()
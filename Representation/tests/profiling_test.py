@@ -0,0 +1,109 @@
+import io
+import os
+import pstats
+import random
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+
+from Representation.csv_parser import load_truth_table
+from Representation.profiling import ProfileConfig, StageProfiler
+from Representation.representation import FitnessOracle, Hyperparams, Instance, knobs_from_truth_table
+from Representation.telemetry import Telemetry, set_telemetry
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "example_data", "test_parity_3.csv")
+
+
+def _inner_work():
+    return sum(i * i for i in range(2000))
+
+
+def _outer_work():
+    return sum(i for i in range(2000))
+
+
+class TestStageProfiler(unittest.TestCase):
+    def tearDown(self):
+        set_telemetry(None)
+
+    def _functions(self, path):
+        return {func[2] for func in pstats.Stats(path).stats}
+
+    def test_nested_stages_are_profiled_exclusively(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            telemetry = Telemetry()
+            telemetry.profiler = StageProfiler(ProfileConfig(stages=("sampling", "mrmr"), output_dir=tmp))
+            with telemetry.timer("sampling"):
+                _outer_work()
+                with telemetry.timer("mrmr"):
+                    _inner_work()
+                with telemetry.timer("reduction"):   # not selected: stays in "sampling"
+                    _inner_work()
+            paths = telemetry.profiler.close()
+
+            self.assertEqual([os.path.basename(p) for p in paths], ["mrmr.pstats", "sampling.pstats"])
+            self.assertIn("_inner_work", self._functions(os.path.join(tmp, "mrmr.pstats")))
+            self.assertNotIn("_outer_work", self._functions(os.path.join(tmp, "mrmr.pstats")))
+            self.assertIn("_outer_work", self._functions(os.path.join(tmp, "sampling.pstats")))
+            self.assertIn("_inner_work", self._functions(os.path.join(tmp, "sampling.pstats")))
+
+    def test_iteration_filter(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            telemetry = Telemetry()
+            telemetry.profiler = StageProfiler(ProfileConfig(stages=("fitness",), output_dir=tmp,
+                                                             iterations={2}))
+            for iteration in (1, 2, 3):
+                with telemetry.scope(iteration=iteration), telemetry.timer("fitness"):
+                    _inner_work()
+            telemetry.profiler.close()
+            calls = {func[2]: stat[1] for func, stat in
+                     pstats.Stats(os.path.join(tmp, "fitness.pstats")).stats.items()}
+            self.assertEqual(calls["_inner_work"], 1)
+            self.assertEqual(telemetry.context, {})
+
+    def test_sampling_mode_writes_collapsed_stacks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            telemetry = Telemetry()
+            telemetry.profiler = StageProfiler(ProfileConfig(stages=("mining",), mode="sampling",
+                                                             output_dir=tmp, interval=0.001))
+            with telemetry.timer("mining"):
+                deadline = time.perf_counter() + 0.1
+                while time.perf_counter() < deadline:
+                    _inner_work()
+            telemetry.profiler.close()
+            with open(os.path.join(tmp, "mining.collapsed")) as f:
+                lines = f.read().splitlines()
+        self.assertTrue(lines)
+        stack, count = lines[0].rsplit(" ", 1)
+        self.assertGreater(int(count), 0)
+        self.assertIn("test_sampling_mode_writes_collapsed_stacks", stack)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            StageProfiler(ProfileConfig(mode="perf"))
+
+    def test_run_moses_profiles_one_deme(self):
+        from main import run_moses
+
+        inputs, target = load_truth_table(CSV_PATH, output_col='O')
+        knobs = [k for k in knobs_from_truth_table(inputs) if k.symbol != 'O']
+        hp = Hyperparams(mutation_rate=0.3, crossover_rate=0.5, num_generations=2,
+                         neighborhood_size=10, bernoulli_prob=0.6, uniform_prob=0.6)
+        for fg_type in ("alpha", "beta"):
+            random.seed(3)
+            fitness = FitnessOracle(target)
+            exemplar = Instance(value="(AND)", id=0, score=0.0, knobs=knobs)
+            fitness.get_fitness(exemplar)
+            with tempfile.TemporaryDirectory() as tmp:
+                config = ProfileConfig(stages=("run", "deme"), output_dir=tmp, iterations={1}, demes={0})
+                with redirect_stdout(io.StringIO()):
+                    run_moses(exemplar, fitness, hp, knobs, target, CSV_PATH, [exemplar], max_iter=2,
+                              fg_type=fg_type, telemetry=Telemetry(verbosity=0), profile=config)
+                self.assertEqual(os.listdir(tmp), ["deme.pstats"])
+                hot_path = "run_deme_eda" if fg_type == "alpha" else "run_variation"
+                self.assertIn(hot_path, self._functions(os.path.join(tmp, "deme.pstats")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import random
+import unittest
+
+from Representation.racing import RacingEvaluator, check_racing_config, stratified_order
+from Representation.representation import Deme, FitnessOracle, Hyperparams, Instance, Knob
+from Representation.selection import select_top_k
+
+
+class TestRacing(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        n = 4000
+        self.knobs = [Knob(symbol=s, id=i, Value=[rng.random() < 0.5 for _ in range(n)])
+                      for i, s in enumerate("ABCDE")]
+        a, b, c = (k.Value for k in self.knobs[:3])
+        self.target = [(x and y) or (z and rng.random() < 0.9) for x, y, z in zip(a, b, c)]
+        symbols = ["A", "B", "C", "D", "E", "(NOT A)", "(NOT C)", "(NOT E)"]
+        self.values = sorted({f"({rng.choice(['AND', 'OR'])} {' '.join(rng.sample(symbols, 2))})"
+                              for _ in range(80)})
+
+    def _instances(self):
+        return [Instance(value=v, id=i, score=0.0, knobs=self.knobs) for i, v in enumerate(self.values)]
+
+    def test_stratified_prefixes(self):
+        target = [i % 4 == 0 for i in range(1000)]
+        order = stratified_order(target, seed=3)
+        self.assertEqual(sorted(order), list(range(1000)))
+        for m in (40, 200, 600):
+            share = sum(target[i] for i in order[:m]) / m
+            self.assertAlmostEqual(share, 0.25, delta=0.03)
+
+    def test_race_returns_exact_top_k(self):
+        exact = self._instances()
+        oracle = FitnessOracle(self.target)
+        for inst in exact:
+            oracle.get_fitness(inst)
+        expected = sorted(exact, key=lambda inst: inst.score, reverse=True)[:5]
+
+        for bound in ("hoeffding", "bernstein"):
+            racer = RacingEvaluator(FitnessOracle(self.target), initial_rows=100, bound=bound)
+            raced = self._instances()
+            top = racer.select_top_k(raced, 5)
+            self.assertEqual([(i.value, i.score) for i in top], [(i.value, i.score) for i in expected])
+            # losers were not scored on the full table and rank below the top-k
+            self.assertLess(len(racer.fitness.memo), len(self.values))
+            for inst in raced:
+                if inst.value not in racer.fitness.memo:
+                    self.assertLess(inst.score, top[-1].score)
+
+    def test_select_top_k_uses_racer(self):
+        deme = Deme(self._instances(), "Deme-01", Hyperparams(0.1, 0.1, 10, 5))
+        racer = RacingEvaluator(FitnessOracle(self.target), initial_rows=100)
+        top = select_top_k(deme, 3, racer=racer)
+        self.assertEqual([i.value for i in top], [i.value for i in select_top_k(deme, 3)])
+        fresh = FitnessOracle(self.target)
+        for inst in top:
+            probe = Instance(value=inst.value, id=0, score=0.0, knobs=self.knobs)
+            self.assertEqual(fresh.get_fitness(probe), inst.score)
+
+    def test_small_tables_are_scored_exactly(self):
+        racer = RacingEvaluator(FitnessOracle(self.target[:50]), initial_rows=256)
+        knobs = [Knob(k.symbol, k.id, k.Value[:50]) for k in self.knobs]
+        insts = [Instance(value=v, id=0, score=0.0, knobs=knobs) for v in self.values]
+        racer.select_top_k(insts, 5)
+        self.assertEqual(len(racer.fitness.memo), len(self.values))
+
+    def test_retain_drops_progress(self):
+        racer = RacingEvaluator(FitnessOracle(self.target), initial_rows=100)
+        raced = self._instances()
+        top = racer.select_top_k(raced, 3)
+        self.assertTrue(racer.progress)
+        racer.retain(inst.value for inst in top)
+        self.assertEqual(racer.progress, {})
+
+    def test_racing_excludes_block_size(self):
+        hp = Hyperparams(0.1, 0.1, 10, 5, racing_delta=0.05, fitness_block_size=256)
+        with self.assertRaises(ValueError):
+            check_racing_config(hp)
+        check_racing_config(Hyperparams(0.1, 0.1, 10, 5, racing_delta=0.05))
+        check_racing_config(Hyperparams(0.1, 0.1, 10, 5, fitness_block_size=256))
+
+    def test_unknown_bound(self):
+        with self.assertRaises(ValueError):
+            RacingEvaluator(FitnessOracle(self.target), bound="chernoff")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,11 +3,11 @@ import random
 from copy import deepcopy
 from Representation.sampling import (randomUniform, randomBernoulli,
                                      sample_new_instances, sample_logical_perms,
-                                     sample_from_TTable)
+                                     sample_from_TTable, ExemplarTree, exemplar_tree)
 from Representation.representation import (Instance, Knob, Deme,
                                            Hyperparams, knobs_from_truth_table)
 from Representation.csv_parser import load_truth_table
-from Representation.helpers import TreeNode, parse_sexpr, tokenize, isOP
+from Representation.helpers import TreeNode, parse_sexpr, tokenize, isOP, prune_duplicate_children
 
 class TestRandomUniform(unittest.TestCase):
     def setUp(self):
@@ -317,6 +317,49 @@ class TestSampleNewInstances(unittest.TestCase):
         different_values = [inst for inst in new_instances if inst.value != self.instance.value]
         self.assertGreater(len(different_values), 0)
 
+class TestExemplarTree(unittest.TestCase):
+    def setUp(self):
+        self.knobs = [Knob(symbol=s, id=i, Value=[True, False]) for i, s in enumerate("ABCD")]
+        self.hyperparams = Hyperparams(
+            mutation_rate=0.1, crossover_rate=0.5, neighborhood_size=20,
+            num_generations=1, bernoulli_prob=0.0, uniform_prob=0.0
+        )
+
+    def test_nodes_and_candidates_in_breadth_first_order(self):
+        tree = ExemplarTree("(AND A (OR B (NOT C)))")
+        self.assertEqual(tree.op, "AND")
+        self.assertEqual(tree.labels, ["AND", "A", "OR", "B", "NOT", "C"])
+        self.assertEqual(tree.text[2], "(OR B (NOT C))")
+        self.assertEqual(tree.candidates, [(0, None), (0, None), (2, 0), (2, 0), (4, 2)])
+        self.assertTrue(tree.canonical)
+        self.assertFalse(ExemplarTree("(AND A (OR B B))").canonical)
+
+    def test_exemplar_parsed_once_per_neighborhood(self):
+        exemplar_tree.cache_clear()
+        instance = Instance(value="(AND A (OR B C))", id=1, score=0.0, knobs=self.knobs[:3])
+        random.seed(0)
+        sample_new_instances(self.hyperparams, instance, self.knobs, self.knobs)
+        info = exemplar_tree.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, self.hyperparams.neighborhood_size - 1)
+
+    def test_matches_full_tree_pruning(self):
+        # Every sample equals parsing its value and pruning the whole tree
+        for value in ["(AND A (OR B C))", "(AND (OR A B) (OR A B C))", "(AND A A)", "(OR (AND A B) C)"]:
+            instance = Instance(value=value, id=1, score=0.0, knobs=self.knobs)
+            for seed in range(20):
+                random.seed(seed)
+                new_inst = randomBernoulli(self.hyperparams, instance, self.knobs, self.knobs)
+                self.assertEqual(new_inst.value,
+                                 str(prune_duplicate_children(parse_sexpr(tokenize(new_inst.value)))))
+
+    def test_samples_share_knob_objects(self):
+        instance = Instance(value="(AND A B)", id=1, score=0.0, knobs=self.knobs[:2])
+        random.seed(0)
+        new_inst = randomBernoulli(self.hyperparams, instance, self.knobs[2:], self.knobs)
+        self.assertIs(new_inst.knobs[0], self.knobs[0])
+        self.assertIsNot(new_inst.knobs, instance.knobs)
+
 class TestSampleLogicalPerms(unittest.TestCase):
     def test_sample_logical_perms(self):
             knobs = [
@@ -341,6 +384,34 @@ class TestSampleLogicalPerms(unittest.TestCase):
             candidates_or, new_knobs = sample_logical_perms("OR", knobs)
             self.assertIn("(AND A B)", candidates_or)
 
+    def test_lazy_menu_matches_eager_order(self):
+        symbols = ["A", "B", "C", "D"]
+        expected = list(symbols)
+        for i in range(len(symbols)):
+            for j in range(i + 1, len(symbols)):
+                a, b = symbols[i], symbols[j]
+                expected += [f"(OR {a} {b})", f"(OR (NOT {a}) {b})",
+                             f"(OR {a} (NOT {b}))", f"(OR (NOT {a}) (NOT {b}))"]
+        menu, _ = sample_logical_perms("AND", [Knob(symbol=s, id=i, Value=[]) for i, s in enumerate(symbols)])
+        self.assertEqual(len(menu), len(expected))
+        self.assertEqual(list(menu), expected)
+        self.assertEqual(menu[-1], expected[-1])
+        self.assertEqual(menu[5:9], expected[5:9])
+
+    def test_geometric_skipping_keeps_item_probability(self):
+        hp = Hyperparams(mutation_rate=0.1, crossover_rate=0.5, num_generations=1,
+                         neighborhood_size=1, uniform_prob=0.8)
+        menu = list(range(200))
+        random.seed(5)
+        counts = [0] * len(menu)
+        runs = 2000
+        for _ in range(runs):
+            for item in randomUniform(menu, hp):
+                counts[item] += 1
+        self.assertAlmostEqual(sum(counts) / (runs * len(menu)), 0.2, delta=0.01)
+        self.assertAlmostEqual(sum(counts[:20]) / (runs * 20), 0.2, delta=0.02)
+        self.assertAlmostEqual(sum(counts[-20:]) / (runs * 20), 0.2, delta=0.02)
+
 class TestSampleFromTTable(unittest.TestCase):
     def setUp(self):
         # Use the provided binary truth table CSV
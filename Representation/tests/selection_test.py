@@ -1,9 +1,13 @@
 import unittest
+import random
+
 from Representation.selection import (
+    score_for_top_k,
     select_top_k,
     tournament_selection,
 )
 from Representation.representation import (
+    FitnessOracle,
     Instance,
     Deme,
     Knob,
@@ -51,4 +55,31 @@ class TestSelection(unittest.TestCase):
 
         winners = tournament_selection(deme, k=1, tournament_size=3)
         self.assertEqual(len(winners), 1)
-        self.assertEqual(winners[0].id, 1)
\ No newline at end of file
+        self.assertEqual(winners[0].id, 1)
+
+    def test_score_for_top_k_keeps_exact_top_k(self):
+        rng = random.Random(1)
+        n = 300
+        knobs = [Knob(symbol=s, id=i, Value=[rng.random() < 0.5 for _ in range(n)])
+                 for i, s in enumerate("ABCD")]
+        target = [a and (b or c) for a, b, c in zip(knobs[0].Value, knobs[1].Value, knobs[2].Value)]
+        symbols = ["A", "B", "C", "D", "(NOT A)", "(NOT B)", "(NOT C)", "(NOT D)"]
+        values = list({f"({rng.choice(['AND', 'OR'])} {' '.join(rng.sample(symbols, 3))})"
+                       for _ in range(60)})
+
+        def deme():
+            instances = [Instance(value=v, id=i, score=0.0, knobs=knobs) for i, v in enumerate(values)]
+            return Deme(instances, "Deme-01", Hyperparams(0.1, 0.1, 10, 5))
+
+        exact, bounded = deme(), deme()
+        self.assertEqual(score_for_top_k(exact.instances, FitnessOracle(target), k=5), 0)
+        aborted = score_for_top_k(bounded.instances, FitnessOracle(target), k=5, block_size=32)
+
+        self.assertGreater(aborted, 0)
+        self.assertEqual([i.value for i in select_top_k(bounded, 5)],
+                         [i.value for i in select_top_k(exact, 5)])
+        cutoff = select_top_k(exact, 5)[-1].score
+        for b, e in zip(bounded.instances, exact.instances):
+            self.assertGreaterEqual(b.score, e.score)
+            if b.score != e.score:
+                self.assertLess(b.score, cutoff)
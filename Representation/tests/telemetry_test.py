@@ -0,0 +1,110 @@
+import io
+import json
+import os
+import random
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from Representation.representation import FitnessOracle, Hyperparams, Instance, Knob, knobs_from_truth_table
+from Representation.csv_parser import load_truth_table
+from Representation.telemetry import (JsonlSink, MemorySink, Telemetry, get_telemetry,
+                                      log, set_telemetry)
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "example_data", "test_parity_3.csv")
+
+
+class TestTelemetry(unittest.TestCase):
+    def tearDown(self):
+        set_telemetry(None)
+
+    def test_timers_and_counters_accumulate(self):
+        telemetry = Telemetry(MemorySink())
+        with telemetry.timer("fitness"):
+            pass
+        with telemetry.timer("fitness"):
+            pass
+        telemetry.count("fitness_cache_hits", 3)
+        record = telemetry.snapshot(iteration=1)
+
+        self.assertEqual(record["calls"]["fitness"], 2)
+        self.assertGreaterEqual(record["timers"]["fitness"], 0.0)
+        self.assertEqual(record["counters"], {"fitness_cache_hits": 3})
+        self.assertEqual(telemetry.sink.records, [record])
+
+    def test_jsonl_sink_writes_one_record_per_line(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "run.jsonl")
+            telemetry = Telemetry(JsonlSink(path))
+            telemetry.event("start", strategy="beta")
+            telemetry.snapshot(iteration=1)
+            telemetry.close()
+            with open(path) as f:
+                records = [json.loads(line) for line in f]
+        self.assertEqual([r["type"] for r in records], ["event", "snapshot"])
+        self.assertEqual(records[0]["strategy"], "beta")
+
+    def test_log_respects_verbosity(self):
+        set_telemetry(Telemetry(verbosity=1))
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            log("summary")
+            log("detail", level=2)
+        self.assertEqual(buf.getvalue(), "summary\n")
+
+    def test_fitness_oracle_reports_cache_hits(self):
+        telemetry = set_telemetry(Telemetry())
+        knobs = [Knob(symbol="A", id=1, Value=[False, True]), Knob(symbol="B", id=2, Value=[True, True])]
+        oracle = FitnessOracle([False, True])
+        for _ in range(3):
+            oracle.get_fitness(Instance(value="(AND A B)", id=0, score=0.0, knobs=knobs))
+        self.assertEqual(telemetry.calls["fitness"], 1)
+        self.assertEqual(telemetry.counters["fitness_cache_hits"], 2)
+
+    def test_silent_run_records_stages(self):
+        from main import run_moses
+        from Representation.sampling import MRMR_CACHE
+
+        MRMR_CACHE.clear()  # an earlier test may have cached this table's features
+
+        inputs, target = load_truth_table(CSV_PATH, output_col='O')
+        knobs = [k for k in knobs_from_truth_table(inputs) if k.symbol != 'O']
+        hp = Hyperparams(mutation_rate=0.3, crossover_rate=0.5, num_generations=2,
+                         neighborhood_size=10, bernoulli_prob=0.6, uniform_prob=0.6)
+        random.seed(2)
+        fitness = FitnessOracle(target)
+        exemplar = Instance(value="(AND)", id=0, score=0.0, knobs=knobs)
+        fitness.get_fitness(exemplar)
+
+        sink = MemorySink()
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            run_moses(exemplar, fitness, hp, knobs, target, CSV_PATH, [exemplar],
+                      max_iter=3, fg_type="beta", telemetry=Telemetry(sink, verbosity=0))
+
+        self.assertEqual(buf.getvalue(), "")
+        self.assertTrue(sink.records)
+        last = sink.records[-1]
+        for stage in ("sampling", "mrmr", "reduction", "fitness", "mining", "propagation", "variation"):
+            self.assertIn(stage, last["timers"])
+        self.assertGreater(last["counters"]["candidates_generated"], 0)
+
+    def test_run_restores_previous_telemetry(self):
+        from main import run_moses
+
+        outer = set_telemetry(Telemetry(verbosity=0))
+        inputs, target = load_truth_table(CSV_PATH, output_col='O')
+        knobs = [k for k in knobs_from_truth_table(inputs) if k.symbol != 'O']
+        hp = Hyperparams(mutation_rate=0.3, crossover_rate=0.5, num_generations=1,
+                         neighborhood_size=5, bernoulli_prob=0.6, uniform_prob=0.6)
+        random.seed(3)
+        fitness = FitnessOracle(target)
+        exemplar = Instance(value="(AND)", id=0, score=0.0, knobs=knobs)
+        fitness.get_fitness(exemplar)
+        run_moses(exemplar, fitness, hp, knobs, target, CSV_PATH, [exemplar],
+                  max_iter=1, fg_type="beta", telemetry=Telemetry(MemorySink(), verbosity=0))
+        self.assertIs(get_telemetry(), outer)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,6 +9,7 @@ from Representation.representation import (Quantale, Instance,
 from Representation.csv_parser import load_truth_table
 from Representation.sampling import sample_from_TTable
 from Representation.helpers import tokenize, get_top_level_features
+from Representation.telemetry import log
 from typing import Any, Set, List, Dict, Tuple
 import random
 
@@ -149,7 +150,7 @@ def crossTopOne(instances: List[Instance], stv_dict: Dict[str, Tuple[float, floa
     rest_population = sorted_instances[1:]
     
     children = []
-    print(f"\nTop Parent Selected for Crossover: {top_parent.value} | Score: {top_parent.score}")
+    log(f"\nTop Parent Selected for Crossover: {top_parent.value} | Score: {top_parent.score}", level=2)
     # 2. Crossover Top One with everyone else
     for spouse in rest_population:
         # Initialize Crossover Quantale with Top Parent and the Spouse
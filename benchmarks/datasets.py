@@ -0,0 +1,120 @@
+"""
+Reproducible synthetic truth tables for benchmarks.
+
+Every generator returns ``(columns, rows, target)``:
+    columns  input column names (never 'O', which is the target column)
+    rows     list of rows, each a list of bools aligned with *columns*
+    target   list of bools
+
+``rows=None`` enumerates the full truth table (2**n_inputs rows);
+otherwise *rows* rows are drawn uniformly at random.  ``n_distractors``
+adds irrelevant random columns.  Everything is driven by *seed*.
+"""
+
+import csv
+import itertools
+import random
+from typing import Callable, List, Optional, Sequence, Tuple
+
+Table = Tuple[List[str], List[List[bool]], List[bool]]
+
+# Single letters first ('O' is the target, 'T'/'F' read as truth values),
+# then X<n> once those run out.
+_LETTERS = [c for c in "ABCDEGHIJKLMNPQRSUVWXYZ"]
+
+
+def column_names(n: int) -> List[str]:
+    if n <= len(_LETTERS):
+        return _LETTERS[:n]
+    return _LETTERS + [f"X{i}" for i in range(len(_LETTERS), n)]
+
+
+def _inputs(n_inputs: int, rows: Optional[int], rng: random.Random) -> List[List[bool]]:
+    if rows is None:
+        return [list(bits) for bits in itertools.product([False, True], repeat=n_inputs)]
+    return [[rng.random() < 0.5 for _ in range(n_inputs)] for _ in range(rows)]
+
+
+def _table(n_inputs: int, label: Callable[[List[bool]], bool], rows: Optional[int],
+           n_distractors: int, seed: int, noise: float = 0.0) -> Table:
+    rng = random.Random(seed)
+    data = _inputs(n_inputs, rows, rng)
+    target = []
+    for row in data:
+        value = label(row)
+        if noise and rng.random() < noise:
+            value = not value
+        target.append(value)
+    for row in data:
+        row.extend(rng.random() < 0.5 for _ in range(n_distractors))
+    return column_names(n_inputs + n_distractors), data, target
+
+
+def parity(n: int, rows: Optional[int] = None, n_distractors: int = 0, seed: int = 0) -> Table:
+    """Odd parity of the first *n* inputs."""
+    return _table(n, lambda r: sum(r) % 2 == 1, rows, n_distractors, seed)
+
+
+def majority(n: int, rows: Optional[int] = None, n_distractors: int = 0, seed: int = 0) -> Table:
+    """True when more than half of the *n* inputs are true."""
+    return _table(n, lambda r: 2 * sum(r) > n, rows, n_distractors, seed)
+
+
+def random_dnf(n: int, n_terms: int = 3, term_size: int = 2, rows: Optional[int] = None,
+               n_distractors: int = 0, seed: int = 0) -> Table:
+    """OR of *n_terms* random conjunctions of *term_size* (possibly negated) literals."""
+    rng = random.Random(seed + 1)
+    terms = []
+    for _ in range(n_terms):
+        variables = rng.sample(range(n), min(term_size, n))
+        terms.append([(v, rng.random() < 0.5) for v in variables])
+
+    def label(r: List[bool]) -> bool:
+        return any(all(r[v] != negated for v, negated in term) for term in terms)
+
+    return _table(n, label, rows, n_distractors, seed)
+
+
+def noisy_multiplexer(address_bits: int, noise: float = 0.05, rows: Optional[int] = None,
+                      n_distractors: int = 0, seed: int = 0) -> Table:
+    """k-address multiplexer (k + 2**k inputs); each label flips with probability *noise*."""
+    n = address_bits + 2 ** address_bits
+
+    def label(r: List[bool]) -> bool:
+        address = 0
+        for bit in r[:address_bits]:
+            address = 2 * address + int(bit)
+        return r[address_bits + address]
+
+    return _table(n, label, rows, n_distractors, seed, noise=noise)
+
+
+GENERATORS = {
+    "parity": parity,
+    "majority": majority,
+    "random_dnf": random_dnf,
+    "noisy_multiplexer": noisy_multiplexer,
+}
+
+
+def write_csv(path: str, table: Table, output_col: str = "O") -> str:
+    """Write *table* in the repo's truth-table CSV layout (0/1, target last)."""
+    columns, rows, target = table
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(list(columns) + [output_col])
+        for row, label in zip(rows, target):
+            writer.writerow([int(v) for v in row] + [int(label)])
+    return path
+
+
+def random_program(symbols: Sequence[str], depth: int, rng: random.Random,
+                   max_args: int = 3) -> str:
+    """A random AND/OR/NOT program over *symbols*, at most *depth* levels deep."""
+    if depth <= 0 or rng.random() < 0.2:
+        leaf = rng.choice(symbols)
+        return f"(NOT {leaf})" if rng.random() < 0.3 else leaf
+    op = rng.choice(["AND", "OR"])
+    args = [random_program(symbols, depth - 1, rng, max_args)
+            for _ in range(rng.randint(2, max_args))]
+    return f"({op} {' '.join(args)})"
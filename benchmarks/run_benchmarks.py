@@ -0,0 +1,383 @@
+"""
+Benchmark harness for MOSES-MORK.
+
+Runs micro-benchmarks of the hot paths and end-to-end time-to-solution
+runs on synthetic truth tables (benchmarks/datasets.py), and writes one
+JSON file that can be compared against the output of another commit:
+
+    python -m benchmarks.run_benchmarks --out bench_new.json
+    python -m benchmarks.run_benchmarks --quick --compare bench_old.json
+
+Every benchmark is seeded, so two runs of the same commit do the same work.
+Timings are reported as min / median / mean seconds over ``--repeat`` runs;
+compare the medians.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from benchmarks.datasets import GENERATORS, random_program, write_csv
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# ==============================================================================
+# Timing helpers
+# ==============================================================================
+
+def _timed(fn: Callable[[], object], repeat: int, setup: Optional[Callable[[], object]] = None) -> dict:
+    """Time *fn* *repeat* times; *setup* (untimed) runs before each call and its
+    result is passed to *fn*."""
+    samples = []
+    for _ in range(repeat):
+        arg = setup() if setup is not None else None
+        start = time.perf_counter()
+        if setup is not None:
+            fn(arg)
+        else:
+            fn()
+        samples.append(time.perf_counter() - start)
+    return {
+        "repeat": repeat,
+        "min": round(min(samples), 6),
+        "median": round(statistics.median(samples), 6),
+        "mean": round(statistics.mean(samples), 6),
+    }
+
+
+def _metadata(config: dict) -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "config": config,
+    }
+
+
+def _load(table, tmp: str, name: str):
+    """Write *table* to CSV and load it back the way main.py does."""
+    from Representation.csv_parser import load_truth_table
+    from Representation.representation import knobs_from_truth_table
+
+    path = write_csv(os.path.join(tmp, f"{name}.csv"), table)
+    inputs, target = load_truth_table(path, output_col='O')
+    knobs = [k for k in knobs_from_truth_table(inputs) if k.symbol != 'O']
+    return path, knobs, target
+
+
+# ==============================================================================
+# Micro-benchmarks
+# ==============================================================================
+
+def bench_fitness(table, tmp, repeat, n_programs=200, depth=4):
+    """FitnessOracle.get_fitness on fresh (uncached) random programs."""
+    from Representation.representation import FitnessOracle, Instance
+
+    _, knobs, target = _load(table, tmp, "fitness")
+    rng = random.Random(0)
+    symbols = [k.symbol for k in knobs]
+    programs = [random_program(symbols, depth, rng) for _ in range(n_programs)]
+
+    def run(oracle):
+        for value in programs:
+            oracle.get_fitness(Instance(value=value, id=0, score=0.0, knobs=knobs))
+
+    result = _timed(run, repeat, setup=lambda: FitnessOracle(target))
+    result.update(rows=len(target), programs=n_programs)
+    return result
+
+
+def bench_fitness_batch(table, tmp, repeat, n_programs=200, depth=4):
+    """FitnessOracle.get_fitness_many on the same programs as bench_fitness."""
+    from Representation.representation import FitnessOracle, Instance
+
+    _, knobs, target = _load(table, tmp, "fitness")
+    rng = random.Random(0)
+    symbols = [k.symbol for k in knobs]
+    programs = [random_program(symbols, depth, rng) for _ in range(n_programs)]
+
+    def run(oracle):
+        oracle.get_fitness_many([Instance(value=v, id=0, score=0.0, knobs=knobs) for v in programs])
+
+    result = _timed(run, repeat, setup=lambda: FitnessOracle(target))
+    result.update(rows=len(target), programs=n_programs)
+    return result
+
+
+def bench_reduce(table, tmp, repeat, n_programs=30, depth=3):
+    """reduct reduce() on random programs, bypassing REDUCTION_CACHE."""
+    from hyperon import MeTTa
+    from reduct.enf.main import reduce
+
+    rng = random.Random(1)
+    symbols = table[0][:6]
+    programs = [random_program(symbols, depth, rng) for _ in range(n_programs)]
+    metta = MeTTa()
+
+    def run():
+        for value in programs:
+            reduce(metta, value)
+
+    result = _timed(run, repeat)
+    result.update(programs=n_programs)
+    return result
+
+
+def bench_miner(table, tmp, repeat, n_programs=500, depth=4):
+    """DependencyMiner.fit + get_meaningful_dependencies."""
+    from DependencyMiner.miner import DependencyMiner
+
+    rng = random.Random(2)
+    symbols = table[0]
+    programs = [random_program(symbols, depth, rng) for _ in range(n_programs)]
+    weights = [rng.random() for _ in programs]
+
+    def run():
+        DependencyMiner().fit(programs, weights).get_meaningful_dependencies()
+
+    result = _timed(run, repeat)
+    result.update(programs=n_programs)
+    return result
+
+
+def bench_mrmr(table, tmp, repeat, max_interaction_order=2):
+    """interaction_aware_mrmr on the generated CSV."""
+    from Feature_selection_algo.interaction_mrmr import interaction_aware_mrmr
+
+    path, _, target = _load(table, tmp, "mrmr")
+
+    def run():
+        with redirect_stdout(io.StringIO()):
+            interaction_aware_mrmr(path, 'O', k=None, max_interaction_order=max_interaction_order)
+
+    result = _timed(run, repeat)
+    result.update(rows=len(target), columns=len(table[0]))
+    return result
+
+
+def bench_evidence_propagation(table, tmp, repeat, n_rules=300, steps=10):
+    """BetaFactorGraph.run_evidence_propagation on random rules and priors."""
+    from FactorGraph_EDA.beta_bp import BetaFactorGraph
+
+    rng = random.Random(3)
+    symbols = table[0]
+    nodes = symbols + [f"(NOT {s})" for s in symbols]
+    rows = []
+    for _ in range(n_rules):
+        a, b = rng.sample(nodes, 2)
+        rows.append({"pair": f"{a} -- {b}", "strength": rng.random(), "confidence": rng.random()})
+    priors = [(name, rng.random(), rng.random()) for name in rng.sample(nodes, len(nodes) // 3)]
+
+    def build():
+        bg = BetaFactorGraph()
+        bg.add_dependency_rules(rows)
+        for name, s, c in priors:
+            bg.set_prior(name, s, c)
+        return bg
+
+    def run(bg):
+        with redirect_stdout(io.StringIO()):
+            bg.run_evidence_propagation(steps=steps)
+
+    result = _timed(run, repeat, setup=build)
+    result.update(rules=n_rules, nodes=len(nodes), steps=steps)
+    return result
+
+
+def bench_factor_graph_sampling(table, tmp, repeat, n_factors=300, n_samples=500):
+    """sample_from_factor_graph on a random factor graph."""
+    from FactorGraph_EDA.eda import sample_from_factor_graph
+    from FactorGraph_EDA.factor_graph import FactorGraph
+
+    _, knobs, _ = _load(table, tmp, "fg")
+    rng = random.Random(4)
+    symbols = table[0]
+    nodes = symbols + [f"(NOT {s})" for s in symbols]
+    fg = FactorGraph()
+    for name in nodes:
+        fg.set_variable(name, (rng.random(), rng.random()))
+    for _ in range(n_factors):
+        a, b = rng.sample(nodes, 2)
+        fg.set_factor(a, b, (rng.random(), rng.random()))
+
+    def run():
+        sample_from_factor_graph(fg, n_samples, "AND", knobs, rng=0)
+
+    result = _timed(run, repeat)
+    result.update(variables=len(nodes), factors=len(fg.factors), samples=n_samples)
+    return result
+
+
+MICRO_BENCHMARKS = {
+    "fitness": bench_fitness,
+    "fitness_batch": bench_fitness_batch,
+    "reduce": bench_reduce,
+    "miner": bench_miner,
+    "mrmr": bench_mrmr,
+    "evidence_propagation": bench_evidence_propagation,
+    "factor_graph_sampling": bench_factor_graph_sampling,
+}
+
+
+# ==============================================================================
+# End-to-end time-to-solution
+# ==============================================================================
+
+def run_end_to_end(table, tmp, name, fg_type, seeds, max_iter, hp_kwargs) -> dict:
+    """Silent run_moses per seed: wall time, iterations, best score, solved."""
+    from main import run_moses
+    from Representation.representation import FitnessOracle, Hyperparams, Instance
+    from Representation.telemetry import MemorySink, Telemetry, set_telemetry
+
+    path, knobs, target = _load(table, tmp, name)
+    runs = []
+    for seed in seeds:
+        random.seed(seed)
+        hp = Hyperparams(**hp_kwargs)
+        fitness = FitnessOracle(target)
+        exemplar = Instance(value="(AND)", id=0, score=0.0, knobs=knobs)
+        exemplar.score = fitness.get_fitness(exemplar)
+        sink = MemorySink()
+
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            final = run_moses(exemplar, fitness, hp, knobs, target, path, [exemplar],
+                              max_iter=max_iter, fg_type=fg_type,
+                              telemetry=Telemetry(sink, verbosity=0))
+        elapsed = time.perf_counter() - start
+        set_telemetry(None)
+
+        best = max(final, key=lambda inst: inst.score) if final else None
+        snapshots = [r for r in sink.records if r.get("type") == "snapshot"]
+        runs.append({
+            "seed": seed,
+            "seconds": round(elapsed, 6),
+            "iterations": len(snapshots),
+            "best_score": best.score if best else None,
+            "best_program": best.value if best else None,
+            "solved": bool(best and best.score >= 1.0),
+            "timers": snapshots[-1]["timers"] if snapshots else {},
+        })
+
+    seconds = [r["seconds"] for r in runs]
+    return {
+        "fg_type": fg_type,
+        "rows": len(target),
+        "solved": sum(r["solved"] for r in runs),
+        "median_seconds": round(statistics.median(seconds), 6),
+        "runs": runs,
+    }
+
+
+# ==============================================================================
+# Driver
+# ==============================================================================
+
+def default_config(quick: bool = False) -> dict:
+    return {
+        "repeat": 3 if quick else 5,
+        "micro_dataset": {"generator": "random_dnf", "n": 6, "n_terms": 3, "term_size": 2,
+                          "rows": 256 if quick else 1024, "n_distractors": 4, "seed": 0},
+        "end_to_end": {
+            "datasets": {
+                "parity_3": {"generator": "parity", "n": 3, "seed": 0},
+                "majority_3": {"generator": "majority", "n": 3, "seed": 0},
+            },
+            "fg_types": ["alpha", "beta"],
+            "seeds": [0, 1] if quick else [0, 1, 2],
+            "max_iter": 3 if quick else 10,
+            "hyperparams": {"mutation_rate": 0.3, "crossover_rate": 0.5,
+                            "num_generations": 3 if quick else 10, "neighborhood_size": 10,
+                            "bernoulli_prob": 0.6, "uniform_prob": 0.6},
+        },
+    }
+
+
+def _make_table(spec: dict):
+    spec = dict(spec)
+    return GENERATORS[spec.pop("generator")](**spec)
+
+
+def run_all(config: dict, only: Optional[List[str]] = None, skip_end_to_end: bool = False) -> dict:
+    result = {"metadata": _metadata(config), "micro": {}, "end_to_end": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        table = _make_table(config["micro_dataset"])
+        for name, bench in MICRO_BENCHMARKS.items():
+            if only and name not in only:
+                continue
+            print(f"[micro] {name} ...", flush=True)
+            result["micro"][name] = bench(table, tmp, config["repeat"])
+
+        if not skip_end_to_end:
+            e2e = config["end_to_end"]
+            for ds_name, spec in e2e["datasets"].items():
+                table = _make_table(spec)
+                for fg_type in e2e["fg_types"]:
+                    key = f"{ds_name}/{fg_type}"
+                    print(f"[end-to-end] {key} ...", flush=True)
+                    result["end_to_end"][key] = run_end_to_end(
+                        table, tmp, ds_name, fg_type, e2e["seeds"], e2e["max_iter"], e2e["hyperparams"])
+    return result
+
+
+def compare(old: dict, new: dict) -> List[str]:
+    """One line per benchmark present in both results: old / new median and ratio."""
+    lines = []
+    for name in sorted(set(old.get("micro", {})) & set(new.get("micro", {}))):
+        a, b = old["micro"][name]["median"], new["micro"][name]["median"]
+        ratio = a / b if b else float("inf")
+        lines.append(f"{name:<28} {a:>10.4f}s -> {b:>10.4f}s   x{ratio:.2f}")
+    for name in sorted(set(old.get("end_to_end", {})) & set(new.get("end_to_end", {}))):
+        a, b = old["end_to_end"][name], new["end_to_end"][name]
+        ratio = a["median_seconds"] / b["median_seconds"] if b["median_seconds"] else float("inf")
+        lines.append(f"{name:<28} {a['median_seconds']:>10.4f}s -> {b['median_seconds']:>10.4f}s   "
+                     f"x{ratio:.2f}   solved {a['solved']} -> {b['solved']}")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default="benchmark_results.json", help="JSON output path")
+    parser.add_argument("--quick", action="store_true", help="smaller datasets and fewer repeats")
+    parser.add_argument("--only", nargs="*", choices=sorted(MICRO_BENCHMARKS),
+                        help="run only these micro-benchmarks")
+    parser.add_argument("--skip-end-to-end", action="store_true")
+    parser.add_argument("--compare", metavar="OLD_JSON", help="print speedups against an earlier result")
+    args = parser.parse_args(argv)
+
+    result = run_all(default_config(args.quick), args.only, args.skip_end_to_end)
+    with open(args.out, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"Results written to {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        print(f"\nCompared with {old['metadata'].get('commit')} (old -> new, x = speedup):")
+        for line in compare(old, result):
+            print("  " + line)
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+from benchmarks.datasets import (column_names, majority, noisy_multiplexer, parity, random_dnf,
+                                 random_program, write_csv)
+from benchmarks.run_benchmarks import compare
+from Representation.csv_parser import load_truth_table
+from Representation.representation import FitnessOracle, Instance, knobs_from_truth_table
+
+
+class TestDatasets(unittest.TestCase):
+    def test_full_tables(self):
+        columns, rows, target = parity(3)
+        self.assertEqual(columns, ["A", "B", "C"])
+        self.assertEqual(len(rows), 8)
+        self.assertEqual(target, [sum(r) % 2 == 1 for r in rows])
+
+        _, rows, target = majority(3)
+        self.assertEqual(sum(target), 4)
+
+    def test_generators_are_seeded(self):
+        for make in (lambda s: parity(4, rows=50, n_distractors=2, seed=s),
+                     lambda s: random_dnf(5, rows=50, seed=s),
+                     lambda s: noisy_multiplexer(2, rows=50, seed=s)):
+            self.assertEqual(make(7), make(7))
+            self.assertNotEqual(make(7), make(8))
+
+    def test_noise_free_multiplexer(self):
+        columns, rows, target = noisy_multiplexer(2, noise=0.0)
+        self.assertEqual(len(columns), 6)
+        for row, label in zip(rows, target):
+            self.assertEqual(label, row[2 + 2 * row[0] + row[1]])
+
+    def test_column_names_skip_reserved(self):
+        names = column_names(30)
+        self.assertEqual(len(set(names)), 30)
+        self.assertFalse({"O", "T", "F"} & set(names))
+
+    def test_csv_round_trip_scores_like_the_label(self):
+        table = random_dnf(4, rows=64, seed=3)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_csv(os.path.join(tmp, "dnf.csv"), table)
+            inputs, target = load_truth_table(path, output_col='O')
+        self.assertEqual(target, table[2])
+        knobs = [k for k in knobs_from_truth_table(inputs) if k.symbol != 'O']
+        self.assertEqual([k.symbol for k in knobs], table[0])
+
+        import random
+        program = random_program(table[0], 3, random.Random(0))
+        score = FitnessOracle(target).get_fitness(Instance(value=program, id=0, score=0.0, knobs=knobs))
+        self.assertGreaterEqual(score, 0.0)
+        self.assertLessEqual(score, 1.0)
+
+    def test_compare_reports_speedup(self):
+        old = {"micro": {"fitness": {"median": 2.0}}, "end_to_end": {}}
+        new = {"micro": {"fitness": {"median": 1.0}, "reduce": {"median": 1.0}}, "end_to_end": {}}
+        lines = compare(old, new)
+        self.assertEqual(len(lines), 1)
+        self.assertIn("x2.00", lines[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
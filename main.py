@@ -1,22 +1,68 @@
 from DependencyMiner.miner import DependencyMiner
 from Representation.representation import *
 from Representation.helpers import *
-from Representation.csv_parser import load_truth_table
+from Representation.csv_parser import load_truth_table, load_collapsed_truth_table
+from Representation.binary_dataset import load_dataset
 from Representation.selection import select_top_k, tournament_selection
 from Representation.sampling import sample_from_TTable
+from Representation.racing import check_racing_config
 from Variation_quantale.crossover import VariationQuantale, crossTopOne
 from Variation_quantale.mutation import Mutation
 from FactorGraph_EDA.beta_bp import BetaFactorGraph
 from Moses.run_bp_moses import run_bp_moses, _finalize_metapop
 from Moses.run_abp_moses import run_abp_moses
+from Moses.checkpoint import load_checkpoint
+from Representation.telemetry import Telemetry, get_telemetry, set_telemetry, log
+from Representation.profiling import ProfileConfig, StageProfiler
+import argparse
+import os
 import random
 import math
-from typing import List
+from typing import List, Optional, Tuple
 import datetime
 
+def load_problem(csv_path: str, output_col: str = 'O', collapse: bool = False,
+                 binary: bool = False) -> Tuple[List[Knob], List[bool], FitnessOracle]:
+    """
+    Loads a truth table for ``run_moses``.
+
+    Args:
+        csv_path: Truth table (CSV / TSV / pipe-separated, or a binary dataset).
+        output_col: Name of the target column.
+        collapse: Merge identical input rows (``load_collapsed_truth_table``)
+                  and score with a weighted ``FitnessOracle.from_counts``;
+                  accuracy is the same as on the full table, for fewer rows.
+        binary: Open the table as a binary dataset (``load_dataset``: a text
+                file is converted once to ``csv_path + ".mbt"``) and score
+                with ``FitnessOracle.from_packed``; the knobs are unpacked
+                from the memory-mapped columns instead of parsed from text.
+    Returns: (knobs, target, fitness)
+    """
+    if collapse and binary:
+        raise ValueError("collapse and binary cannot be combined")
+    if binary:
+        table = load_dataset(csv_path, output_col)
+        fitness = FitnessOracle.from_packed(table)
+        return table.knobs(), fitness.target_vals, fitness
+    if collapse:
+        rows, pos_counts, neg_counts = load_collapsed_truth_table(csv_path, output_col)
+        fitness = FitnessOracle.from_counts(pos_counts, neg_counts)
+        target = fitness.target_vals
+        log(f"Collapsed {sum(pos_counts) + sum(neg_counts)} rows of {csv_path} "
+            f"into {len(rows)} unique patterns", level=2)
+    else:
+        rows, target = load_truth_table(csv_path, output_col=output_col)
+        fitness = FitnessOracle(target)
+    knobs = [k for k in knobs_from_truth_table(rows) if k.symbol != output_col]
+    return knobs, target, fitness
+
+
 def run_moses(exemplar: Instance, fitness: FitnessOracle, hyperparams: Hyperparams, 
               knobs: List[Knob], target: List[bool], csv_path: str, 
-              metapop: List[Instance], max_iter: int = 100, fg_type: str = "alpha") -> List[Instance]:
+              metapop: List[Instance], max_iter: int = 100, fg_type: str = "alpha",
+              checkpoint_path: Optional[str] = None, checkpoint_every: int = 1,
+              resume: bool = False, telemetry: Optional[Telemetry] = None,
+              profile: Optional[ProfileConfig] = None) -> List[Instance]:
     """
     Unified entry point for running MOSES optimization.
     
@@ -30,12 +76,58 @@ def run_moses(exemplar: Instance, fitness: FitnessOracle, hyperparams: Hyperpara
         metapop: Initial metapopulation
         max_iter: Maximum iterations
         fg_type: 'beta' for beta-variational MOSES, 'alpha' for standard MOSES
+        checkpoint_path: If set, the run state is checkpointed to this file
+        checkpoint_every: Iterations between checkpoints
+        resume: Continue from *checkpoint_path* if it exists (exemplar,
+                metapop and max_iter are then taken from the checkpoint)
+        telemetry: Stage timers / counters sink and verbosity for this run
+                   (see Representation/telemetry.py); one snapshot is
+                   emitted per iteration
+        profile: Profile the selected stages / iterations / demes with
+                 cProfile or the sampling profiler and write one output
+                 file per stage (see Representation/profiling.py)
     
     Returns: Final metapopulation of instances after evolution.
     """
     
-    print(f"Starting MOSES Run with Strategy: {fg_type.upper()}")
-    
+    check_racing_config(hyperparams, fitness)
+
+    # The run's telemetry is installed process-wide and the caller's restored afterwards
+    previous = get_telemetry()
+    if telemetry is not None:
+        set_telemetry(telemetry)
+    telemetry = get_telemetry()
+    profiler = None
+    try:
+        log(f"Starting MOSES Run with Strategy: {fg_type.upper()}")
+
+        strategy = "beta" if fg_type.lower() == "beta" else "alpha"
+        state = None
+        if resume and checkpoint_path and os.path.exists(checkpoint_path):
+            payload = load_checkpoint(checkpoint_path, fitness)
+            if payload["strategy"] != strategy:
+                raise ValueError(f"Checkpoint {checkpoint_path} was written by a "
+                                 f"'{payload['strategy']}' run, not '{strategy}'")
+            state = payload["state"]
+            log(f"Resuming from {checkpoint_path} at iteration {state.iteration} "
+                f"(metapop size {len(state.metapop)}, {len(fitness.memo)} cached scores)")
+
+        if profile is not None:
+            profiler = telemetry.profiler = StageProfiler(profile)
+        with telemetry.timer("run"):
+            return _run_strategy(exemplar, fitness, hyperparams, knobs, target, csv_path,
+                                 metapop, max_iter, fg_type, state, checkpoint_path, checkpoint_every)
+    finally:
+        if profiler is not None:
+            telemetry.profiler = None
+            for path in profiler.close():
+                log(f"Profile written to {path}")
+        set_telemetry(previous)
+
+
+def _run_strategy(exemplar, fitness, hyperparams, knobs, target, csv_path, metapop,
+                  max_iter, fg_type, state, checkpoint_path, checkpoint_every):
+    """Dispatch to the beta or alpha driver (see ``run_moses``)."""
     if fg_type.lower() == "beta":
         return run_bp_moses(
             exemplar=exemplar,
@@ -49,20 +141,25 @@ def run_moses(exemplar: Instance, fitness: FitnessOracle, hyperparams: Hyperpara
             distance=1,
             max_dist=20,
             last_chance=False,
-            best_possible_score=1.0
+            best_possible_score=1.0,
+            state=state,
+            checkpoint_path=checkpoint_path,
+            checkpoint_every=checkpoint_every,
         )
     elif fg_type.lower() == "alpha":
         final_metapop = run_abp_moses(
         exemplar=exemplar, fitness=fitness, hyperparams=hyperparams, knobs=knobs, target=target,
-        csv_path=csv_path, metapop=metapop, max_iter=max_iter,
+        csv_path=csv_path, metapop=metapop, max_iter=max_iter, state=state,
+        checkpoint_path=checkpoint_path, checkpoint_every=checkpoint_every,
     )
         _finalize_metapop(final_metapop)
         return final_metapop
     else:
-        print(f"Unknown fg_type '{fg_type}', defaulting to Alpha FG MOSES.")
+        log(f"Unknown fg_type '{fg_type}', defaulting to Alpha FG MOSES.")
         final_metapop = run_abp_moses(
         exemplar=exemplar, fitness=fitness, hyperparams=hyperparams, knobs=knobs, target=target,
-        csv_path=csv_path, metapop=metapop, max_iter=max_iter,
+        csv_path=csv_path, metapop=metapop, max_iter=max_iter, state=state,
+        checkpoint_path=checkpoint_path, checkpoint_every=checkpoint_every,
         )
         _finalize_metapop(final_metapop)
         return final_metapop
@@ -164,16 +261,27 @@ def grid_search_tuning():
                 print(best_msg)
                 log_file.write(best_msg + "\n")
 
-def main(): 
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run MOSES on a truth table.")
+    parser.add_argument("csv_path", nargs="?", default="example_data/test_parity_3.csv",
+                        help="truth table (default: example_data/test_parity_3.csv)")
+    parser.add_argument("--output-col", default="O", help="target column (default: O)")
+    parser.add_argument("--collapse", action="store_true",
+                        help="merge duplicate input rows and score with row weights")
+    parser.add_argument("--binary", action="store_true",
+                        help="load through the binary .mbt format (converted once, then memory-mapped)")
+    parser.add_argument("--fg-type", default="beta", choices=["alpha", "beta"],
+                        help="factor-graph strategy (default: beta)")
+    parser.add_argument("--max-iter", type=int, default=10, help="MOSES iterations (default: 10)")
+    args = parser.parse_args(argv)
+
     random.seed(42)
     metapop = []
-    csv_path = "example_data/test_parity_3.csv"
+    csv_path = args.csv_path
     hyperparams = Hyperparams(mutation_rate=0.3, crossover_rate=0.5, num_generations=30, neighborhood_size=20, bernoulli_prob=0.6, uniform_prob=0.6)
-    input, target = load_truth_table(csv_path, output_col='O')
-    knobs = knobs_from_truth_table(input)
-    knobs = [k for k in knobs if k.symbol != 'O']
+    knobs, target, fitness = load_problem(csv_path, args.output_col, collapse=args.collapse,
+                                          binary=args.binary)
     exemplar = Instance(value=f"(AND)", id=0, score=0.0, knobs=knobs)
-    fitness = FitnessOracle(target)
     exemplar.score = fitness.get_fitness(exemplar)
     
     print(f"Initial Exemplar: {exemplar.value} | Score: {exemplar.score}")
@@ -187,8 +295,8 @@ def main():
         target=target, 
         csv_path=csv_path, 
         metapop=metapop, 
-        max_iter=10,
-        fg_type="beta"  # Change to "alpha" for alpha version of factor graph, "beta" for BP-based MOSES
+        max_iter=args.max_iter,
+        fg_type=args.fg_type  # "alpha" for alpha version of factor graph, "beta" for BP-based MOSES
     )
     
     